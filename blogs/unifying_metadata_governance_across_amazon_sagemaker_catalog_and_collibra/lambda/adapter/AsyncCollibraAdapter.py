@@ -0,0 +1,41 @@
+import asyncio
+import weakref
+from typing import Dict, List, Set
+
+from adapter.CollibraAdapter import CollibraAdapter
+from utils.env_utils import COLLIBRA_MAX_CONCURRENCY
+
+
+class AsyncCollibraAdapter:
+    """
+    Coroutine variant of the CollibraAdapter lookups which are fanned out over several batches.
+
+    Each call runs the blocking CollibraAdapter call on a worker thread, so many Collibra requests can be in
+    flight at once over the pooled HTTP session. At most `max_concurrency` calls run at the same time in each event
+    loop. A semaphore is bound to the loop it is first used in, so one is kept per loop and the adapter can be used
+    across several `asyncio.run` calls.
+    """
+
+    def __init__(self, collibra_adapter: CollibraAdapter, max_concurrency: int = COLLIBRA_MAX_CONCURRENCY):
+        self.__collibra_adapter = collibra_adapter
+        self.__max_concurrency = max_concurrency
+        self.__semaphores = weakref.WeakKeyDictionary()
+
+    async def get_tables_by_names(self, table_names: List[str]) -> Dict[str, dict]:
+        return await self.__call(self.__collibra_adapter.get_tables_by_names, table_names)
+
+    async def get_related_asset_ids(self, source_id: str, target_ids: List[str], relation_type_id: str) -> Set[str]:
+        return await self.__call(self.__collibra_adapter.get_related_asset_ids, source_id, target_ids,
+                                 relation_type_id)
+
+    async def __call(self, method, *args):
+        async with self.__get_semaphore():
+            return await asyncio.to_thread(method, *args)
+
+    def __get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self.__semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.__max_concurrency)
+            self.__semaphores[loop] = semaphore
+        return semaphore
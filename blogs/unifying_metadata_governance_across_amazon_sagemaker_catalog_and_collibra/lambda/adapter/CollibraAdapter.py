@@ -1,124 +1,184 @@
-import base64
-import json
-
-import requests
-
-from business.AWSClientFactory import AWSClientFactory
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from typing import List, Dict, Iterator, Tuple, Set
+
+from business.AdaptiveRateLimiter import AdaptiveRateLimiter
+from business.CollibraCredentialsProvider import CollibraCredentialsProvider
+from business.HTTPSessionFactory import HTTPSessionFactory
 from model.CollibraAssetType import CollibraAssetType
-from model.CollibraConfig import CollibraConfig
-from utils.env_utils import COLLIBRA_CONFIG_SECRETS_NAME, COLLIBRA_SUBSCRIPTION_REQUEST_CREATION_WORKFLOW_ID, \
+from model.CollibraBulkWriteResult import CollibraBulkWriteResult
+from model.CollibraTableDetails import CollibraTableDetails
+from utils.collibra_constants import ID_KEY, DISPLAY_NAME_KEY, INCOMING_RELATIONS_KEY, SOURCE_KEY, \
+    OUTGOING_RELATIONS_KEY, TARGET_KEY, COLLIBRA_MAX_BULK_WRITE_BATCH_SIZE, COLLIBRA_MAX_LOOKUP_BATCH_SIZE
+from utils.env_utils import COLLIBRA_SUBSCRIPTION_REQUEST_CREATION_WORKFLOW_ID, \
     COLLIBRA_AWS_PROJECT_TYPE_ID, COLLIBRA_AWS_PROJECT_DOMAIN_ID, COLLIBRA_AWS_PROJECT_ATTRIBUTE_TYPE_ID, \
     COLLIBRA_AWS_USER_TYPE_ID, COLLIBRA_AWS_USER_DOMAIN_ID, \
-    COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID
-from utils.queries import GET_BUSINESS_TERMS_QUERY, GET_BUSINESS_TERMS_WITH_CURSOR_QUERY, GET_AWS_TABLE_ASSETS_QUERY, \
-    GET_AWS_TABLE_ASSETS_WITH_CURSOR_QUERY, GET_AWS_TABLE_ASSET_QUERY, GET_PII_COLUMNS_QUERY, \
-    GET_AWS_TABLE_BUSINESS_TERMS_QUERY, GET_BUSINESS_TERM_HIERARCHY_QUERY, GET_TABLE_BY_NAME_QUERY, \
-    GET_SUBSCRIPTION_REQUESTS_BY_STATUS_QUERY, \
-    GET_ASSET_AND_STRING_ATTRIBUTES_BY_NAME_AND_TYPE_QUERY, GET_ASSET_BY_NAME_AND_TYPE_QUERY
+    COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID, COLLIBRA_MAX_REQUESTS_PER_SECOND, COLLIBRA_BUSINESS_TERMS_PAGE_SIZE, \
+    COLLIBRA_TABLES_PAGE_SIZE, COLLIBRA_BUSINESS_TERM_HIERARCHY_PAGE_SIZE, COLLIBRA_SUBSCRIPTION_REQUESTS_PAGE_SIZE, \
+    COLLIBRA_TABLE_NAME_INDEX_PAGE_SIZE, COLLIBRA_AWS_USERS_PAGE_SIZE, COLLIBRA_AWS_PROJECTS_PAGE_SIZE
+from utils.queries import GET_AWS_TABLES_DETAILS_QUERY, TABLE_NAMES_FILTER, TABLE_NAMES_VARIABLE, BUSINESS_TERM_FIELDS, \
+    BUSINESS_TERM_FILTERS, AWS_TABLE_FIELDS, AWS_TABLE_FILTERS, BUSINESS_TERM_HIERARCHY_FIELDS, \
+    BUSINESS_TERM_HIERARCHY_FILTERS, SUBSCRIPTION_REQUEST_FIELDS, SUBSCRIPTION_REQUEST_FILTERS, \
+    SUBSCRIPTION_REQUEST_VARIABLES, MODIFIED_AFTER_FILTER, MODIFIED_AFTER_VARIABLE, TABLE_NAME_FIELDS, \
+    TABLE_NAME_FILTERS, ASSET_WITH_STRING_ATTRIBUTES_FIELDS, \
+    ASSET_WITH_STRING_ATTRIBUTES_FILTERS, ASSET_WITH_STRING_ATTRIBUTES_VARIABLES, GET_RELATED_ASSET_IDS_QUERY
+from utils.query_builder import build_assets_query
 
 
 class CollibraAdapter:
     COLLIBRA_GRAPHQL_URL_FORMAT = "https://{collibra_config_url}/graphql/knowledgeGraph/v1"
     COLLIBRA_REST_URL_FORMAT = "https://{collibra_config_url}/rest/2.0/{resource}"
     DEFAULT_API_TIMEOUT_IN_SECONDS = 180
+    THROTTLED_RESPONSE_STATUS_CODES = (429, 503)
+    # A 503 may be returned after a write was applied, so requests which are not idempotent are only retried on a 429,
+    # which Collibra returns before processing the request
+    NON_IDEMPOTENT_RETRIED_STATUS_CODES = (429,)
+    MAX_THROTTLED_RETRIES = 5
+
+    # Shared by all adapter instances of the process so that they learn and respect a single request rate
+    __rate_limiter = AdaptiveRateLimiter(COLLIBRA_MAX_REQUESTS_PER_SECOND)
 
     def __init__(self, logger):
         self.__logger = logger
-        self.__sts_client = AWSClientFactory.create('secretsmanager')
-        self.__config = self.__get_collibra_config()
+        self.__session = HTTPSessionFactory.get()
+        self.__config = CollibraCredentialsProvider.get_config()
         self.__api_url = CollibraAdapter.COLLIBRA_GRAPHQL_URL_FORMAT.format(collibra_config_url=self.__config.url)
-        self.__authorization_token = self.__get_authorization_token(self.__config)
-
-    def get_business_term_metadata(self, last_seen_id: str = None):
-        return self.__get_assets(CollibraAssetType.BUSINESS_TERM, last_seen_id)
 
-    def get_tables(self, last_seen_id: str = None):
-        return self.__get_assets(CollibraAssetType.TABLE, last_seen_id)
-
-    def get_business_term_hierarchy(self):
-        payload = {"query": GET_BUSINESS_TERM_HIERARCHY_QUERY}
+    def get_business_term_metadata(self, last_seen_id: str = None, modified_after: str = None):
+        return self.__get_assets(CollibraAssetType.BUSINESS_TERM, last_seen_id, modified_after)
+
+    def get_tables(self, last_seen_id: str = None, modified_after: str = None):
+        return self.__get_assets(CollibraAssetType.TABLE, last_seen_id, modified_after)
+
+    def get_business_term_hierarchy(self) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily pages through all business terms with parent terms and yields (child term name, parent term name)
+        pairs page by page, so that only a single page is held in memory at a time.
+        """
+        last_seen_id = None
+        num_of_terms = 0
+        while True:
+            payload = CollibraAdapter.__get_graphql_query_payload(BUSINESS_TERM_HIERARCHY_FIELDS,
+                                                                  BUSINESS_TERM_HIERARCHY_FILTERS,
+                                                                  COLLIBRA_BUSINESS_TERM_HIERARCHY_PAGE_SIZE, last_seen_id)
+            response = self.__call_collibra_graphql_api(payload)
+
+            if not self.__is_response_status_ok(response.status_code):
+                raise Exception(f"Failed to fetch business term hierarchy from Collibra. Error: {response.text}")
+
+            business_terms = response.json()['data']['assets']
+            if not business_terms:
+                break
+
+            for business_term in business_terms:
+                child_term_name = business_term[DISPLAY_NAME_KEY]
+                for incoming_relation in business_term.get(INCOMING_RELATIONS_KEY, []):
+                    if SOURCE_KEY in incoming_relation:
+                        yield child_term_name, incoming_relation[SOURCE_KEY][DISPLAY_NAME_KEY]
+
+            num_of_terms += len(business_terms)
+            last_seen_id = business_terms[-1][ID_KEY]
+
+        self.__logger.info(f'Successfully fetched business term hierarchy of {num_of_terms} terms from Collibra')
+
+    def get_tables_by_names(self, table_names: List[str]) -> Dict[str, dict]:
+        """
+        Looks up AWS tables by name, usually with a single GraphQL request. Tables are paged by id, so that several
+        tables with the same name can't push the tables of other names out of the page.
+        :return: First table found for each name, keyed by name. Names without a table are absent.
+        """
+        tables_by_name = {}
+        last_seen_id = None
+        while len(tables_by_name) < len(set(table_names)):
+            payload = CollibraAdapter.__get_graphql_query_payload(TABLE_NAME_FIELDS,
+                                                                  TABLE_NAME_FILTERS + (TABLE_NAMES_FILTER,),
+                                                                  COLLIBRA_MAX_LOOKUP_BATCH_SIZE, last_seen_id,
+                                                                  variable_declarations=(TABLE_NAMES_VARIABLE,),
+                                                                  variables={"tableNames": table_names})
+            response = self.__call_collibra_graphql_api(payload)
+
+            if not self.__is_response_status_ok(response.status_code):
+                raise Exception(f"Failed to fetch tables by name from Collibra. Error: {response.text}")
+
+            tables = response.json()['data']['assets']
+            for table in tables:
+                tables_by_name.setdefault(table[DISPLAY_NAME_KEY], table)
+
+            if len(tables) < COLLIBRA_MAX_LOOKUP_BATCH_SIZE:
+                break
+            last_seen_id = tables[-1][ID_KEY]
+
+        self.__logger.info(f'Successfully fetched {len(tables_by_name)} of {len(table_names)} tables by name from Collibra')
+        return tables_by_name
+
+    def get_all_table_names(self) -> Iterator[dict]:
+        """
+        Lazily pages through the id and name of all AWS tables, matching the tables looked up by get_tables_by_names
+        """
+        last_seen_id = None
+        num_of_tables = 0
+        while True:
+            payload = CollibraAdapter.__get_graphql_query_payload(TABLE_NAME_FIELDS, TABLE_NAME_FILTERS,
+                                                                  COLLIBRA_TABLE_NAME_INDEX_PAGE_SIZE, last_seen_id)
+            response = self.__call_collibra_graphql_api(payload)
+
+            if not self.__is_response_status_ok(response.status_code):
+                raise Exception(f"Failed to fetch table names from Collibra. Error: {response.text}")
+
+            tables = response.json()['data']['assets']
+            if not tables:
+                break
+
+            yield from tables
+
+            num_of_tables += len(tables)
+            last_seen_id = tables[-1][ID_KEY]
+
+        self.__logger.info(f'Successfully fetched names of {num_of_tables} tables from Collibra')
+
+    def get_tables_details(self, table_ids: List[str]) -> Dict[str, CollibraTableDetails]:
+        """
+        Fetches the tables, their business terms and their PII columns with a single GraphQL request
+        :return: Details of each found table, keyed by table id. Ids without a table are absent.
+        """
+        if len(table_ids) > COLLIBRA_MAX_LOOKUP_BATCH_SIZE:
+            raise ValueError(f"At most {COLLIBRA_MAX_LOOKUP_BATCH_SIZE} tables can be fetched at once, got {len(table_ids)}")
+        payload = {"query": GET_AWS_TABLES_DETAILS_QUERY, "variables": {"assetIds": table_ids}}
         response = self.__call_collibra_graphql_api(payload)
 
         if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-            self.__logger.info(f'Successfully fetched business term hierarchy from Collibra')
-            return data
-        else:
-            raise Exception(f"Failed to fetch business term hierarchy from Collibra. Error: {response.text}")
-
-    def get_table(self, table_id: str):
-        payload = {"query": GET_AWS_TABLE_ASSET_QUERY, "variables": {"assetId": table_id}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-            if len(data) != 1:
-                raise Exception(f"Failed to fetch table with id {table_id} from Collibra.")
-
-            self.__logger.info(f'Successfully fetched table with id {table_id} from Collibra')
-            return data[0]
+            data = response.json()['data']
+            business_terms_by_id = {asset[ID_KEY]: asset for asset in data['businessTerms']}
+            pii_columns_by_id = {asset[ID_KEY]: asset for asset in data['piiColumns']}
+
+            tables_details = {}
+            for table in data['table']:
+                table_id = table[ID_KEY]
+                if table_id in business_terms_by_id and table_id in pii_columns_by_id:
+                    tables_details[table_id] = CollibraTableDetails({"table": [table],
+                                                                     "businessTerms": [business_terms_by_id[table_id]],
+                                                                     "piiColumns": [pii_columns_by_id[table_id]]})
+
+            self.__logger.info(f'Successfully fetched details of {len(tables_details)} of {len(table_ids)} tables from Collibra')
+            return tables_details
         else:
-            raise Exception(f"Failed to fetch table with id {table_id} from Collibra. Error: {response.text}")
-
-    def get_table_by_name(self, table_name: str):
-        payload = {"query": GET_TABLE_BY_NAME_QUERY, "variables": {"tableName": table_name}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-            if len(data) < 1:
-                raise Exception(f"No table found with name {table_name} in Collibra.")
-
-            self.__logger.info(f'Successfully fetched table with name {table_name} from Collibra')
-            return data[0]
-        else:
-            raise Exception(f"Failed to fetch table with name {table_name} from Collibra. Error: {response.text}")
-
-    def get_table_business_terms(self, table_id: str):
-        payload = {"query": GET_AWS_TABLE_BUSINESS_TERMS_QUERY, "variables": {"assetId": table_id}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-
-            self.__logger.info(f'Successfully fetched business terms of table with id {table_id} from Collibra')
-            return data[0]
-        else:
-            raise Exception(
-                f"Failed to fetch business terms of table with id {table_id} from Collibra. Error: {response.text}")
-
-    def get_pii_columns(self, table_id: str):
-        payload = {"query": GET_PII_COLUMNS_QUERY, "variables": {"assetId": table_id}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-            if len(data) != 1:
-                raise Exception(f"Failed to fetch PII columns for table with id {table_id} from Collibra.")
-
-            self.__logger.info(f'Successfully fetched PII columns for table with id {table_id} from Collibra')
-            return data[0]
-        else:
-            raise Exception(
-                f"Failed to fetch PII columns for table with id {table_id} from Collibra. Error: {response.text}")
+            raise Exception(f"Failed to fetch details of tables from Collibra. Error: {response.text}")
 
     def start_subscription_request_creation_workflow(self, asset_id: str, consumer_project_name: str):
         url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url, resource="workflowInstances")
-        response = requests.post(
-            url,
-            json={"workflowDefinitionId": COLLIBRA_SUBSCRIPTION_REQUEST_CREATION_WORKFLOW_ID,
-                  "sendNotification": True,
-                  "businessItemIds": [asset_id],
-                  "businessItemType": "ASSET",
-                  "formProperties": {"aws_consumer_project_name":consumer_project_name}
-                  },
-            auth=(self.__config.username, self.__config.password),
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-            timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS
-        )
+        response = self.__send(self.__session.post, url,
+                               json={"workflowDefinitionId": COLLIBRA_SUBSCRIPTION_REQUEST_CREATION_WORKFLOW_ID,
+                                     "sendNotification": True,
+                                     "businessItemIds": [asset_id],
+                                     "businessItemType": "ASSET",
+                                     "formProperties": {"aws_consumer_project_name": consumer_project_name}},
+                               headers={
+                                   "Content-Type": "application/json",
+                                   "Accept": "application/json",
+                               },
+                               timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                               hooks={"response": self.__log_response_time})
 
         if self.__is_response_status_ok(response.status_code):
             return response.json()
@@ -126,26 +186,49 @@ class CollibraAdapter:
             raise Exception(
                 f"Failed to start subscription workflow in collibra for collibra asset with id {asset_id}. Error: {response.text}.")
 
-    def get_subscription_requests_by_status(self, status):
-        payload = {"query": GET_SUBSCRIPTION_REQUESTS_BY_STATUS_QUERY, "variables": {"status": status}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-
-            self.__logger.info(f'Successfully fetched pending subscription requests from Collibra')
-            return data
-        else:
-            raise Exception(
-                f"Failed to fetch pending subscription requests from Collibra. Error: {response.text}")
-
-    def __get_assets(self, asset_type: CollibraAssetType, last_seen_id: str):
+    def get_subscription_requests_by_status(self, status) -> Iterator[dict]:
+        """
+        Lazily pages through all subscription requests with the status and yields them one by one. Pages are
+        ordered by id and fetched after the last seen id, so requests whose status is changed while iterating
+        neither shift the following pages nor get skipped.
+        """
+        last_seen_id = None
+        num_of_requests = 0
+        while True:
+            payload = CollibraAdapter.__get_graphql_query_payload(SUBSCRIPTION_REQUEST_FIELDS,
+                                                                  SUBSCRIPTION_REQUEST_FILTERS,
+                                                                  COLLIBRA_SUBSCRIPTION_REQUESTS_PAGE_SIZE, last_seen_id,
+                                                                  variable_declarations=SUBSCRIPTION_REQUEST_VARIABLES,
+                                                                  variables={"status": status})
+            response = self.__call_collibra_graphql_api(payload)
+
+            if not self.__is_response_status_ok(response.status_code):
+                raise Exception(
+                    f"Failed to fetch {status} subscription requests from Collibra. Error: {response.text}")
+
+            subscription_requests = response.json()['data']['assets']
+            if not subscription_requests:
+                break
+
+            yield from subscription_requests
+
+            num_of_requests += len(subscription_requests)
+            last_seen_id = subscription_requests[-1][ID_KEY]
+
+        self.__logger.info(f'Successfully fetched {num_of_requests} {status} subscription requests from Collibra')
+
+    def __get_assets(self, asset_type: CollibraAssetType, last_seen_id: str, modified_after: str = None):
+        """
+        :param modified_after: If set, only assets modified after this ISO-8601 timestamp are fetched
+        """
         if asset_type == CollibraAssetType.BUSINESS_TERM:
-            payload = CollibraAdapter.__get_graphql_query_payload(GET_BUSINESS_TERMS_QUERY,
-                                                                  GET_BUSINESS_TERMS_WITH_CURSOR_QUERY, last_seen_id)
+            payload = CollibraAdapter.__get_graphql_query_payload(BUSINESS_TERM_FIELDS, BUSINESS_TERM_FILTERS,
+                                                                  COLLIBRA_BUSINESS_TERMS_PAGE_SIZE, last_seen_id,
+                                                                  modified_after)
         elif asset_type == CollibraAssetType.TABLE:
-            payload = CollibraAdapter.__get_graphql_query_payload(GET_AWS_TABLE_ASSETS_QUERY,
-                                                                  GET_AWS_TABLE_ASSETS_WITH_CURSOR_QUERY, last_seen_id)
+            payload = CollibraAdapter.__get_graphql_query_payload(AWS_TABLE_FIELDS, AWS_TABLE_FILTERS,
+                                                                  COLLIBRA_TABLES_PAGE_SIZE, last_seen_id,
+                                                                  modified_after)
         else:
             raise Exception(f'AssetType {asset_type} not supported')
 
@@ -158,46 +241,38 @@ class CollibraAdapter:
             raise Exception(f"Failed to fetch {asset_type.value} data from Collibra. Error: {response.text}")
         return data
 
-    def get_or_create_aws_project(self, project_name, smus_project_id):
-        project = self.get_aws_project(project_name)
-
-        if project:
-            return project[0]
-
-        return self.create_aws_project(project_name, smus_project_id)
-
-    def get_aws_project(self, project_name):
-        payload = {"query": GET_ASSET_BY_NAME_AND_TYPE_QUERY, "variables": {"assetName": project_name, "typeId": COLLIBRA_AWS_PROJECT_TYPE_ID}}
-        response = self.__call_collibra_graphql_api(payload)
-
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-
-            self.__logger.info(f'Successfully fetched asset with name {project_name} from Collibra')
-            return data
-        else:
-            raise Exception(
-                f"Failed to fetch asset with name {project_name} from Collibra. Error: {response.text}")
-
     def create_aws_project(self, project_name, smus_project_id):
         url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url, resource="assets")
         payload = {"name": project_name,
                    "domainId": COLLIBRA_AWS_PROJECT_DOMAIN_ID,
                    "typeId": COLLIBRA_AWS_PROJECT_TYPE_ID}
-        response = requests.post(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                 timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
+        response = self.__send(self.__session.post, url,
+                               json=payload,
+                               timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                               hooks={"response": self.__log_response_time})
 
         if self.__is_response_status_ok(response.status_code):
             return response.json()
 
         raise Exception(f"Failed to create project with name {project_name}")
 
+    def get_all_aws_projects(self) -> Iterator[dict]:
+        """
+        Lazily pages through all AWS projects together with their SMUS project id attributes
+        """
+        return self.__get_all_assets_with_string_attributes(COLLIBRA_AWS_PROJECT_TYPE_ID,
+                                                            COLLIBRA_AWS_PROJECT_ATTRIBUTE_TYPE_ID,
+                                                            COLLIBRA_AWS_PROJECTS_PAGE_SIZE, "projects")
+
     def add_aws_project_attributes(self, collibra_project_id, smus_project_id):
         url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
                                                               resource=f"assets/{collibra_project_id}/attributes")
         payload = {"typeId": COLLIBRA_AWS_PROJECT_ATTRIBUTE_TYPE_ID, "values": [smus_project_id]}
-        response = requests.put(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
+        response = self.__send(self.__session.put, url,
+                               json=payload,
+                               idempotent=True,
+                               timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                               hooks={"response": self.__log_response_time})
         if self.__is_response_status_ok(response.status_code):
             self.__logger.info(f'Successfully added project attribute for project {collibra_project_id}')
             return response.json()
@@ -208,8 +283,10 @@ class CollibraAdapter:
         url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
                                                               resource=f"relations")
         payload = {"sourceId": source_id, "targetId": target_id, "typeId": relation_id}
-        response = requests.post(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                 timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
+        response = self.__send(self.__session.post, url,
+                               json=payload,
+                               timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                               hooks={"response": self.__log_response_time})
 
         if not self.__is_response_status_ok(response.status_code):
             raise Exception(
@@ -217,61 +294,53 @@ class CollibraAdapter:
 
         return response.json()
 
-    def get_or_create_aws_user(self, username):
-        try:
-            return self.get_aws_user(username)
-        except Exception as e:
-            self.__logger.info(f"User with username {username} does not exist. Creating new user.")
-
-        return self.create_aws_user(username)
-
-    def get_aws_user(self, username):
-        payload = {"query": GET_ASSET_AND_STRING_ATTRIBUTES_BY_NAME_AND_TYPE_QUERY,
-                   "variables": {"assetName": username, "type": COLLIBRA_AWS_USER_TYPE_ID,
-                                 "stringAttributeType": COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID}}
+    def get_related_asset_ids(self, source_id: str, target_ids: List[str], relation_type_id: str) -> Set[str]:
+        """
+        Looks up which of the target assets the source asset is already related to with a single GraphQL request
+        :return: Ids of the target assets with a relation of the type from the source asset
+        """
+        if len(target_ids) > COLLIBRA_MAX_LOOKUP_BATCH_SIZE:
+            raise ValueError(f"At most {COLLIBRA_MAX_LOOKUP_BATCH_SIZE} relations can be looked up at once, got {len(target_ids)}")
+        payload = {"query": GET_RELATED_ASSET_IDS_QUERY,
+                   "variables": {"sourceId": source_id, "relationType": relation_type_id, "targetIds": target_ids}}
         response = self.__call_collibra_graphql_api(payload)
 
-        if self.__is_response_status_ok(response.status_code):
-            data = response.json()['data']['assets']
-            if len(data) != 1:
-                raise Exception(f"Failed to fetch user with username {username} from Collibra.")
-
-            self.__logger.info(f'Successfully fetched user with username {username} from Collibra')
-            return data[0]
-        else:
-            raise Exception(f"Failed to fetch tuser with username {username} from Collibra. Error: {response.text}")
-
-    def create_aws_user(self, username):
-        url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url, resource="assets")
-        payload = {
-            "name": username,
-            "domainId": COLLIBRA_AWS_USER_DOMAIN_ID,
-            "typeId": COLLIBRA_AWS_USER_TYPE_ID
-        }
-        response = requests.post(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                 timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
-        if self.__is_response_status_ok(response.status_code):
-            self.__logger.info(f'Successfully created user {username} in Collibra')
-
-            return response.json()
-
-        raise Exception(f"Failed to create user {username} from Collibra. Error: {response.text}")
-
-    def add_aws_user_attributes(self, user_id, project_name):
-        url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
-                                                              resource=f"attributes")
-        payload = {
-            "assetId": user_id,
-            "typeId": COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID,
-            "value": project_name
-        }
-        response = requests.post(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                 timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
-
-        if self.__is_response_status_ok(response.status_code):
-            return response.json()
-        else:
-            raise Exception(f"Failed to add attributes for user {user_id} to Collibra")
+        if not self.__is_response_status_ok(response.status_code):
+            raise Exception(f"Failed to fetch relations of asset {source_id} from Collibra. Error: {response.text}")
+
+        return {relation[TARGET_KEY][ID_KEY] for asset in response.json()['data']['assets']
+                for relation in asset[OUTGOING_RELATIONS_KEY]}
+
+    def create_relations(self, relations: List[Tuple[str, str, str]]) -> CollibraBulkWriteResult:
+        """
+        :param relations: (source_id, target_id, relation_id) of every relation to create
+        """
+        payloads = [{"sourceId": source_id, "targetId": target_id, "typeId": relation_id}
+                    for source_id, target_id, relation_id in relations]
+        return self.__bulk_write("relations", payloads)
+
+    def get_all_aws_users(self) -> Iterator[dict]:
+        """
+        Lazily pages through all AWS users together with their project attributes
+        """
+        return self.__get_all_assets_with_string_attributes(COLLIBRA_AWS_USER_TYPE_ID,
+                                                            COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID,
+                                                            COLLIBRA_AWS_USERS_PAGE_SIZE, "users")
+
+    def create_aws_users(self, usernames: List[str]) -> CollibraBulkWriteResult:
+        payloads = [{"name": username,
+                     "domainId": COLLIBRA_AWS_USER_DOMAIN_ID,
+                     "typeId": COLLIBRA_AWS_USER_TYPE_ID} for username in usernames]
+        return self.__bulk_write("assets", payloads)
+
+    def add_aws_users_attributes(self, user_attributes: List[Tuple[str, str]]) -> CollibraBulkWriteResult:
+        """
+        :param user_attributes: (user_id, project_name) of every project attribute to add
+        """
+        payloads = [{"assetId": user_id,
+                     "typeId": COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID,
+                     "value": project_name} for user_id, project_name in user_attributes]
+        return self.__bulk_write("attributes", payloads)
 
     def update_subscription_request_status(self, subscription_request_id: str, status_id: str):
         url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
@@ -280,12 +349,15 @@ class CollibraAdapter:
             "statusId": status_id
         }
 
-        response = requests.patch(url, auth=(self.__config.username, self.__config.password), json=payload,
-                                  headers={
-                                      "Content-Type": "application/json",
-                                      "Accept": "application/json",
-                                  },
-                                  timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS)
+        response = self.__send(self.__session.patch, url,
+                               json=payload,
+                               idempotent=True,
+                               headers={
+                                   "Content-Type": "application/json",
+                                   "Accept": "application/json",
+                               },
+                               timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                               hooks={"response": self.__log_response_time})
 
         if self.__is_response_status_ok(response.status_code):
             return response.json()
@@ -293,40 +365,166 @@ class CollibraAdapter:
             raise Exception(
                 f"Failed to update subscription request status for subscription request id {subscription_request_id}")
 
-    @classmethod
-    def __get_authorization_token(cls, config: CollibraConfig):
-        authorization_token_string = f"{config.username}:{config.password}"
-        authorization_token_bytes = authorization_token_string.encode("utf-8")
-        encoded_authorization_token_bytes = base64.b64encode(authorization_token_bytes)
-        return encoded_authorization_token_bytes.decode('utf-8')
+    def __get_all_assets_with_string_attributes(self, type_id: str, string_attribute_type_id: str, page_size: int,
+                                                asset_description: str) -> Iterator[dict]:
+        last_seen_id = None
+        num_of_assets = 0
+        while True:
+            payload = CollibraAdapter.__get_graphql_query_payload(
+                ASSET_WITH_STRING_ATTRIBUTES_FIELDS, ASSET_WITH_STRING_ATTRIBUTES_FILTERS, page_size, last_seen_id,
+                variable_declarations=ASSET_WITH_STRING_ATTRIBUTES_VARIABLES,
+                variables={"type": type_id, "stringAttributeType": string_attribute_type_id})
+            response = self.__call_collibra_graphql_api(payload)
+
+            if not self.__is_response_status_ok(response.status_code):
+                raise Exception(f"Failed to fetch {asset_description} from Collibra. Error: {response.text}")
+
+            assets = response.json()['data']['assets']
+            if not assets:
+                break
+
+            yield from assets
+
+            num_of_assets += len(assets)
+            last_seen_id = assets[-1][ID_KEY]
+
+        self.__logger.info(f'Successfully fetched {num_of_assets} {asset_description} from Collibra')
+
+    def __bulk_write(self, resource: str, payloads: List[dict]) -> CollibraBulkWriteResult:
+        """
+        Creates the resources through the bulk endpoint of the resource in chunks of
+        COLLIBRA_MAX_BULK_WRITE_BATCH_SIZE items. Collibra rejects a bulk request as a whole if any item in it is
+        invalid, so the items of a rejected chunk are written one by one to find out which of them failed.
+        """
+        bulk_url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
+                                                                   resource=f"{resource}/bulk")
+        url = CollibraAdapter.COLLIBRA_REST_URL_FORMAT.format(collibra_config_url=self.__config.url,
+                                                              resource=resource)
+        result = CollibraBulkWriteResult()
+        payloads = iter(payloads)
+        while chunk := list(islice(payloads, COLLIBRA_MAX_BULK_WRITE_BATCH_SIZE)):
+            response = self.__send(self.__session.post, bulk_url,
+                                   json=chunk,
+                                   timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                                   hooks={"response": self.__log_response_time})
+
+            if self.__is_response_status_ok(response.status_code):
+                for payload, resource_created in zip(chunk, response.json()):
+                    result.add_created(payload, resource_created)
+                continue
+
+            self.__logger.warning(f"Failed to bulk create {len(chunk)} {resource} in Collibra. "
+                                  f"Creating them one by one. Error: {response.text}")
+            for payload in chunk:
+                response = self.__send(self.__session.post, url,
+                                       json=payload,
+                                       timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+                                       hooks={"response": self.__log_response_time})
+                if self.__is_response_status_ok(response.status_code):
+                    result.add_created(payload, response.json())
+                else:
+                    result.add_failed(payload, response.text)
+
+        self.__logger.info(f"Created {len(result.created)} {resource} in Collibra, {len(result.failed)} failed")
+        return result
 
     def __call_collibra_graphql_api(self, payload: dict):
-        return requests.post(
+        return self.__send(
+            self.__session.post,
             self.__api_url,
             json=payload,
+            idempotent=True,
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json",
-                "Authorization": f"Basic {self.__authorization_token}"
             },
-            timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS
+            timeout=CollibraAdapter.DEFAULT_API_TIMEOUT_IN_SECONDS,
+            hooks={"response": self.__log_response_time}
         )
 
+    def __send(self, send_method, url: str, headers: dict = None, idempotent: bool = False, **kwargs):
+        """
+        :param idempotent: Whether the request can be repeated without side effects, so that it is also retried when
+        Collibra is unavailable
+        """
+        is_authorization_refreshed = False
+        attempt = 0
+        while True:
+            CollibraAdapter.__rate_limiter.acquire()
+            authorized_headers = {**(headers or {}),
+                                  "Authorization": f"Basic {CollibraCredentialsProvider.get_authorization_token()}"}
+            response = send_method(url, headers=authorized_headers, **kwargs)
+
+            # Credentials may have been rotated since they were cached, so they are reloaded once
+            if response.status_code == 401 and not is_authorization_refreshed:
+                self.__logger.info("Collibra rejected the cached credentials. Refreshing them.")
+                CollibraCredentialsProvider.refresh()
+                is_authorization_refreshed = True
+                continue
+
+            # Only a successful response shows the current rate is sustainable, so errors leave it unchanged
+            if response.status_code not in CollibraAdapter.THROTTLED_RESPONSE_STATUS_CODES:
+                if self.__is_response_status_ok(response.status_code):
+                    CollibraAdapter.__rate_limiter.on_success()
+                return response
+
+            retry_after_in_seconds = self.__get_retry_after_in_seconds(response)
+            CollibraAdapter.__rate_limiter.on_throttle(retry_after_in_seconds)
+            if not idempotent and response.status_code not in CollibraAdapter.NON_IDEMPOTENT_RETRIED_STATUS_CODES:
+                self.__logger.warning(f"Collibra returned status {response.status_code} for request to {url}. "
+                                      f"Not retrying it, as it may have been applied already")
+                return response
+
+            self.__logger.warning(
+                f"Collibra throttled request to {url} with status {response.status_code}. "
+                f"Attempt {attempt + 1}, retry after {retry_after_in_seconds} seconds, "
+                f"request rate lowered to {CollibraAdapter.__rate_limiter.rate:.2f} per second")
+
+            attempt += 1
+            if attempt > CollibraAdapter.MAX_THROTTLED_RETRIES:
+                return response
+
     @staticmethod
-    def __get_graphql_query_payload(query: str, query_with_cursor: str, last_seen_id: str = None):
-        if last_seen_id:
-            payload = {"query": query_with_cursor, "variables": {"lastSeenId": last_seen_id}}
-        else:
-            payload = {"query": query}
+    def __get_retry_after_in_seconds(response):
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return None
 
-        return payload
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
 
-    def __get_collibra_config(self) -> CollibraConfig:
-        get_secret_value_response = self.__sts_client.get_secret_value(
-            SecretId=COLLIBRA_CONFIG_SECRETS_NAME
-        )
-        secret_string = get_secret_value_response['SecretString']
-        return CollibraConfig(json.loads(secret_string))
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def __log_response_time(self, response, *args, **kwargs):
+        self.__logger.debug(f"Collibra {response.request.method} {response.url} returned {response.status_code} "
+                            f"in {response.elapsed.total_seconds():.3f} seconds")
+
+    @staticmethod
+    def __get_graphql_query_payload(fields: Tuple[str, ...], filters: Tuple[str, ...], page_size: int,
+                                    last_seen_id: str = None, modified_after: str = None,
+                                    variable_declarations: Tuple[str, ...] = (), variables: dict = None):
+        """
+        :param variable_declarations: Declarations of the variables used by the fields or filters
+        :param variables: Values of the declared variables
+        """
+        variables = dict(variables or {})
+        if modified_after:
+            filters = filters + (MODIFIED_AFTER_FILTER,)
+            variable_declarations = variable_declarations + (MODIFIED_AFTER_VARIABLE,)
+            variables["modifiedAfter"] = modified_after
+        if last_seen_id:
+            variables["lastSeenId"] = last_seen_id
+
+        query = build_assets_query(fields, filters, page_size, with_cursor=bool(last_seen_id),
+                                   variables=variable_declarations)
+        if variables:
+            return {"query": query, "variables": variables}
+        return {"query": query}
 
     def __is_response_status_ok(self, response_status):
         return response_status == 200 or response_status == 201
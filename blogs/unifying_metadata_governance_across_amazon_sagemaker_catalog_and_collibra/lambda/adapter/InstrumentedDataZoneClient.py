@@ -0,0 +1,120 @@
+import threading
+import time
+from functools import partial
+from typing import Dict
+
+from botocore.exceptions import ClientError
+
+from business.SMUSRateLimiters import SMUSRateLimiters
+from model.DataZoneOperationMetrics import DataZoneOperationMetrics
+from utils.smus_constants import THROTTLING_EXCEPTION_CODE, THROTTLING_HTTP_STATUS_CODE
+
+
+class InstrumentedDataZoneClient:
+    """
+    Wraps the boto3 DataZone client so that the hot operations of the sync go through the token bucket of their
+    operation and record latency, throttles and botocore retries. A call counts as throttled only when it fails with a
+    ThrottlingException or an HTTP 429, and then halves the rate of the operation.
+
+    botocore retries throttles, 5xx, connection errors and timeouts on its own, and its adaptive retry mode already
+    paces the retries of a call. The reason of a retry isn't reported, so retries are recorded as a metric of their own
+    and a call that succeeded after retries leaves the rate of its operation unchanged. The token bucket thereby only
+    reacts to the throttles botocore gave up on. Every other attribute, including `exceptions`, is passed through to the
+    wrapped client.
+
+    Metrics are collected process-wide across clients and are logged and cleared by `flush_metrics`.
+    """
+    INSTRUMENTED_OPERATIONS = {
+        'search': 'Search',
+        'search_listings': 'SearchListings',
+        'get_asset': 'GetAsset',
+        'create_asset_revision': 'CreateAssetRevision',
+        'get_user_profile': 'GetUserProfile',
+        'list_project_memberships': 'ListProjectMemberships',
+    }
+    __metrics = {}
+    __lock = threading.Lock()
+
+    def __init__(self, logger, client):
+        self.__logger = logger
+        self.__client = client
+
+    def __getattr__(self, name):
+        if name in InstrumentedDataZoneClient.INSTRUMENTED_OPERATIONS:
+            return partial(self.__call, name)
+        return getattr(self.__client, name)
+
+    def __call(self, method_name: str, **kwargs):
+        operation_name = InstrumentedDataZoneClient.INSTRUMENTED_OPERATIONS[method_name]
+        rate_limiter = SMUSRateLimiters.get(operation_name)
+        rate_limiter.acquire()
+        start_time = time.monotonic()
+        try:
+            response = getattr(self.__client, method_name)(**kwargs)
+        except ClientError as e:
+            retry_attempts = InstrumentedDataZoneClient.__get_retry_attempts(e.response)
+            throttled = InstrumentedDataZoneClient.__is_throttled(e.response)
+            InstrumentedDataZoneClient.__record(operation_name, time.monotonic() - start_time, retry_attempts,
+                                                error=True, throttled=throttled)
+            if throttled:
+                self.__on_throttle(operation_name, rate_limiter)
+            raise
+        except Exception:
+            InstrumentedDataZoneClient.__record(operation_name, time.monotonic() - start_time, 0, error=True)
+            raise
+
+        latency_in_seconds = time.monotonic() - start_time
+        retry_attempts = InstrumentedDataZoneClient.__get_retry_attempts(response)
+        InstrumentedDataZoneClient.__record(operation_name, latency_in_seconds, retry_attempts)
+        if retry_attempts == 0:
+            rate_limiter.on_success()
+        self.__logger.debug(f"DataZone {operation_name} took {latency_in_seconds:.3f} seconds")
+        return response
+
+    def __on_throttle(self, operation_name: str, rate_limiter):
+        rate_limiter.on_throttle()
+        self.__logger.warning(f"DataZone throttled {operation_name}, lowering its rate to "
+                              f"{rate_limiter.rate:.2f} requests per second")
+
+    @staticmethod
+    def get_metrics() -> Dict[str, DataZoneOperationMetrics]:
+        """
+        :return: Metrics recorded since the last flush, keyed by DataZone operation name
+        """
+        with InstrumentedDataZoneClient.__lock:
+            return dict(InstrumentedDataZoneClient.__metrics)
+
+    @staticmethod
+    def flush_metrics(logger):
+        """
+        Logs a summary line per DataZone operation called since the last flush and clears the metrics
+        """
+        with InstrumentedDataZoneClient.__lock:
+            metrics, InstrumentedDataZoneClient.__metrics = InstrumentedDataZoneClient.__metrics, {}
+        for operation_metrics in metrics.values():
+            logger.info(f"DataZone operation metrics - {operation_metrics}")
+
+    @staticmethod
+    def reset():
+        with InstrumentedDataZoneClient.__lock:
+            InstrumentedDataZoneClient.__metrics = {}
+
+    @staticmethod
+    def __record(operation_name: str, latency_in_seconds: float, retries: int, error: bool = False,
+                 throttled: bool = False):
+        with InstrumentedDataZoneClient.__lock:
+            if operation_name not in InstrumentedDataZoneClient.__metrics:
+                InstrumentedDataZoneClient.__metrics[operation_name] = DataZoneOperationMetrics(operation_name)
+            InstrumentedDataZoneClient.__metrics[operation_name].record(latency_in_seconds, retries, error, throttled)
+
+    @staticmethod
+    def __is_throttled(error_response: dict) -> bool:
+        return (error_response.get('Error', {}).get('Code') == THROTTLING_EXCEPTION_CODE
+                or error_response.get('ResponseMetadata', {}).get('HTTPStatusCode') == THROTTLING_HTTP_STATUS_CODE)
+
+    @staticmethod
+    def __get_retry_attempts(response) -> int:
+        # botocore reports the retries it made in the response metadata, also for errors raised after retrying
+        if not isinstance(response, dict):
+            return 0
+        return response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
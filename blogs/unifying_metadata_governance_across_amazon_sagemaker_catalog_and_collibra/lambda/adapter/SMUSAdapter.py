@@ -1,6 +1,10 @@
-from typing import List
+from functools import partial
+from typing import Iterator, List
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.AWSClientFactory import AWSClientFactory
+from business.NextTokenPaginator import NextTokenPaginator
+from business.SMUSBootstrapCache import SMUSBootstrapCache
 from utils.common_utils import get_collibra_synced_glossary_name, wait_until
 from utils.env_utils import SMUS_DOMAIN_ID, SMUS_GLOSSARY_OWNER_PROJECT_ID, \
     SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN
@@ -16,8 +20,8 @@ class SMUSAdapter:
 
     def __init__(self, logger):
         self.__logger = logger
-        self.__client = AWSClientFactory.create('datazone')
-        self.__admin_role_user_id = self.__find_admin_role_user_id()
+        self.__client = InstrumentedDataZoneClient(self.__logger, AWSClientFactory.create('datazone'))
+        self.__get_admin_role_user_id()
 
     def get_project(self, project_id):
         return self.__client.get_project(
@@ -27,9 +31,12 @@ class SMUSAdapter:
 
     def create_or_get_glossary(self) -> str:
         """
-        Creates glossary in SMUS if it doesn't exist
+        Creates glossary in SMUS if it doesn't exist. The glossary id is cached for the lifetime of the container
         :return: Glossary id
         """
+        return SMUSBootstrapCache.get(SMUSAdapter.__get_glossary_id_key(), self.__create_or_get_glossary)
+
+    def __create_or_get_glossary(self) -> str:
         glossary_name = get_collibra_synced_glossary_name()
         self.__logger.info(f"Using glossary with name: {glossary_name}")
         search_response = self.__client.search(domainIdentifier=SMUS_DOMAIN_ID,
@@ -68,12 +75,17 @@ class SMUSAdapter:
         return None
 
     def create_glossary_term(self, glossary_id: str, name: str, descriptions: List[str]):
-        self.__client.create_glossary_term(
-            domainIdentifier=SMUS_DOMAIN_ID,
-            glossaryIdentifier=glossary_id,
-            name=name,
-            status='ENABLED', **self.__get_description_args_of_glossary_term(descriptions)
-        )
+        try:
+            self.__client.create_glossary_term(
+                domainIdentifier=SMUS_DOMAIN_ID,
+                glossaryIdentifier=glossary_id,
+                name=name,
+                status='ENABLED', **self.__get_description_args_of_glossary_term(descriptions)
+            )
+        except self.__client.exceptions.ResourceNotFoundException:
+            # The cached glossary may have been deleted, so it is resolved again on next use
+            SMUSBootstrapCache.invalidate(SMUSAdapter.__get_glossary_id_key())
+            raise
 
     def update_glossary_term_description(self, glossary_term_id: str, descriptions: List[str]):
         self.__client.update_glossary_term(
@@ -83,20 +95,22 @@ class SMUSAdapter:
         )
 
     def search_all_assets_by_name(self, table_name: str, project_id: str):
-        items = []
-        next_token = None
-        has_more_items = True
-        while has_more_items:
-            search_response = self.search_asset_by_name(table_name, project_id, next_token)
-            items.extend(search_response['items'])
-            next_token = search_response.get('nextToken', None)
+        return list(self.iter_assets_by_name(table_name, project_id))
 
-            if not next_token:
-                has_more_items = False
-        return items
+    def iter_assets_by_name(self, table_name: str, project_id: str | None, prefetch: bool = False) -> Iterator[dict]:
+        return iter(NextTokenPaginator(partial(self.search_asset_by_name, table_name, project_id), prefetch=prefetch))
 
-    def search_asset_by_name(self, table_name: str, project_id: str, next_token: str = None):
-        args = {"searchScope": 'ASSET', "owningProjectIdentifier": project_id,
+    def search_all_assets_by_name_in_domain(self, table_name: str):
+        """
+        Searches assets with the name across all projects of the domain in one paged query
+        """
+        return list(self.iter_assets_by_name(table_name, None))
+
+    def search_asset_by_name(self, table_name: str, project_id: str | None, next_token: str = None):
+        """
+        :param project_id: Owning project of the assets, or None to search the whole domain
+        """
+        args = {"searchScope": 'ASSET',
                 "domainIdentifier": SMUS_DOMAIN_ID,
                 "additionalAttributes": ["FORMS"],
                 "searchIn": [{"attribute": "RedshiftTableForm.tableName"}, {"attribute": "GlueTableForm.tableName"}],
@@ -104,23 +118,19 @@ class SMUSAdapter:
                 "maxResults": SMUSAdapter.MAX_RESULTS,
                 }
 
+        if project_id:
+            args['owningProjectIdentifier'] = project_id
+
         if next_token:
             args['nextToken'] = next_token
 
         return self.__client.search(**args)
 
     def search_all_listings(self, project_id: str, search_text: str = None):
-        items = []
-        next_token = None
-        has_more_items = True
-        while has_more_items:
-            search_response = self.search_listings(project_id, search_text, next_token)
-            items.extend(search_response['items'])
-            next_token = search_response.get('nextToken', None)
+        return list(self.iter_listings(project_id, search_text))
 
-            if not next_token:
-                has_more_items = False
-        return items
+    def iter_listings(self, project_id: str, search_text: str = None, prefetch: bool = False) -> Iterator[dict]:
+        return iter(NextTokenPaginator(partial(self.search_listings, project_id, search_text), prefetch=prefetch))
 
     def search_listings(self, project_id: str, search_text: str = None, next_token: str = None):
         args = {"domainIdentifier": SMUS_DOMAIN_ID,
@@ -139,17 +149,10 @@ class SMUSAdapter:
         return self.__client.search_listings(**args)
 
     def list_all_terms_in_glossary(self, glossary_id: str):
-        items = []
-        next_token = None
-        has_more_items = True
-        while has_more_items:
-            search_response = self.list_terms_in_glossary(glossary_id, next_token)
-            items.extend(search_response['items'])
-            next_token = search_response.get('nextToken', None)
+        return list(self.iter_terms_in_glossary(glossary_id))
 
-            if not next_token:
-                has_more_items = False
-        return items
+    def iter_terms_in_glossary(self, glossary_id: str, prefetch: bool = False) -> Iterator[dict]:
+        return iter(NextTokenPaginator(partial(self.list_terms_in_glossary, glossary_id), prefetch=prefetch))
 
     def list_terms_in_glossary(self, glossary_id: str, next_token: str = None):
         args = {
@@ -166,17 +169,11 @@ class SMUSAdapter:
         return self.__client.search(**args)
 
     def list_all_users_in_project(self, project_id: str):
-        items = []
-        next_token = None
-        has_more_items = True
-        while has_more_items:
-            search_response = self.list_users_in_project(project_id, next_token)
-            items.extend(search_response['members'])
-            next_token = search_response.get('nextToken', None)
+        return list(self.iter_users_in_project(project_id))
 
-            if not next_token:
-                has_more_items = False
-        return items
+    def iter_users_in_project(self, project_id: str, prefetch: bool = False) -> Iterator[dict]:
+        return iter(NextTokenPaginator(partial(self.list_users_in_project, project_id), items_key='members',
+                                       prefetch=prefetch))
 
     def list_users_in_project(self, project_id: str, next_token: str = None):
         args = {
@@ -214,14 +211,18 @@ class SMUSAdapter:
                                                    identifier=asset_id, **optional_args)
 
     def update_glossary_term_relations(self, glossary_id: str, id: str, name: str, term_relations: List[str]):
-        return self.__client.update_glossary_term(
-            domainIdentifier=SMUS_DOMAIN_ID,
-            glossaryIdentifier=glossary_id,
-            name=name,
-            termRelations=term_relations,
-            identifier=id,
-            status='ENABLED',
-        )
+        try:
+            return self.__client.update_glossary_term(
+                domainIdentifier=SMUS_DOMAIN_ID,
+                glossaryIdentifier=glossary_id,
+                name=name,
+                termRelations=term_relations,
+                identifier=id,
+                status='ENABLED',
+            )
+        except self.__client.exceptions.ResourceNotFoundException:
+            SMUSBootstrapCache.invalidate(SMUSAdapter.__get_glossary_id_key())
+            raise
 
     def create_subscription_request(self, listing_id: str, consumer_project_id: str):
         return self.__client.create_subscription_request(
@@ -272,31 +273,42 @@ class SMUSAdapter:
         )
 
     def list_all_projects(self):
-        items = []
-        next_token = None
-        has_more_items = True
-        while has_more_items:
-            search_response = self.list_projects(SMUSAdapter.MAX_RESULTS, next_token)
-            for project in search_response['items']:
-                if project["projectStatus"] == "ACTIVE":
-                    items.append(project)
-            next_token = search_response.get('nextToken', None)
+        return list(self.iter_projects())
 
-            if not next_token:
-                has_more_items = False
-        return items
+    def iter_projects(self, prefetch: bool = False) -> Iterator[dict]:
+        """
+        :return: Active projects of the integration admin
+        """
+        projects = NextTokenPaginator(partial(self.list_projects, SMUSAdapter.MAX_RESULTS), prefetch=prefetch)
+        return (project for project in projects if project["projectStatus"] == "ACTIVE")
 
     def list_projects(self, max_results: int, next_token: str = None):
         args = {
             'domainIdentifier': SMUS_DOMAIN_ID,
             'maxResults': max_results,
-            'userIdentifier': self.__admin_role_user_id
         }
 
         if next_token:
             args['nextToken'] = next_token
 
-        return self.__client.list_projects(**args)
+        try:
+            return self.__client.list_projects(userIdentifier=self.__get_admin_role_user_id(), **args)
+        except self.__client.exceptions.ResourceNotFoundException:
+            # The cached admin user may have been recreated with a new id, so it is looked up again once
+            self.__logger.info("Admin role user not found in SMUS. Looking it up again.")
+            SMUSBootstrapCache.invalidate(SMUSAdapter.__get_admin_role_user_id_key())
+            return self.__client.list_projects(userIdentifier=self.__get_admin_role_user_id(), **args)
+
+    def __get_admin_role_user_id(self):
+        return SMUSBootstrapCache.get(SMUSAdapter.__get_admin_role_user_id_key(), self.__find_admin_role_user_id)
+
+    @staticmethod
+    def __get_admin_role_user_id_key() -> str:
+        return f"admin-role-user-id/{SMUS_DOMAIN_ID}/{SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN}"
+
+    @staticmethod
+    def __get_glossary_id_key() -> str:
+        return f"glossary-id/{SMUS_DOMAIN_ID}/{get_collibra_synced_glossary_name()}"
 
     def __find_admin_role_user_id(self):
         has_more_items = True
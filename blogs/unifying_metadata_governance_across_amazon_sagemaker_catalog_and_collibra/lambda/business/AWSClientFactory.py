@@ -1,11 +1,46 @@
+import threading
+
 import boto3
 from botocore.config import Config
 
-from utils.env_utils import SMUS_REGION
+from utils.env_utils import SMUS_REGION, AWS_CLIENT_MAX_POOL_CONNECTIONS, AWS_CLIENT_MAX_ATTEMPTS, \
+    AWS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS, AWS_CLIENT_READ_TIMEOUT_IN_SECONDS
 
 
 class AWSClientFactory:
+    """
+    Hands out one process-wide boto3 client per service, so that clients and their connection pools are created
+    once per container and shared by all adapters and invocations. boto3 clients are thread-safe once created,
+    but their creation is not, so it is serialized.
+    """
+    __clients = {}
+    __lock = threading.Lock()
+
     @staticmethod
     def create(service_name: str):
-        return boto3.client(service_name,
-                            config=Config(region_name=SMUS_REGION))
+        with AWSClientFactory.__lock:
+            if service_name not in AWSClientFactory.__clients:
+                AWSClientFactory.__clients[service_name] = boto3.client(service_name,
+                                                                        config=AWSClientFactory.__create_config())
+            return AWSClientFactory.__clients[service_name]
+
+    @staticmethod
+    def register(service_name: str, client):
+        """
+        Hands out the given client for the service instead of a boto3 client, e.g. a local stand-in for benchmarks
+        """
+        with AWSClientFactory.__lock:
+            AWSClientFactory.__clients[service_name] = client
+
+    @staticmethod
+    def reset():
+        with AWSClientFactory.__lock:
+            AWSClientFactory.__clients = {}
+
+    @staticmethod
+    def __create_config() -> Config:
+        return Config(region_name=SMUS_REGION,
+                      max_pool_connections=AWS_CLIENT_MAX_POOL_CONNECTIONS,
+                      retries={"mode": "adaptive", "max_attempts": AWS_CLIENT_MAX_ATTEMPTS},
+                      connect_timeout=AWS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS,
+                      read_timeout=AWS_CLIENT_READ_TIMEOUT_IN_SECONDS)
@@ -0,0 +1,65 @@
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket whose refill rate adapts to the throttling signals of the remote API (AIMD).
+
+    Every successful request raises the rate additively up to `max_rate`, every throttled request halves it
+    down to `min_rate`. A Retry-After hint pauses all callers until it has elapsed.
+    """
+    ADDITIVE_INCREASE = 0.1
+    MULTIPLICATIVE_DECREASE = 0.5
+
+    def __init__(self, max_rate: float, min_rate: float = 0.5, clock=time.monotonic, sleep=time.sleep):
+        """
+        :param max_rate: Upper bound and initial value of the rate, in requests per second
+        :param min_rate: Lower bound of the rate, in requests per second
+        """
+        self.__max_rate = max_rate
+        self.__min_rate = min_rate
+        self.__rate = max_rate
+        self.__tokens = max(1.0, max_rate)
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__last_refill_time = clock()
+        self.__blocked_until = 0.0
+        self.__lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    def acquire(self):
+        """
+        Blocks until a request is allowed to go out
+        """
+        while True:
+            with self.__lock:
+                now = self.__clock()
+                self.__refill(now)
+                if self.__blocked_until > now:
+                    wait_time = self.__blocked_until - now
+                elif self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                else:
+                    wait_time = (1 - self.__tokens) / self.__rate
+            self.__sleep(wait_time)
+
+    def on_success(self):
+        with self.__lock:
+            self.__rate = min(self.__max_rate, self.__rate + AdaptiveRateLimiter.ADDITIVE_INCREASE)
+
+    def on_throttle(self, retry_after_in_seconds: float = None):
+        with self.__lock:
+            self.__rate = max(self.__min_rate, self.__rate * AdaptiveRateLimiter.MULTIPLICATIVE_DECREASE)
+            self.__tokens = min(self.__tokens, 0.0)
+            if retry_after_in_seconds:
+                self.__blocked_until = max(self.__blocked_until, self.__clock() + retry_after_in_seconds)
+
+    def __refill(self, now: float):
+        # Burst is capped at one second worth of requests
+        self.__tokens = min(max(1.0, self.__rate), self.__tokens + (now - self.__last_refill_time) * self.__rate)
+        self.__last_refill_time = now
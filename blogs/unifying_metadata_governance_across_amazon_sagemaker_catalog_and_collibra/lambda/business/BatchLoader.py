@@ -0,0 +1,50 @@
+from itertools import islice
+from typing import Callable, Dict, Iterable, List
+
+
+class BatchLoader:
+    """
+    Coalesces per-key lookups into batched requests, in the spirit of DataLoader.
+
+    Keys queued through `load`/`load_many` are not fetched until a value is first requested through `get`,
+    at which point all pending keys are fetched together in chunks of at most `max_batch_size` keys.
+    Results are cached for the lifetime of the loader, so it should be scoped to a single sync run.
+    """
+
+    def __init__(self, batch_load_fn: Callable[[List[str]], Dict[str, dict]], max_batch_size: int):
+        """
+        :param batch_load_fn: Callable which fetches a list of keys and returns the found values keyed by key.
+        Keys missing from the returned dict are treated as not found.
+        :param max_batch_size: Maximum number of keys fetched by a single call to batch_load_fn
+        """
+        self.__batch_load_fn = batch_load_fn
+        self.__max_batch_size = max_batch_size
+        self.__pending_keys = {}
+        self.__cache = {}
+
+    def load(self, key: str):
+        if key not in self.__cache and key not in self.__pending_keys:
+            self.__pending_keys[key] = None
+
+    def load_many(self, keys: Iterable[str]):
+        for key in keys:
+            self.load(key)
+
+    def get(self, key: str):
+        """
+        :return: Value for the key or None if it doesn't exist
+        :raises Exception: If the batch containing the key fails to load
+        """
+        if key not in self.__cache:
+            self.load(key)
+            self.__dispatch()
+        return self.__cache.get(key)
+
+    def __dispatch(self):
+        while self.__pending_keys:
+            batch = list(islice(self.__pending_keys, self.__max_batch_size))
+            for key in batch:
+                del self.__pending_keys[key]
+            values = self.__batch_load_fn(batch)
+            for key in batch:
+                self.__cache[key] = values.get(key)
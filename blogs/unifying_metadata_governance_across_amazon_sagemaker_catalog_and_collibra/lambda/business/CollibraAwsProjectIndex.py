@@ -0,0 +1,51 @@
+from typing import List
+
+from adapter.CollibraAdapter import CollibraAdapter
+from utils.collibra_constants import DISPLAY_NAME_KEY, ID_KEY, STRING_ATTRIBUTES_KEY, STRING_VALUE_KEY
+
+
+class CollibraAwsProjectIndex:
+    """
+    In-memory index of Collibra AWS projects by name together with the SMUS project ids held in their project
+    attributes, loaded with a single paged scan on first use. Projects and attributes written during the run are
+    recorded through `add_project` and `set_smus_project_ids`.
+    """
+
+    def __init__(self, logger, collibra_adapter: CollibraAdapter):
+        self.__logger = logger
+        self.__collibra_adapter = collibra_adapter
+        self.__project_ids_by_name = None
+        self.__smus_project_ids_by_project_id = {}
+
+    def get_project_id(self, project_name: str) -> str | None:
+        self.__load_if_needed()
+        return self.__project_ids_by_name.get(project_name)
+
+    def get_smus_project_ids(self, project_id: str) -> List[str]:
+        self.__load_if_needed()
+        return self.__smus_project_ids_by_project_id.get(project_id, [])
+
+    def add_project(self, project_name: str, project_id: str):
+        self.__load_if_needed()
+        self.__project_ids_by_name[project_name] = project_id
+
+    def set_smus_project_ids(self, project_id: str, smus_project_ids: List[str]):
+        self.__load_if_needed()
+        self.__smus_project_ids_by_project_id[project_id] = smus_project_ids
+
+    def __load_if_needed(self):
+        if self.__project_ids_by_name is not None:
+            return
+
+        self.__logger.info("Loading Collibra AWS project index")
+
+        project_ids_by_name = {}
+        smus_project_ids_by_project_id = {}
+        for project in self.__collibra_adapter.get_all_aws_projects():
+            project_ids_by_name.setdefault(project[DISPLAY_NAME_KEY], project[ID_KEY])
+            smus_project_ids_by_project_id[project[ID_KEY]] = [attribute[STRING_VALUE_KEY]
+                                                               for attribute in project.get(STRING_ATTRIBUTES_KEY) or []]
+
+        self.__project_ids_by_name = project_ids_by_name
+        self.__smus_project_ids_by_project_id = smus_project_ids_by_project_id
+        self.__logger.info(f"Loaded Collibra AWS project index with {len(project_ids_by_name)} projects")
@@ -0,0 +1,52 @@
+from typing import Set
+
+from adapter.CollibraAdapter import CollibraAdapter
+from utils.collibra_constants import DISPLAY_NAME_KEY, ID_KEY, STRING_ATTRIBUTES_KEY, STRING_VALUE_KEY
+
+
+class CollibraAwsUserDirectory:
+    """
+    In-memory directory of Collibra AWS users and the projects recorded in their project attributes, loaded with a
+    single paged scan on first use. Users and project attributes written during the run are recorded through
+    `add_user` and `add_project`, so the directory stays usable as the state to diff against for the whole run.
+    """
+
+    def __init__(self, logger, collibra_adapter: CollibraAdapter):
+        self.__logger = logger
+        self.__collibra_adapter = collibra_adapter
+        self.__user_ids_by_name = None
+        self.__projects_by_user_id = {}
+
+    def get_user_id(self, username: str) -> str | None:
+        self.__load_if_needed()
+        return self.__user_ids_by_name.get(username)
+
+    def get_projects(self, user_id: str) -> Set[str]:
+        self.__load_if_needed()
+        return self.__projects_by_user_id.get(user_id, set())
+
+    def add_user(self, username: str, user_id: str):
+        self.__load_if_needed()
+        self.__user_ids_by_name[username] = user_id
+        self.__projects_by_user_id.setdefault(user_id, set())
+
+    def add_project(self, user_id: str, project_name: str):
+        self.__load_if_needed()
+        self.__projects_by_user_id.setdefault(user_id, set()).add(project_name)
+
+    def __load_if_needed(self):
+        if self.__user_ids_by_name is not None:
+            return
+
+        self.__logger.info("Loading Collibra AWS user directory")
+
+        user_ids_by_name = {}
+        projects_by_user_id = {}
+        for user in self.__collibra_adapter.get_all_aws_users():
+            user_ids_by_name.setdefault(user[DISPLAY_NAME_KEY], user[ID_KEY])
+            projects_by_user_id[user[ID_KEY]] = {attribute[STRING_VALUE_KEY]
+                                                 for attribute in user.get(STRING_ATTRIBUTES_KEY) or []}
+
+        self.__user_ids_by_name = user_ids_by_name
+        self.__projects_by_user_id = projects_by_user_id
+        self.__logger.info(f"Loaded Collibra AWS user directory with {len(user_ids_by_name)} users")
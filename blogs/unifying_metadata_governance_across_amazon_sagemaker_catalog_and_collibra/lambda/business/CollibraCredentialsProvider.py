@@ -0,0 +1,65 @@
+import base64
+import json
+import threading
+import time
+
+from business.AWSClientFactory import AWSClientFactory
+from model.CollibraConfig import CollibraConfig
+from utils.env_utils import COLLIBRA_CONFIG_SECRETS_NAME, COLLIBRA_CREDENTIALS_TTL_IN_SECONDS
+
+
+class CollibraCredentialsProvider:
+    """
+    Process-wide cache of the Collibra config secret and the Basic authorization token derived from it, so that
+    Secrets Manager is called once per container rather than once per adapter. Entries expire after
+    COLLIBRA_CREDENTIALS_TTL_IN_SECONDS, and `refresh` forces a reload after the credentials were rejected.
+    """
+    __config = None
+    __authorization_token = None
+    __expires_at = 0.0
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_config() -> CollibraConfig:
+        CollibraCredentialsProvider.__load_if_expired()
+        return CollibraCredentialsProvider.__config
+
+    @staticmethod
+    def get_authorization_token() -> str:
+        CollibraCredentialsProvider.__load_if_expired()
+        return CollibraCredentialsProvider.__authorization_token
+
+    @staticmethod
+    def refresh():
+        with CollibraCredentialsProvider.__lock:
+            CollibraCredentialsProvider.__load()
+
+    @staticmethod
+    def reset():
+        with CollibraCredentialsProvider.__lock:
+            CollibraCredentialsProvider.__config = None
+            CollibraCredentialsProvider.__authorization_token = None
+            CollibraCredentialsProvider.__expires_at = 0.0
+
+    @staticmethod
+    def __load_if_expired():
+        with CollibraCredentialsProvider.__lock:
+            if time.monotonic() >= CollibraCredentialsProvider.__expires_at:
+                CollibraCredentialsProvider.__load()
+
+    @staticmethod
+    def __load():
+        secrets_manager_client = AWSClientFactory.create('secretsmanager')
+        get_secret_value_response = secrets_manager_client.get_secret_value(SecretId=COLLIBRA_CONFIG_SECRETS_NAME)
+        config = CollibraConfig(json.loads(get_secret_value_response['SecretString']))
+
+        CollibraCredentialsProvider.__config = config
+        CollibraCredentialsProvider.__authorization_token = CollibraCredentialsProvider.__get_authorization_token(config)
+        CollibraCredentialsProvider.__expires_at = time.monotonic() + COLLIBRA_CREDENTIALS_TTL_IN_SECONDS
+
+    @staticmethod
+    def __get_authorization_token(config: CollibraConfig) -> str:
+        authorization_token_string = f"{config.username}:{config.password}"
+        authorization_token_bytes = authorization_token_string.encode("utf-8")
+        encoded_authorization_token_bytes = base64.b64encode(authorization_token_bytes)
+        return encoded_authorization_token_bytes.decode('utf-8')
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from adapter.CollibraAdapter import CollibraAdapter
+from utils.collibra_constants import DISPLAY_NAME_KEY
+from utils.env_utils import COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS
+
+
+class CollibraTableNameIndex:
+    """
+    Process-wide index of Collibra AWS tables by name, built from a single paged scan of all table names so that
+    lookups by name don't need a request each. The index is built on first use and rebuilt once it is older than
+    COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS or when `refresh` is called, so tables created in Collibra after it was
+    built are only found after that or once added with `add`.
+
+    A failed scan is not retried before FAILED_LOAD_RETRY_INTERVAL_IN_SECONDS has passed, so that an unavailable
+    Collibra costs one scan per interval rather than one per lookup. Meanwhile the previous index is served if there
+    is one, and the failure is raised otherwise.
+    """
+    FAILED_LOAD_RETRY_INTERVAL_IN_SECONDS = 60
+    __tables_by_name = None
+    __load_error = None
+    __expires_at = 0.0
+    __lock = threading.Lock()
+
+    def __init__(self, logger, collibra_adapter: CollibraAdapter):
+        self.__logger = logger
+        self.__collibra_adapter = collibra_adapter
+
+    def get(self, table_name: str) -> dict | None:
+        """
+        :return: Id and name of the first table with the name, or None if there is no such table
+        :raises Exception: If the index has to be built and fails to load
+        """
+        with CollibraTableNameIndex.__lock:
+            if time.monotonic() >= CollibraTableNameIndex.__expires_at:
+                self.__try_load()
+            if CollibraTableNameIndex.__tables_by_name is None:
+                raise Exception(f"Collibra table name index is unavailable. Error: {CollibraTableNameIndex.__load_error}")
+            return CollibraTableNameIndex.__tables_by_name.get(table_name)
+
+    def add(self, table: dict):
+        """
+        Adds a table found in Collibra after the index was built
+        """
+        with CollibraTableNameIndex.__lock:
+            if CollibraTableNameIndex.__tables_by_name is not None:
+                CollibraTableNameIndex.__tables_by_name.setdefault(table[DISPLAY_NAME_KEY], table)
+
+    def refresh(self):
+        with CollibraTableNameIndex.__lock:
+            self.__load()
+
+    @staticmethod
+    def reset():
+        with CollibraTableNameIndex.__lock:
+            CollibraTableNameIndex.__tables_by_name = None
+            CollibraTableNameIndex.__load_error = None
+            CollibraTableNameIndex.__expires_at = 0.0
+
+    def __try_load(self):
+        try:
+            self.__load()
+        except Exception as e:
+            self.__logger.warning(f"Failed to load Collibra table name index. Exception: {e}")
+            CollibraTableNameIndex.__load_error = e
+            CollibraTableNameIndex.__expires_at = \
+                time.monotonic() + CollibraTableNameIndex.FAILED_LOAD_RETRY_INTERVAL_IN_SECONDS
+
+    def __load(self):
+        self.__logger.info("Loading Collibra table name index")
+
+        tables_by_name = {}
+        for table in self.__collibra_adapter.get_all_table_names():
+            tables_by_name.setdefault(table[DISPLAY_NAME_KEY], table)
+
+        CollibraTableNameIndex.__tables_by_name = tables_by_name
+        CollibraTableNameIndex.__load_error = None
+        CollibraTableNameIndex.__expires_at = time.monotonic() + COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS
+        self.__logger.info(f"Loaded Collibra table name index with {len(tables_by_name)} tables")
@@ -0,0 +1,32 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.env_utils import COLLIBRA_HTTP_POOL_SIZE
+
+
+class HTTPSessionFactory:
+    """
+    Hands out a process-wide requests session backed by a keep-alive connection pool, so that
+    connections opened in one warm Lambda invocation are reused by the next.
+    """
+    __session = None
+
+    @staticmethod
+    def get(pool_size: int = COLLIBRA_HTTP_POOL_SIZE) -> requests.Session:
+        if HTTPSessionFactory.__session is None:
+            HTTPSessionFactory.__session = HTTPSessionFactory.__create(pool_size)
+        return HTTPSessionFactory.__session
+
+    @staticmethod
+    def reset():
+        if HTTPSessionFactory.__session is not None:
+            HTTPSessionFactory.__session.close()
+        HTTPSessionFactory.__session = None
+
+    @staticmethod
+    def __create(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+
+class NextTokenPaginator:
+    """
+    Lazily iterates over the items of a next token paginated API, like most SMUS list and search operations.
+
+    Pages are only requested while the caller keeps iterating, so a caller which stops at the first match doesn't
+    download the remaining pages. With prefetching, the next page is requested on a background thread as soon as the
+    current page is handed out, so that its latency overlaps with the processing of the current page.
+    """
+
+    def __init__(self, fetch_page: Callable[[Optional[str]], dict], items_key: str = 'items',
+                 prefetch: bool = False):
+        """
+        :param fetch_page: Callable which fetches the page of the given next token, or the first page if it is None
+        :param items_key: Key of the items in a page
+        :param prefetch: Whether to fetch the next page while the items of the current page are consumed
+        """
+        self.__fetch_page = fetch_page
+        self.__items_key = items_key
+        self.__prefetch = prefetch
+
+    def __iter__(self) -> Iterator[dict]:
+        executor = ThreadPoolExecutor(max_workers=1) if self.__prefetch else None
+        try:
+            page = self.__fetch_page(None)
+            while True:
+                next_token = page.get('nextToken', None)
+                next_page = executor.submit(self.__fetch_page, next_token) if executor and next_token else None
+
+                yield from page[self.__items_key]
+
+                if not next_token:
+                    return
+                page = next_page.result() if next_page else self.__fetch_page(next_token)
+        finally:
+            # Also runs when the caller stops iterating early, which abandons the pending prefetch
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from utils.collibra_constants import ID_KEY
+
+
+class PrefetchingPageIterator:
+    """
+    Iterates over the pages of a keyset (last seen id) paginated API.
+
+    The next page is requested on a background thread as soon as the current page is handed out, so that its latency
+    overlaps with the processing of the current page. Iteration stops at the first empty page, or when the cursor
+    stops advancing. Closing the iterator abandons the pending prefetch.
+    """
+
+    def __init__(self, fetch_page: Callable[[Optional[str]], List[dict]], last_seen_id: str = None,
+                 cursor_key: str = ID_KEY):
+        """
+        :param fetch_page: Callable which fetches the page of items after the given last seen id, or the first page
+        if it is None
+        :param last_seen_id: Cursor to start iterating after
+        :param cursor_key: Key of the item attribute used as cursor
+        """
+        self.__fetch_page = fetch_page
+        self.__last_seen_id = last_seen_id
+        self.__cursor_key = cursor_key
+        self.__is_exhausted = False
+        self.__executor = ThreadPoolExecutor(max_workers=1)
+        self.__next_page = self.__executor.submit(fetch_page, last_seen_id)
+
+    @property
+    def is_exhausted(self) -> bool:
+        """
+        :return: True if iteration stopped because there are no more items after the last seen id
+        """
+        return self.__is_exhausted
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> List[dict]:
+        if self.__next_page is None:
+            raise StopIteration
+
+        try:
+            page = self.__next_page.result()
+        except Exception:
+            self.close()
+            raise
+
+        if not page:
+            self.__is_exhausted = True
+            self.close()
+            raise StopIteration
+
+        last_seen_id = page[-1][self.__cursor_key]
+        if last_seen_id == self.__last_seen_id:
+            self.close()
+            raise StopIteration
+
+        self.__last_seen_id = last_seen_id
+        self.__next_page = self.__executor.submit(self.__fetch_page, last_seen_id)
+        return page
+
+    def close(self):
+        self.__next_page = None
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from adapter.SMUSAdapter import SMUSAdapter
+from model.SMUSAssetRevisionWriteResult import SMUSAssetRevisionWriteResult
+from utils.env_utils import SMUS_ASSET_REVISION_WRITER_MAX_CONCURRENCY
+
+
+class SMUSAssetRevisionWriter:
+    """
+    Writes prepared asset revisions to SMUS concurrently on a bounded worker pool, so that the writes of a page of
+    tables overlap instead of serialising the sync. The DataZone client paces the writes through the CreateAssetRevision
+    token bucket and its botocore adaptive retries are the only retry layer, so a write still throttled after them is
+    reported as failed. `wait` blocks until all submitted revisions are written and reports which of them completed and
+    which failed.
+    """
+
+    def __init__(self, logger, smus_adapter: SMUSAdapter, max_workers: int = SMUS_ASSET_REVISION_WRITER_MAX_CONCURRENCY):
+        self.__logger = logger
+        self.__smus_adapter = smus_adapter
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.__pending_writes = []
+
+    def submit(self, asset_name: str, asset_id: str, forms_input: list, **optional_args):
+        future = self.__executor.submit(self.__write, asset_name, asset_id, forms_input, optional_args)
+        self.__pending_writes.append((asset_name, asset_id, future))
+
+    def wait(self) -> SMUSAssetRevisionWriteResult:
+        """
+        :return: Outcome of the revisions submitted since the last wait
+        """
+        result = SMUSAssetRevisionWriteResult()
+        pending_writes, self.__pending_writes = self.__pending_writes, []
+        for asset_name, asset_id, future in pending_writes:
+            try:
+                future.result()
+                result.add_completed(asset_name, asset_id)
+            except Exception as e:
+                result.add_failed(asset_name, asset_id, e)
+
+        self.__logger.info(f"Wrote {len(result.completed)} asset revisions to SMUS, {len(result.failed)} failed")
+        return result
+
+    def close(self):
+        self.__executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __write(self, asset_name: str, asset_id: str, forms_input: list, optional_args: dict):
+        return self.__smus_adapter.create_asset_revision(asset_name, asset_id, forms_input, **optional_args)
@@ -0,0 +1,49 @@
+import threading
+from typing import Callable
+
+
+class SMUSBootstrapCache:
+    """
+    Process-wide cache of identifiers which every SMUSAdapter needs and which rarely change, like the user id of the
+    integration admin role and the id of the synced glossary. They are resolved once per container and reused by all
+    adapters of the following warm invocations. An identifier is invalidated when SMUS reports that it no longer
+    exists, so it is resolved again on next use.
+    """
+    __values = {}
+    # Loads of one key are serialized so that e.g. the glossary is created once, while other keys stay available
+    __key_locks = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get(key: str, load: Callable[[], str | None]) -> str | None:
+        """
+        :param load: Resolves the identifier if it isn't cached. A None result is not cached
+        """
+        with SMUSBootstrapCache.__lock:
+            if key in SMUSBootstrapCache.__values:
+                return SMUSBootstrapCache.__values[key]
+            key_lock = SMUSBootstrapCache.__key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have loaded the key while this one was waiting for it
+            with SMUSBootstrapCache.__lock:
+                if key in SMUSBootstrapCache.__values:
+                    return SMUSBootstrapCache.__values[key]
+
+            value = load()
+            if value is None:
+                return None
+            with SMUSBootstrapCache.__lock:
+                SMUSBootstrapCache.__values[key] = value
+            return value
+
+    @staticmethod
+    def invalidate(key: str):
+        with SMUSBootstrapCache.__lock:
+            SMUSBootstrapCache.__values.pop(key, None)
+
+    @staticmethod
+    def reset():
+        with SMUSBootstrapCache.__lock:
+            SMUSBootstrapCache.__values = {}
+            SMUSBootstrapCache.__key_locks = {}
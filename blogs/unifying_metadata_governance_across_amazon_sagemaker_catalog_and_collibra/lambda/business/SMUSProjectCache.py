@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import List
+
+from adapter.SMUSAdapter import SMUSAdapter
+from utils.collibra_constants import ID_KEY
+from utils.env_utils import SMUS_PROJECTS_TTL_IN_SECONDS
+
+
+class SMUSProjectCache:
+    """
+    Process-wide set of the active SMUS projects of the integration admin, so that a burst of events handled by a
+    warm container doesn't list all projects once per event. The set is loaded on first use and reloaded once it is
+    older than SMUS_PROJECTS_TTL_IN_SECONDS or when `refresh` is called, e.g. because a project event arrived.
+    A project missing from the set triggers one reload before it is reported as unknown, unless the set was loaded
+    less than MISS_RELOAD_INTERVAL_IN_SECONDS ago.
+
+    A project event reaches only the one container which handles it, so every other warm container keeps its set
+    until the TTL expires. SMUS_PROJECTS_TTL_IN_SECONDS is therefore the bound on how stale the set can be, and
+    `refresh` only shortens it for the container that received the event. A burst of project events reloads the
+    set at most once per REFRESH_DEBOUNCE_INTERVAL_IN_SECONDS.
+    """
+    MISS_RELOAD_INTERVAL_IN_SECONDS = 30
+    REFRESH_DEBOUNCE_INTERVAL_IN_SECONDS = 10
+    __project_ids = None
+    __loaded_at = 0.0
+    __expires_at = 0.0
+    __lock = threading.Lock()
+
+    def __init__(self, logger, smus_adapter: SMUSAdapter):
+        self.__logger = logger
+        self.__smus_adapter = smus_adapter
+
+    def get_project_ids(self) -> List[str]:
+        with SMUSProjectCache.__lock:
+            self.__load_if_expired()
+            return list(SMUSProjectCache.__project_ids)
+
+    def contains(self, project_id: str) -> bool:
+        with SMUSProjectCache.__lock:
+            self.__load_if_expired()
+            if project_id in SMUSProjectCache.__project_ids:
+                return True
+
+            # The project may have been created since the last load, e.g. when its project event was missed
+            if time.monotonic() - SMUSProjectCache.__loaded_at < SMUSProjectCache.MISS_RELOAD_INTERVAL_IN_SECONDS:
+                return False
+            self.__logger.info(f"Project {project_id} not found in cached SMUS projects. Reloading them.")
+            self.__load()
+            return project_id in SMUSProjectCache.__project_ids
+
+    def refresh(self):
+        with SMUSProjectCache.__lock:
+            loaded_seconds_ago = time.monotonic() - SMUSProjectCache.__loaded_at
+            if (SMUSProjectCache.__project_ids is not None and
+                    loaded_seconds_ago < SMUSProjectCache.REFRESH_DEBOUNCE_INTERVAL_IN_SECONDS):
+                self.__logger.info("SMUS projects were loaded recently. Skipping refresh.")
+                return
+            self.__load()
+
+    @staticmethod
+    def reset():
+        with SMUSProjectCache.__lock:
+            SMUSProjectCache.__project_ids = None
+            SMUSProjectCache.__loaded_at = 0.0
+            SMUSProjectCache.__expires_at = 0.0
+
+    def __load_if_expired(self):
+        if time.monotonic() >= SMUSProjectCache.__expires_at:
+            self.__load()
+
+    def __load(self):
+        self.__logger.info("Loading SMUS projects")
+
+        # Kept as dict keys for fast membership checks in listing order
+        project_ids = dict.fromkeys(project[ID_KEY] for project in self.__smus_adapter.list_all_projects())
+
+        SMUSProjectCache.__project_ids = project_ids
+        SMUSProjectCache.__loaded_at = time.monotonic()
+        SMUSProjectCache.__expires_at = SMUSProjectCache.__loaded_at + SMUS_PROJECTS_TTL_IN_SECONDS
+        self.__logger.info(f"Loaded {len(project_ids)} SMUS projects")
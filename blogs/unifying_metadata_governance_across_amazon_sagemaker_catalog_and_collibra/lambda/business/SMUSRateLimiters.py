@@ -0,0 +1,31 @@
+import threading
+
+from business.AdaptiveRateLimiter import AdaptiveRateLimiter
+from utils.smus_constants import SMUS_OPERATION_MAX_REQUESTS_PER_SECOND, SMUS_DEFAULT_MAX_REQUESTS_PER_SECOND
+
+
+class SMUSRateLimiters:
+    """
+    Process-wide token bucket per DataZone operation, since DataZone throttles each operation against its own limit.
+    Buckets start at the limit of their operation in SMUS_OPERATION_MAX_REQUESTS_PER_SECOND and adapt to the
+    throttling signals reported to them.
+    """
+    __rate_limiters = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get(operation_name: str) -> AdaptiveRateLimiter:
+        """
+        :param operation_name: DataZone API operation name, e.g. `CreateAssetRevision`
+        """
+        with SMUSRateLimiters.__lock:
+            if operation_name not in SMUSRateLimiters.__rate_limiters:
+                max_rate = SMUS_OPERATION_MAX_REQUESTS_PER_SECOND.get(operation_name,
+                                                                      SMUS_DEFAULT_MAX_REQUESTS_PER_SECOND)
+                SMUSRateLimiters.__rate_limiters[operation_name] = AdaptiveRateLimiter(max_rate)
+            return SMUSRateLimiters.__rate_limiters[operation_name]
+
+    @staticmethod
+    def reset():
+        with SMUSRateLimiters.__lock:
+            SMUSRateLimiters.__rate_limiters = {}
@@ -5,6 +5,8 @@ from typing import Tuple
 from adapter.CollibraAdapter import CollibraAdapter
 from adapter.SMUSAdapter import SMUSAdapter
 from business.CollibraSMUSListingMatcher import CollibraSMUSListingMatcher
+from business.CollibraTableNameIndex import CollibraTableNameIndex
+from business.SMUSProjectCache import SMUSProjectCache
 from utils.collibra_constants import DISPLAY_NAME_KEY, ID_KEY, TYPE_KEY, NAME_KEY, \
     AWS_CONSUMER_PROJECT_ID_ATTRIBUTE_NAME, STRING_VALUE_KEY, AWS_PRODUCER_PROJECT_ID_ATTRIBUTE_NAME
 from utils.env_utils import SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN, COLLIBRA_SUBSCRIPTION_REQUEST_REJECTED_STATUS_ID, \
@@ -20,7 +22,8 @@ class SubscriptionSyncBusinessLogic:
         self.__logger = logger
         self.__smus_adapter = SMUSAdapter(self.__logger)
         self.__collibra_adapter = CollibraAdapter(self.__logger)
-        self.__projects_ids = {project['id'] for project in self.__smus_adapter.list_all_projects()}
+        self.__collibra_table_name_index = CollibraTableNameIndex(self.__logger, self.__collibra_adapter)
+        self.__smus_project_cache = SMUSProjectCache(self.__logger, self.__smus_adapter)
 
     def sync_subscription_to_collibra(self, event: dict):
         self.__logger.info(f"Running validations on subscription request")
@@ -41,7 +44,7 @@ class SubscriptionSyncBusinessLogic:
             self.__logger.warn(f"Expected only 1 subscribed principal.")
             return
 
-        if consumer_project_id not in self.__projects_ids:
+        if not self.__smus_project_cache.contains(consumer_project_id):
             self.__logger.warn(
                 f"Subscriber must be in a project of which {SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN} is an owner. Either it is null or different.")
             return
@@ -50,7 +53,7 @@ class SubscriptionSyncBusinessLogic:
             self.__logger.warn(f"No or multiple subscribed listings found. Expected 1")
             return
 
-        if event['subscribedListings'][0]['ownerProjectId'] not in self.__projects_ids:
+        if not self.__smus_project_cache.contains(event['subscribedListings'][0]['ownerProjectId']):
             self.__logger.warn(
                 f"Owner of the subscribed listing must be in a project of which {SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN} is an owner")
             return
@@ -70,7 +73,9 @@ class SubscriptionSyncBusinessLogic:
             self.__logger.info(f"Found asset in SMUS with name {asset_name}")
 
             self.__logger.info(f"Retrieving asset with name {asset_name} from Collibra")
-            collibra_asset = self.__collibra_adapter.get_table_by_name(asset_name)
+            collibra_asset = self.__collibra_table_name_index.get(asset_name)
+            if collibra_asset is None:
+                collibra_asset = self.__find_table_missing_from_index(asset_name)
             collibra_asset_id = collibra_asset.get('id')
 
             self.__logger.info(f"Found asset with name {asset_name} in Collibra with id {collibra_asset_id}")
@@ -83,26 +88,34 @@ class SubscriptionSyncBusinessLogic:
         except Exception as e:
             self.__logger.error("Failed to sync subscription request to Collibra", e)
 
+    def __find_table_missing_from_index(self, asset_name: str) -> dict:
+        """
+        Looks up a table which may have been created in Collibra after the table name index was built, and adds it to
+        the index so that later subscriptions to it are served from there
+        """
+        collibra_asset = self.__collibra_adapter.get_tables_by_names([asset_name]).get(asset_name)
+        if collibra_asset is None:
+            raise Exception(f"No table found with name {asset_name} in Collibra.")
+        self.__collibra_table_name_index.add(collibra_asset)
+        return collibra_asset
+
     def start_subscription_request_sync_to_smus(self):
         self.__sync_approved_requests()
 
     def __sync_approved_requests(self):
-        approved_requests = self.__collibra_adapter.get_subscription_requests_by_status("Approved")
-        self.__logger.info(f"Found {len(approved_requests)} approved requests")
-
-        if not approved_requests:
-            return
-
-        for approved_request in approved_requests:
+        # Approved requests are streamed page by page, so that the whole backlog is drained in a single run
+        num_of_approved_requests = 0
+        for approved_request in self.__collibra_adapter.get_subscription_requests_by_status("Approved"):
+            num_of_approved_requests += 1
             try:
                 producer_project_id, consumer_project_id = self.__get_smus_project_ids(approved_request)
 
-                if consumer_project_id is None or consumer_project_id not in self.__projects_ids:
+                if consumer_project_id is None or not self.__smus_project_cache.contains(consumer_project_id):
                     self.__logger.warn(
                         f"Subscriber must be in a project of which {SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN} is an owner.")
                     continue
 
-                if producer_project_id is None or producer_project_id not in self.__projects_ids:
+                if producer_project_id is None or not self.__smus_project_cache.contains(producer_project_id):
                     self.__logger.warn(
                         f"Listing must be in a project of which {SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN} is an owner.")
                     continue
@@ -157,8 +170,11 @@ class SubscriptionSyncBusinessLogic:
                 self.__collibra_adapter.update_subscription_request_status(approved_request[ID_KEY],
                                                                            COLLIBRA_SUBSCRIPTION_REQUEST_REJECTED_STATUS_ID)
 
+        self.__logger.info(f"Processed {num_of_approved_requests} approved requests")
+
     def __find_smus_table_listing_id(self, collibra_asset, producer_project_id) -> str | None:
-        listings = self.__search_all_listings(collibra_asset[DISPLAY_NAME_KEY], producer_project_id)
+        # Listings are paged lazily, so paging stops at the first match
+        listings = self.__smus_adapter.iter_listings(producer_project_id, collibra_asset[DISPLAY_NAME_KEY])
         matching_listing_id_in_smus = None
         for listing in listings:
             listing = listing[ASSET_LISTING_KEY]
@@ -167,9 +183,6 @@ class SubscriptionSyncBusinessLogic:
                 break
         return matching_listing_id_in_smus
 
-    def __search_all_listings(self, asset_display_name, project_id):
-        return self.__smus_adapter.search_all_listings(project_id, asset_display_name)
-
     def __get_smus_project_ids(self, approved_collibra_subscription_request) -> Tuple[str | None, str | None]:
         if 'stringAttributes' not in approved_collibra_subscription_request or not \
         approved_collibra_subscription_request['stringAttributes']:
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from business.AWSClientFactory import AWSClientFactory
+from model.CollibraAssetType import CollibraAssetType
+from utils.env_utils import SMUS_DOMAIN_ID, SYNC_STATE_PARAMETER_PREFIX
+
+
+class SyncHighWaterMark:
+    """
+    Collibra `modifiedOn` timestamp up to which all assets of a type have been synced, persisted in SSM Parameter Store.
+
+    A run spans several lambda invocations. The start time of the run is recorded when it starts and becomes the new
+    high-water mark only once the run completes without failures, so changes made during or after a failed run are
+    picked up by the next run.
+    """
+    HIGH_WATER_MARK_KEY = "high_water_mark"
+    RUN_STARTED_AT_KEY = "run_started_at"
+    RUN_FAILED_KEY = "run_failed"
+    # Margin for clock skew between Lambda and Collibra
+    CLOCK_SKEW_MARGIN = timedelta(minutes=5)
+
+    def __init__(self, logger, asset_type: CollibraAssetType):
+        self.__logger = logger
+        self.__ssm_client = AWSClientFactory.create('ssm')
+        self.__parameter_name = f"{SYNC_STATE_PARAMETER_PREFIX}/{SMUS_DOMAIN_ID}/{asset_type.value}"
+        self.__state = self.__load()
+
+    @property
+    def modified_after(self) -> str | None:
+        """
+        :return: ISO-8601 timestamp after which assets have to be synced, or None if all assets have to be synced
+        """
+        return self.__state.get(SyncHighWaterMark.HIGH_WATER_MARK_KEY, None)
+
+    def start_run(self):
+        run_started_at = datetime.now(timezone.utc) - SyncHighWaterMark.CLOCK_SKEW_MARGIN
+        self.__state[SyncHighWaterMark.RUN_STARTED_AT_KEY] = run_started_at.isoformat(timespec='seconds')
+        self.__state[SyncHighWaterMark.RUN_FAILED_KEY] = False
+        self.__save()
+
+    def mark_run_failed(self):
+        if not self.__state.get(SyncHighWaterMark.RUN_FAILED_KEY, False):
+            self.__state[SyncHighWaterMark.RUN_FAILED_KEY] = True
+            self.__save()
+
+    def complete_run(self):
+        run_started_at = self.__state.pop(SyncHighWaterMark.RUN_STARTED_AT_KEY, None)
+        run_failed = self.__state.pop(SyncHighWaterMark.RUN_FAILED_KEY, False)
+        if run_started_at is None or run_failed:
+            self.__logger.info(f"Not advancing high-water mark {self.__parameter_name} as the run did not fully succeed")
+        else:
+            self.__state[SyncHighWaterMark.HIGH_WATER_MARK_KEY] = run_started_at
+            self.__logger.info(f"Advanced high-water mark {self.__parameter_name} to {run_started_at}")
+        self.__save()
+
+    def __load(self) -> dict:
+        try:
+            get_parameter_response = self.__ssm_client.get_parameter(Name=self.__parameter_name)
+        except self.__ssm_client.exceptions.ParameterNotFound:
+            self.__logger.info(f"No high-water mark found at {self.__parameter_name}. Syncing all assets.")
+            return {}
+        return json.loads(get_parameter_response['Parameter']['Value'])
+
+    def __save(self):
+        self.__ssm_client.put_parameter(Name=self.__parameter_name, Value=json.dumps(self.__state), Type='String',
+                                        Overwrite=True)
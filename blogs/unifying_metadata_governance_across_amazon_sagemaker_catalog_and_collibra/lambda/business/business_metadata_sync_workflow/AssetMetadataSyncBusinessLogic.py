@@ -1,17 +1,30 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
+from functools import partial
 from time import time
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+from botocore.exceptions import ClientError
 
 from adapter.CollibraAdapter import CollibraAdapter
 from adapter.SMUSAdapter import SMUSAdapter
+from business.BatchLoader import BatchLoader
 from business.CollibraSMUSAssetMatcher import CollibraSMUSAssetMatcher
+from business.PrefetchingPageIterator import PrefetchingPageIterator
+from business.SMUSAssetRevisionWriter import SMUSAssetRevisionWriter
 from business.SMUSGlossaryCache import SMUSGlossaryCache
+from business.SMUSProjectCache import SMUSProjectCache
+from business.SyncHighWaterMark import SyncHighWaterMark
+from model.CollibraAssetType import CollibraAssetType
 from model.CollibraTable import CollibraTable, CollibraColumn
-from utils.collibra_constants import DISPLAY_NAME_KEY, FULL_NAME_KEY, ID_KEY
+from model.SMUSAssetRevisionWriteResult import SMUSAssetRevisionWriteResult
+from utils.collibra_constants import DISPLAY_NAME_KEY, FULL_NAME_KEY, ID_KEY, COLLIBRA_MAX_LOOKUP_BATCH_SIZE
+from utils.env_utils import COLLIBRA_DELTA_SYNC_ENABLED, SMUS_DOMAIN_WIDE_ASSET_SEARCH_ENABLED, \
+    SMUS_ASSET_SEARCH_MAX_CONCURRENCY
 from utils.smus_constants import PII_COLUMNS_README_HEADING, GLOSSARY_TERMS_KEY, ASSET_COMMON_DETAILS_FORM, \
     FORM_NAME_KEY, \
-    CONTENT_KEY, README_KEY, ASSET_ITEM_KEY, IDENTIFIER_KEY
+    CONTENT_KEY, README_KEY, ASSET_ITEM_KEY, IDENTIFIER_KEY, OWNING_PROJECT_ID, DOMAIN_WIDE_SEARCH_UNSUPPORTED_ERROR_CODES
 
 
 class AssetMetadataSyncBusinessLogic:
@@ -20,74 +33,125 @@ class AssetMetadataSyncBusinessLogic:
         self.__smus_adapter = SMUSAdapter(logger)
         self.__collibra_adapter = CollibraAdapter(logger)
         self.__smus_glossary_cache = SMUSGlossaryCache(logger)
-        self.__projects_ids = [project['id'] for project in self.__smus_adapter.list_all_projects()]
+        self.__smus_project_cache = SMUSProjectCache(logger, self.__smus_adapter)
+        self.__high_water_mark = SyncHighWaterMark(logger, CollibraAssetType.TABLE) \
+            if COLLIBRA_DELTA_SYNC_ENABLED else None
+        # SMUS assets fetched while matching, keyed by asset id, so that they are not fetched again for the update
+        self.__matched_smus_assets = {}
+        self.__domain_wide_asset_search_enabled = SMUS_DOMAIN_WIDE_ASSET_SEARCH_ENABLED
+        self.__asset_search_executor = None
 
     def sync(self, last_seen_asset_id: str):
         start_time = datetime.now()
         self.__logger.info(f"{start_time}, {time()}")
 
-        # Keep processing more tables till there are 5 mins left before lambda times out
-        while datetime.now() - start_time <= timedelta(minutes=10):
-            previous_last_seen_asset_id = last_seen_asset_id
-            self.__logger.info(f"Fetching tables from collibra")
-            tables, last_seen_asset_id = self.__get_and_filter_out_system_tables(previous_last_seen_asset_id)
-
-            self.__logger.info(f"Previous last seen asset id: {previous_last_seen_asset_id}, current last seen asset id: {last_seen_asset_id}")
-            if previous_last_seen_asset_id == last_seen_asset_id or last_seen_asset_id is None:
-                break
+        get_tables = self.__collibra_adapter.get_tables
+        if self.__high_water_mark:
+            if last_seen_asset_id is None:
+                self.__high_water_mark.start_run()
+            self.__logger.info(f"Syncing tables modified after {self.__high_water_mark.modified_after}")
+            get_tables = partial(get_tables, modified_after=self.__high_water_mark.modified_after)
+
+        # The per-project asset searches of all tables share one worker pool for the whole sync
+        self.__asset_search_executor = ThreadPoolExecutor(max_workers=SMUS_ASSET_SEARCH_MAX_CONCURRENCY)
+        # The next page of tables is prefetched from Collibra while the current page is synced to SMUS
+        with self.__asset_search_executor, PrefetchingPageIterator(get_tables, last_seen_asset_id) as table_pages:
+            for table_page in table_pages:
+                previous_last_seen_asset_id = last_seen_asset_id
+                last_seen_asset_id = table_page[-1][ID_KEY]
+                tables = self.__filter_out_system_tables(table_page)
+
+                self.__logger.info(f"Previous last seen asset id: {previous_last_seen_asset_id}, current last seen asset id: {last_seen_asset_id}")
+                self.__logger.info(f"Found {len(tables)} tables to sync in SMUS")
+                self.__sync_tables(tables)
+
+                # Keep processing more tables till there are 5 mins left before lambda times out
+                if datetime.now() - start_time > timedelta(minutes=10):
+                    break
+
+        if table_pages.is_exhausted:
+            if self.__high_water_mark:
+                self.__high_water_mark.complete_run()
+            return None
+        return last_seen_asset_id
 
-            self.__logger.info(f"Found {len(tables)} tables to sync in SMUS")
-            for table in tables:
-                try:
-                    self.__logger.info(
-                        f"Finding assets corresponding to Collibra table {table[DISPLAY_NAME_KEY]} in SMUS")
+    def __sync_tables(self, tables):
+        tables_with_smus_assets = self.__find_tables_with_smus_assets(tables)
 
-                    smus_asset_ids = self.__find_smus_table_asset_ids(table)
+        # Table details of all matched tables in the page are fetched from Collibra in batched requests
+        table_details_loader = BatchLoader(self.__collibra_adapter.get_tables_details,
+                                           COLLIBRA_MAX_LOOKUP_BATCH_SIZE)
+        table_details_loader.load_many(table[ID_KEY] for table, _ in tables_with_smus_assets)
 
+        # Revisions of all tables in the page are written concurrently while the following tables are prepared
+        with SMUSAssetRevisionWriter(self.__logger, self.__smus_adapter) as asset_revision_writer:
+            for table, smus_asset_ids in tables_with_smus_assets:
+                try:
                     self.__logger.info(
-                        f"Found {len(smus_asset_ids)} assets for collibra table {table[DISPLAY_NAME_KEY]} in SMUS")
-
-                    # If no matching assets in SMUS, skip the table
-                    if not smus_asset_ids:
-                        self.__logger.info(f"No matching asset found in SMUS with name {table[DISPLAY_NAME_KEY]}. Skipping.")
-                        continue
-
-                    self.__logger.info(f"Fetching table data from Collibra for table {table[DISPLAY_NAME_KEY]}.")
-                    get_table_response = self.__collibra_adapter.get_table(table['id'])
-
-                    self.__logger.info(f"Fetching business terms attached to table {table[DISPLAY_NAME_KEY]} from Collibra.")
-                    get_table_business_terms_response = self.__collibra_adapter.get_table_business_terms(table['id'])
-
-                    self.__logger.info(f"Fetching PII columns of table {table[DISPLAY_NAME_KEY]} from Collibra.")
-                    get_pii_columns_response = self.__collibra_adapter.get_pii_columns(table['id'])
+                        f"Fetching table data, business terms and PII columns from Collibra for table {table[DISPLAY_NAME_KEY]}.")
+                    table_details = table_details_loader.get(table[ID_KEY])
+                    if table_details is None:
+                        raise Exception(f"Failed to fetch details of table with id {table[ID_KEY]} from Collibra.")
 
                     self.__logger.info(f"Creating CollibraTable internal data structure using fetched data")
-                    collibra_table = CollibraTable(get_table_response, get_table_business_terms_response,
-                                                   get_pii_columns_response, smus_asset_ids, self.__smus_glossary_cache)
+                    collibra_table = CollibraTable.from_table_details(table_details, smus_asset_ids,
+                                                                      self.__smus_glossary_cache)
 
                     self.__logger.info(f"Updating asset with name {table[DISPLAY_NAME_KEY]} in SMUS")
 
-                    self.update_asset_metadata(collibra_table)
-                    self.__logger.info(f"Successfully updated asset with name {table[DISPLAY_NAME_KEY]} in SMUS")
+                    self.update_asset_metadata(collibra_table, asset_revision_writer)
                 except Exception as e:
                     self.__logger.error(f"Failed to update asset with name {table[DISPLAY_NAME_KEY]}", e)
+                    self.__mark_run_failed()
                     continue
 
-        return last_seen_asset_id
+            self.__report_asset_revisions(asset_revision_writer.wait())
+
+        # Assets of tables which failed before their update are dropped with the page
+        self.__matched_smus_assets.clear()
+
+    def __report_asset_revisions(self, result: SMUSAssetRevisionWriteResult):
+        failed_asset_names = set()
+        for asset_name, asset_id, error in result.failed:
+            self.__logger.error(f"Failed to update asset with name {asset_name} and id {asset_id}", error)
+            failed_asset_names.add(asset_name)
+            self.__mark_run_failed()
 
-    def __get_and_filter_out_system_tables(self, last_seen_asset_id: str):
-        tables = self.__collibra_adapter.get_tables(last_seen_asset_id)
-        filtered_tables = []
+        for asset_name in dict.fromkeys(asset_name for asset_name, _ in result.completed):
+            if asset_name not in failed_asset_names:
+                self.__logger.info(f"Successfully updated asset with name {asset_name} in SMUS")
+
+    def __find_tables_with_smus_assets(self, tables) -> List[Tuple[dict, List[str]]]:
+        tables_with_smus_assets = []
         for table in tables:
-            if 'information_schema' not in table[FULL_NAME_KEY]:
-                filtered_tables.append(table)
+            try:
+                self.__logger.info(
+                    f"Finding assets corresponding to Collibra table {table[DISPLAY_NAME_KEY]} in SMUS")
+
+                smus_asset_ids = self.__find_smus_table_asset_ids(table)
+
+                self.__logger.info(
+                    f"Found {len(smus_asset_ids)} assets for collibra table {table[DISPLAY_NAME_KEY]} in SMUS")
+
+                # If no matching assets in SMUS, skip the table
+                if not smus_asset_ids:
+                    self.__logger.info(f"No matching asset found in SMUS with name {table[DISPLAY_NAME_KEY]}. Skipping.")
+                    continue
+
+                tables_with_smus_assets.append((table, smus_asset_ids))
+            except Exception as e:
+                self.__logger.error(f"Failed to update asset with name {table[DISPLAY_NAME_KEY]}", e)
+                self.__mark_run_failed()
+        return tables_with_smus_assets
 
-        if tables:
-            last_seen_id = tables[-1][ID_KEY]
-        else:
-            last_seen_id = None
+    def __mark_run_failed(self):
+        # Failed tables have to be retried by the next run, so the high-water mark must not advance past them
+        if self.__high_water_mark:
+            self.__high_water_mark.mark_run_failed()
 
-        return filtered_tables, last_seen_id
+    @staticmethod
+    def __filter_out_system_tables(tables):
+        return [table for table in tables if 'information_schema' not in table[FULL_NAME_KEY]]
 
     def __find_smus_table_asset_ids(self, table) -> List[str]:
         assets = self.__get_all_assets_by_name(table[DISPLAY_NAME_KEY])
@@ -98,12 +162,34 @@ class AssetMetadataSyncBusinessLogic:
                 self.__logger.info(
                     f" SMUS asset {get_asset_response["name"]} matched with Collibra asset {table[DISPLAY_NAME_KEY]}")
                 matching_assets_in_smus.append(get_asset_response[ID_KEY])
+                self.__matched_smus_assets[get_asset_response[ID_KEY]] = get_asset_response
         return matching_assets_in_smus
 
     def __get_all_assets_by_name(self, asset_name):
+        project_ids = self.__smus_project_cache.get_project_ids()
+        if self.__domain_wide_asset_search_enabled:
+            try:
+                return self.__search_assets_by_name_in_domain(asset_name, set(project_ids))
+            except ClientError as e:
+                # Throttles and transient errors fail the table instead of multiplying the searches by the projects
+                if e.response.get('Error', {}).get('Code') not in DOMAIN_WIDE_SEARCH_UNSUPPORTED_ERROR_CODES:
+                    raise
+                self.__logger.warning(
+                    f"Domain-wide asset search is not available. Searching per project for the rest of the sync. "
+                    f"Exception: {e}")
+                self.__domain_wide_asset_search_enabled = False
+        return self.__search_assets_by_name_per_project(asset_name, project_ids)
+
+    def __search_assets_by_name_in_domain(self, asset_name, project_ids: set):
+        # One search covers all projects, so its cost doesn't grow with the number of projects
+        assets = self.__smus_adapter.search_all_assets_by_name_in_domain(asset_name)
+        return [asset for asset in assets if asset[ASSET_ITEM_KEY][OWNING_PROJECT_ID] in project_ids]
+
+    def __search_assets_by_name_per_project(self, asset_name, project_ids: List[str]):
         assets = []
-        for project_id in self.__projects_ids:
-            assets.extend(self.__smus_adapter.search_all_assets_by_name(asset_name, project_id))
+        for project_assets in self.__asset_search_executor.map(
+                partial(self.__smus_adapter.search_all_assets_by_name, asset_name), project_ids):
+            assets.extend(project_assets)
         return assets
 
     @classmethod
@@ -117,9 +203,13 @@ class AssetMetadataSyncBusinessLogic:
 
         return readme
 
-    def update_asset_metadata(self, collibra_table: CollibraTable):
+    def update_asset_metadata(self, collibra_table: CollibraTable,
+                              asset_revision_writer: SMUSAssetRevisionWriter = None):
+        """
+        :param asset_revision_writer: Writer to submit the revisions to. Revisions are written synchronously without it
+        """
         for asset_id in collibra_table.smus_asset_ids:
-            smus_asset = self.__smus_adapter.get_asset(asset_id)
+            smus_asset = self.__matched_smus_assets.pop(asset_id, None) or self.__smus_adapter.get_asset(asset_id)
             glossary_terms = self.__collate_glossary_terms(smus_asset, collibra_table)
             forms_input = self.__get_forms_input(smus_asset)
             self.__update_asset_common_details_form(collibra_table, forms_input)
@@ -132,7 +222,10 @@ class AssetMetadataSyncBusinessLogic:
             if glossary_terms:
                 optional_args["glossaryTerms"] = glossary_terms
             self.__logger.info(f"Updating asset with name: {collibra_table.name} and id: {asset_id}")
-            self.__smus_adapter.create_asset_revision(collibra_table.name, asset_id, forms_input, **optional_args)
+            if asset_revision_writer:
+                asset_revision_writer.submit(collibra_table.name, asset_id, forms_input, **optional_args)
+            else:
+                self.__smus_adapter.create_asset_revision(collibra_table.name, asset_id, forms_input, **optional_args)
 
     @classmethod
     def __collate_glossary_terms(cls, smus_asset, collibra_table: CollibraTable):
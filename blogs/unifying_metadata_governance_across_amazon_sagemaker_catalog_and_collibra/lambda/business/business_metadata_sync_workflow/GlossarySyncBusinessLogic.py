@@ -1,6 +1,13 @@
+from datetime import datetime, timedelta
+from functools import partial
+
 from adapter.CollibraAdapter import CollibraAdapter
 from adapter.SMUSAdapter import SMUSAdapter
+from business.PrefetchingPageIterator import PrefetchingPageIterator
+from business.SyncHighWaterMark import SyncHighWaterMark
+from model.CollibraAssetType import CollibraAssetType
 from utils.common_utils import extract_collibra_descriptions
+from utils.env_utils import COLLIBRA_DELTA_SYNC_ENABLED
 
 
 class GlossarySyncBusinessLogic:
@@ -9,16 +16,41 @@ class GlossarySyncBusinessLogic:
         self.__smus_adapter = SMUSAdapter(logger)
         self.__glossary_id = self.__smus_adapter.create_or_get_glossary()
         self.__collibra_adapter = CollibraAdapter(logger)
+        self.__high_water_mark = SyncHighWaterMark(logger, CollibraAssetType.BUSINESS_TERM) \
+            if COLLIBRA_DELTA_SYNC_ENABLED else None
 
     def sync(self, last_seen_glossary_term_id: str):
-        glossary_terms = self.__collibra_adapter.get_business_term_metadata(last_seen_glossary_term_id)
+        start_time = datetime.now()
+        terms_created = set()
 
-        self.__logger.info(f"Found {len(glossary_terms)} terms in Collibra.")
+        get_business_term_metadata = self.__collibra_adapter.get_business_term_metadata
+        if self.__high_water_mark:
+            if last_seen_glossary_term_id is None:
+                self.__high_water_mark.start_run()
+            self.__logger.info(f"Syncing glossary terms modified after {self.__high_water_mark.modified_after}")
+            get_business_term_metadata = partial(get_business_term_metadata,
+                                                 modified_after=self.__high_water_mark.modified_after)
 
-        terms_created = set()
-        new_last_seen_id = None
+        # The next page of terms is prefetched from Collibra while the current page is synced to SMUS
+        with PrefetchingPageIterator(get_business_term_metadata,
+                                     last_seen_glossary_term_id) as glossary_term_pages:
+            for glossary_terms in glossary_term_pages:
+                self.__logger.info(f"Found {len(glossary_terms)} terms in Collibra.")
+                self.__sync_glossary_terms(glossary_terms, terms_created)
+                last_seen_glossary_term_id = glossary_terms[-1]['id']
+
+                # Keep processing more terms till there are 5 mins left before lambda times out
+                if datetime.now() - start_time > timedelta(minutes=10):
+                    break
+
+        if glossary_term_pages.is_exhausted:
+            if self.__high_water_mark:
+                self.__high_water_mark.complete_run()
+            return None
+        return last_seen_glossary_term_id
+
+    def __sync_glossary_terms(self, glossary_terms, terms_created: set):
         for glossary_term in glossary_terms:
-            new_last_seen_id = glossary_term['id']
             glossary_term_name = glossary_term['displayName']
             glossary_term_descriptions = extract_collibra_descriptions(glossary_term)
 
@@ -39,7 +71,6 @@ class GlossarySyncBusinessLogic:
                 self.__logger.info(f'Creating glossary term \'{glossary_term_name}\' with descriptions \'{glossary_term_descriptions}\'')
                 self.__smus_adapter.create_glossary_term(self.__glossary_id, glossary_term_name, glossary_term_descriptions)
             terms_created.add(glossary_term_name)
-        return new_last_seen_id
 
     def __check_if_glossary_term_description_changed(self, glossary_term, new_description):
         has_description_changed = False
@@ -1,8 +1,9 @@
+from typing import Iterable, Tuple
+
 from adapter.CollibraAdapter import CollibraAdapter
 from adapter.SMUSAdapter import SMUSAdapter
 from business.SMUSGlossaryCache import SMUSGlossaryCache
 from model.BusinessTermHierarchyIndex import BusinessTermHierarchyIndex
-from utils.collibra_constants import DISPLAY_NAME_KEY, INCOMING_RELATIONS_KEY, SOURCE_KEY
 
 class GlossaryTermHierarchyEstablisherBusinessLogic:
     def __init__(self, logger):
@@ -16,12 +17,11 @@ class GlossaryTermHierarchyEstablisherBusinessLogic:
     def establish(self):
         self.__logger.info(f"Fetching business term hierarchy from Collibra")
 
-        get_business_term_hierarchy_response = self.__collibra_adapter.get_business_term_hierarchy()
+        num_of_relations = self.__populate_hierarchy_index(self.__collibra_adapter.get_business_term_hierarchy())
 
         self.__logger.info(
-            f"Fetched business term hierarchy from Collibra. Indexing {len(get_business_term_hierarchy_response)} terms")
+            f"Fetched business term hierarchy from Collibra. Indexed {num_of_relations} term relations")
 
-        self.__populate_hierarchy_index(get_business_term_hierarchy_response)
         terms_names_to_update = self.__business_term_hierarchy_index.get_indexed_term_names()
 
         self.__logger.info(f"Initiating glossary term relation identification {len(terms_names_to_update)} terms")
@@ -41,11 +41,9 @@ class GlossaryTermHierarchyEstablisherBusinessLogic:
 
         self.__logger.info(f"Updated glossary term relations for {num_of_terms_updated} terms")
 
-    def __populate_hierarchy_index(self, get_business_term_hierarchy_response):
-        for business_term_hierarchy in get_business_term_hierarchy_response:
-            child_term_name = business_term_hierarchy[DISPLAY_NAME_KEY]
-            if INCOMING_RELATIONS_KEY in business_term_hierarchy:
-                for incoming_relation in business_term_hierarchy[INCOMING_RELATIONS_KEY]:
-                    if SOURCE_KEY in incoming_relation:
-                        parent_term_name = incoming_relation[SOURCE_KEY][DISPLAY_NAME_KEY]
-                        self.__business_term_hierarchy_index.index(child_term_name, parent_term_name)
+    def __populate_hierarchy_index(self, business_term_hierarchy: Iterable[Tuple[str, str]]) -> int:
+        num_of_relations = 0
+        for child_term_name, parent_term_name in business_term_hierarchy:
+            self.__business_term_hierarchy_index.index(child_term_name, parent_term_name)
+            num_of_relations += 1
+        return num_of_relations
@@ -1,7 +1,14 @@
+import asyncio
+from typing import Dict, List
+
+from adapter.AsyncCollibraAdapter import AsyncCollibraAdapter
 from adapter.CollibraAdapter import CollibraAdapter
 from adapter.SMUSAdapter import SMUSAdapter
+from business.CollibraAwsProjectIndex import CollibraAwsProjectIndex
+from business.CollibraAwsUserDirectory import CollibraAwsUserDirectory
+from business.CollibraTableNameIndex import CollibraTableNameIndex
 from model.ProjectUserListingSyncWorkflowEvent import ProjectUserListingSyncWorkflowEvent
-from utils.collibra_constants import ID_KEY, NAME_KEY
+from utils.collibra_constants import ID_KEY, NAME_KEY, COLLIBRA_MAX_LOOKUP_BATCH_SIZE
 from utils.env_utils import COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID
 from utils.smus_constants import ASSET_LISTING_KEY
 
@@ -13,6 +20,10 @@ class ProjectUserListingSyncBusinessLogic:
         self.__logger = logger
         self.__smus_adapter = SMUSAdapter(self.__logger)
         self.__collibra_adapter = CollibraAdapter(self.__logger)
+        self.__async_collibra_adapter = AsyncCollibraAdapter(self.__collibra_adapter)
+        self.__collibra_table_name_index = CollibraTableNameIndex(self.__logger, self.__collibra_adapter)
+        self.__collibra_aws_user_directory = CollibraAwsUserDirectory(self.__logger, self.__collibra_adapter)
+        self.__collibra_aws_project_index = CollibraAwsProjectIndex(self.__logger, self.__collibra_adapter)
 
     def sync(self, event: ProjectUserListingSyncWorkflowEvent) -> ProjectUserListingSyncWorkflowEvent:
         self.__logger.info(f"Starting ProjectSync with event: {event}")
@@ -37,8 +48,18 @@ class ProjectUserListingSyncBusinessLogic:
         smus_project = self.__smus_adapter.get_project(smus_project_id)
         smus_project_name = smus_project['name']
 
-        collibra_project = self.__collibra_adapter.get_or_create_aws_project(smus_project_name, smus_project_id)
-        self.__collibra_adapter.add_aws_project_attributes(collibra_project[ID_KEY], smus_project_id)
+        # The lookup and the attribute write are skipped when the prefetched index shows Collibra is up to date
+        collibra_project_id = self.__collibra_aws_project_index.get_project_id(smus_project_name)
+        if collibra_project_id is None:
+            collibra_project_id = self.__collibra_adapter.create_aws_project(smus_project_name, smus_project_id)[ID_KEY]
+            self.__collibra_aws_project_index.add_project(smus_project_name, collibra_project_id)
+
+        if self.__collibra_aws_project_index.get_smus_project_ids(collibra_project_id) != [smus_project_id]:
+            self.__collibra_adapter.add_aws_project_attributes(collibra_project_id, smus_project_id)
+            self.__collibra_aws_project_index.set_smus_project_ids(collibra_project_id, [smus_project_id])
+        else:
+            self.__logger.info(f"Project attribute of project {smus_project_name} is up to date in Collibra")
+        collibra_project = {ID_KEY: collibra_project_id}
         self.__logger.info(
             f"Successfully synced project with id {smus_project_id} and name {smus_project_name} to Collibra")
 
@@ -46,32 +67,126 @@ class ProjectUserListingSyncBusinessLogic:
         self.sync_users_and_associate_with_projects(smus_project_id, smus_project_name)
 
     def associate_project_with_listings(self, smus_project_id: str, collibra_project):
-        listings = [listing_result[ASSET_LISTING_KEY] for listing_result in self.__smus_adapter.search_all_listings(smus_project_id)]
-
         project_id = collibra_project[ID_KEY]
-        for listing in listings:
-            listing_name = listing['name']
+        collibra_asset_ids = []
+        missing_listing_names = []
+        # The next page of listings is fetched while the listings of the current page are looked up in Collibra
+        for listing_result in self.__smus_adapter.iter_listings(smus_project_id, prefetch=True):
+            listing_name = listing_result[ASSET_LISTING_KEY]['name']
             try:
-                collibra_asset = self.__collibra_adapter.get_table_by_name(listing_name)
-                collibra_asset_id = collibra_asset[ID_KEY]
-            except:
+                collibra_asset = self.__collibra_table_name_index.get(listing_name)
+            except Exception as e:
+                # The index is unavailable for every listing, so the associations of the project are skipped at once
+                self.__logger.warn(
+                    f"Failed to fetch assets of project {smus_project_id} from Collibra. Skipping. Exception: {e}")
+                return
+
+            if collibra_asset is None:
+                missing_listing_names.append(listing_name)
+                continue
+            collibra_asset_ids.append(collibra_asset[ID_KEY])
+
+        # The lookup batches of a project are sent to Collibra concurrently
+        collibra_asset_ids.extend(asyncio.run(self.__find_tables_missing_from_index(missing_listing_names)))
+
+        collibra_asset_ids = asyncio.run(
+            self.__find_unrelated_assets(project_id, list(dict.fromkeys(collibra_asset_ids))))
+        if not collibra_asset_ids:
+            self.__logger.info(f"Project {project_id} is already associated with all of its assets in Collibra")
+            return
+
+        # Relations of all listings are created with a few bulk requests instead of one request per listing
+        result = self.__collibra_adapter.create_relations(
+            [(project_id, collibra_asset_id, COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID)
+             for collibra_asset_id in collibra_asset_ids])
+        for relation, _ in result.created:
+            self.__logger.info(f"Successfully associated project {project_id} with asset {relation['targetId']}")
+        for relation, error in result.failed:
+            self.__logger.warn(
+                f"Failed to associate project {project_id} with asset {relation['targetId']}. Exception: {error}")
+
+    async def __find_unrelated_assets(self, project_id: str, collibra_asset_ids: List[str]) -> List[str]:
+        """
+        Relations that already exist would be rejected by Collibra, so they are looked up for the assets of the project
+        only, batch by batch, rather than for every relation of the project
+        :return: Ids of the assets the project is not related to yet. Assets whose relations failed to be looked up
+        are left out.
+        """
+        batches = await asyncio.gather(*[self.__find_unrelated_assets_in_batch(project_id, asset_ids) for asset_ids
+                                         in ProjectUserListingSyncBusinessLogic.__split_into_lookup_batches(collibra_asset_ids)])
+        return [asset_id for unrelated_asset_ids in batches for asset_id in unrelated_asset_ids]
+
+    async def __find_unrelated_assets_in_batch(self, project_id: str, asset_ids: List[str]) -> List[str]:
+        try:
+            related_asset_ids = await self.__async_collibra_adapter.get_related_asset_ids(
+                project_id, asset_ids, COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID)
+        except Exception as e:
+            self.__logger.warn(
+                f"Failed to fetch relations of project {project_id} to assets {asset_ids} from Collibra. Skipping. Exception: {e}")
+            return []
+        return [asset_id for asset_id in asset_ids if asset_id not in related_asset_ids]
+
+    async def __find_tables_missing_from_index(self, listing_names: List[str]) -> List[str]:
+        """
+        Looks up the tables which may have been created in Collibra after the table name index was built
+        :return: Ids of the tables found
+        """
+        batches = await asyncio.gather(*[self.__find_tables_missing_from_index_in_batch(names) for names
+                                         in ProjectUserListingSyncBusinessLogic.__split_into_lookup_batches(listing_names)])
+        return [collibra_asset_id for collibra_asset_ids in batches for collibra_asset_id in collibra_asset_ids]
+
+    async def __find_tables_missing_from_index_in_batch(self, names: List[str]) -> List[str]:
+        try:
+            tables_by_name = await self.__async_collibra_adapter.get_tables_by_names(names)
+        except Exception as e:
+            self.__logger.warn(f"Failed to fetch assets with names {names} from Collibra. Skipping. Exception: {e}")
+            return []
+
+        collibra_asset_ids = []
+        for listing_name in names:
+            collibra_asset = tables_by_name.get(listing_name)
+            if collibra_asset is None:
                 self.__logger.warn(f"Asset with name {listing_name} doesn't exist in Collibra. Skipping.")
                 continue
+            self.__collibra_table_name_index.add(collibra_asset)
+            collibra_asset_ids.append(collibra_asset[ID_KEY])
+        return collibra_asset_ids
 
-            try:
-                self.__collibra_adapter.create_relation(source_id=project_id, target_id=collibra_asset_id,
-                                                        relation_id=COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID)
-
-                self.__logger.info(f"Successfully associated project {project_id} with asset {collibra_asset_id}")
-            except Exception as e:
-                self.__logger.warn(
-                    f"Failed to associate project {project_id} with asset {collibra_asset_id}. Exception: {e}")
+    @staticmethod
+    def __split_into_lookup_batches(items: List[str]) -> List[List[str]]:
+        return [items[start:start + COLLIBRA_MAX_LOOKUP_BATCH_SIZE]
+                for start in range(0, len(items), COLLIBRA_MAX_LOOKUP_BATCH_SIZE)]
 
     def sync_users_and_associate_with_projects(self, smus_project_id, smus_project_name):
         users = self.__smus_adapter.list_all_users_in_project(smus_project_id)
 
         self.__logger.info(f"Found {len(users)} users in project {smus_project_name}")
 
+        # Users and project attributes to write are computed as a diff against the prefetched user directory
+        collibra_user_ids = self.__get_or_create_collibra_users(self.__get_sso_usernames(users, smus_project_name))
+
+        user_attributes = []
+        for username, user_id in collibra_user_ids.items():
+            should_add_project_attribute = smus_project_name not in self.__collibra_aws_user_directory.get_projects(user_id)
+
+            self.__logger.info(
+                f"Should add project attribute is {should_add_project_attribute} for user {username}")
+
+            if should_add_project_attribute:
+                user_attributes.append((user_id, smus_project_name))
+
+        if not user_attributes:
+            return
+
+        result = self.__collibra_adapter.add_aws_users_attributes(user_attributes)
+        for attribute, _ in result.created:
+            self.__collibra_aws_user_directory.add_project(attribute['assetId'], smus_project_name)
+            self.__logger.info(f"Successfully added project attribute for user {attribute['assetId']}")
+        for attribute, error in result.failed:
+            self.__logger.warn(f"Failed to add project attribute for user {attribute['assetId']}. Exception: {error}")
+
+    def __get_sso_usernames(self, users, smus_project_name) -> List[str]:
+        usernames = []
         for user in users:
             try:
                 user_profile = self.__smus_adapter.get_user_profile(user["memberDetails"]["user"]["userId"])
@@ -81,23 +196,33 @@ class ProjectUserListingSyncBusinessLogic:
 
                 username = user_profile['details']['sso']['username']
                 self.__logger.info(f"User {username} associated with project {smus_project_name}")
-
-                user = self.__collibra_adapter.get_or_create_aws_user(username)
-                self.__logger.info(f"User {username} associated with collibra user {user[ID_KEY]}")
-
-                should_add_project_attribute = True
-                if 'stringAttributes' in user:
-                    for attribute in user['stringAttributes']:
-                        if attribute['stringValue'] == smus_project_name:
-                            should_add_project_attribute = False
-                            break
-
-                self.__logger.info(
-                    f"Should add project attribute is {should_add_project_attribute} for user {username}")
-
-                if should_add_project_attribute:
-                    self.__collibra_adapter.add_aws_user_attributes(user[ID_KEY], smus_project_name)
-                    self.__logger.info(f"Successfully added project attribute for user {username}")
-
+                usernames.append(username)
             except Exception as e:
                 self.__logger.warn(f"Failed to add project attribute for user {user}. Exception: {e}")
+        return usernames
+
+    def __get_or_create_collibra_users(self, usernames: List[str]) -> Dict[str, str]:
+        """
+        :return: Collibra user id of each username, keyed by username. Usernames which failed to be created are absent.
+        """
+        collibra_user_ids = {}
+        missing_usernames = []
+        for username in dict.fromkeys(usernames):
+            user_id = self.__collibra_aws_user_directory.get_user_id(username)
+            if user_id is None:
+                self.__logger.info(f"User with username {username} does not exist. Creating new user.")
+                missing_usernames.append(username)
+            else:
+                collibra_user_ids[username] = user_id
+
+        if missing_usernames:
+            result = self.__collibra_adapter.create_aws_users(missing_usernames)
+            for user, user_created in result.created:
+                self.__collibra_aws_user_directory.add_user(user['name'], user_created[ID_KEY])
+                collibra_user_ids[user['name']] = user_created[ID_KEY]
+            for user, error in result.failed:
+                self.__logger.warn(f"Failed to create user {user['name']} in Collibra. Exception: {error}")
+
+        for username, user_id in collibra_user_ids.items():
+            self.__logger.info(f"User {username} associated with collibra user {user_id}")
+        return collibra_user_ids
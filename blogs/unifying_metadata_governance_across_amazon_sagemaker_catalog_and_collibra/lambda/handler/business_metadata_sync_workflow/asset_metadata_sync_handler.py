@@ -1,5 +1,6 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.business_metadata_sync_workflow.AssetMetadataSyncBusinessLogic import AssetMetadataSyncBusinessLogic
 
 logger = Logger(service="asset_metadata_sync")
@@ -21,7 +22,10 @@ def handle_request(event, context):
     :return: {"last_seen_asset_id": <id of the last seen asset (table) in collibra>}
     """
     logger.info(f"Initiating asset metadata sync with event: {event}")
-    asset_metadata_sync_business_logic = AssetMetadataSyncBusinessLogic(logger)
-    last_seen_id = asset_metadata_sync_business_logic.sync(event.get("last_seen_asset_id", None))
+    try:
+        asset_metadata_sync_business_logic = AssetMetadataSyncBusinessLogic(logger)
+        last_seen_id = asset_metadata_sync_business_logic.sync(event.get("last_seen_asset_id", None))
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
     event["last_seen_asset_id"] = last_seen_id
     return event
@@ -1,5 +1,6 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.business_metadata_sync_workflow.GlossarySyncBusinessLogic import GlossarySyncBusinessLogic
 
 logger = Logger(service="collibra_smus_sync_handler")
@@ -17,6 +18,9 @@ def handle_request(event, context):
     :return: {"last_seen_glossary_term_id": <id of the last seen glossary term in collibra>}
     """
     logger.info(f"Initiating glossary sync with event {event}")
-    last_seen_id = GlossarySyncBusinessLogic(logger).sync(event.get("last_seen_glossary_term_id", None))
+    try:
+        last_seen_id = GlossarySyncBusinessLogic(logger).sync(event.get("last_seen_glossary_term_id", None))
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
     event["last_seen_glossary_term_id"] = last_seen_id
     return event
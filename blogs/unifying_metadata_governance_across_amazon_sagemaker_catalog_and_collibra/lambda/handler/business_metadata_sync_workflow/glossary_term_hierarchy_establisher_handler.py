@@ -1,5 +1,6 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.business_metadata_sync_workflow.GlossaryTermHierarchyEstablisherBusinessLogic import GlossaryTermHierarchyEstablisherBusinessLogic
 
 logger = Logger(service="glossary_term_hierarchy_establisher")
@@ -11,5 +12,8 @@ def handle_request(event, context):
     This lambda is triggered by the business metadata sync step function workflow
     """
     logger.info(f"Initiating glossary term hierarchy establisher with event: {event}")
-    GlossaryTermHierarchyEstablisherBusinessLogic(logger).establish()
+    try:
+        GlossaryTermHierarchyEstablisherBusinessLogic(logger).establish()
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
     return event
\ No newline at end of file
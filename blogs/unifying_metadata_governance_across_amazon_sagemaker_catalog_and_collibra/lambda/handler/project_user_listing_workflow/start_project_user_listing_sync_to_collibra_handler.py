@@ -1,5 +1,6 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.project_user_listing_workflow.ProjectUserListingSyncBusinessLogic import \
     ProjectUserListingSyncBusinessLogic
 from model.ProjectUserListingSyncWorkflowEvent import ProjectUserListingSyncWorkflowEvent
@@ -22,5 +23,8 @@ def handle_request(event, context):
     """
     logger.info(f"Initiating project sync to Collibra with event {event}")
     project_user_listing_sync_workflow_event = ProjectUserListingSyncWorkflowEvent(event)
-    output = ProjectUserListingSyncBusinessLogic(logger).sync(project_user_listing_sync_workflow_event)
+    try:
+        output = ProjectUserListingSyncBusinessLogic(logger).sync(project_user_listing_sync_workflow_event)
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
     return output.__dict__()
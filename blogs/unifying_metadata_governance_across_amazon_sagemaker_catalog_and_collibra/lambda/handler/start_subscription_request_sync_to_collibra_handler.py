@@ -1,16 +1,32 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
+from adapter.SMUSAdapter import SMUSAdapter
+from business.SMUSProjectCache import SMUSProjectCache
 from business.SubscriptionSyncBusinessLogic import SubscriptionSyncBusinessLogic
 
 logger = Logger(service="start_subscription_sync_to_collibra")
 
+PROJECT_EVENT_DETAIL_TYPE_PREFIX = "Project"
+
 def handle_request(event, context):
     """
     This lambda handler syncs the pending subscription request from SMUS to Collibra.
 
     This lambda is triggered through "Subscription Request Created" event received in the
-    "default" event bus in the customer's account
+    "default" event bus in the customer's account. DataZone project events routed to it refresh the cached
+    SMUS projects instead. Only the container handling the event is refreshed, other warm containers pick up the
+    change once their cached projects expire after SMUS_PROJECTS_TTL_IN_SECONDS.
     """
-    logger.info(f"Initiating subscription sync to Collibra with event: {event}")
-    SubscriptionSyncBusinessLogic(logger).sync_subscription_to_collibra(event["detail"]["data"])
-    return event
\ No newline at end of file
+    try:
+        if event.get("detail-type", "").startswith(PROJECT_EVENT_DETAIL_TYPE_PREFIX):
+            logger.info(f"Refreshing SMUS projects on {event['detail-type']} event")
+            # Only the project set is reloaded, so the Collibra credentials and adapter are not needed
+            SMUSProjectCache(logger, SMUSAdapter(logger)).refresh()
+            return event
+
+        logger.info(f"Initiating subscription sync to Collibra with event: {event}")
+        SubscriptionSyncBusinessLogic(logger).sync_subscription_to_collibra(event["detail"]["data"])
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
+    return event
@@ -1,5 +1,6 @@
 from aws_lambda_powertools import Logger
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from business.SubscriptionSyncBusinessLogic import SubscriptionSyncBusinessLogic
 
 logger = Logger(service="start_subscription_request_sync_to_smus")
@@ -11,5 +12,8 @@ def handle_request(event, context):
     This lambda is triggered through an Event Bridge schedule
     """
     logger.info(f"Initiating subscription request sync to SMUS")
-    SubscriptionSyncBusinessLogic(logger).start_subscription_request_sync_to_smus()
+    try:
+        SubscriptionSyncBusinessLogic(logger).start_subscription_request_sync_to_smus()
+    finally:
+        InstrumentedDataZoneClient.flush_metrics(logger)
     return event
\ No newline at end of file
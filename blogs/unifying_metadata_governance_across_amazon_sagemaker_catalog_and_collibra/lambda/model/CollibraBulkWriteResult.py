@@ -0,0 +1,26 @@
+from typing import List, Tuple
+
+
+class CollibraBulkWriteResult:
+    """
+    Per-item outcome of a bulk write to Collibra. Every requested item ends up either in `created`, paired with
+    the resource Collibra returned for it, or in `failed`, paired with the error message.
+    """
+
+    def __init__(self):
+        self._created = []
+        self._failed = []
+
+    def add_created(self, item: dict, resource: dict):
+        self._created.append((item, resource))
+
+    def add_failed(self, item: dict, error: str):
+        self._failed.append((item, error))
+
+    @property
+    def created(self) -> List[Tuple[dict, dict]]:
+        return self._created
+
+    @property
+    def failed(self) -> List[Tuple[dict, str]]:
+        return self._failed
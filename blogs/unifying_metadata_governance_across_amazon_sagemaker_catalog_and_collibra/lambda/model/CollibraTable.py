@@ -1,6 +1,7 @@
 from typing import List
 
 from business.SMUSGlossaryCache import SMUSGlossaryCache
+from model.CollibraTableDetails import CollibraTableDetails
 from utils.collibra_constants import INCOMING_RELATIONS_KEY, SOURCE_KEY, DISPLAY_NAME_KEY, NAME_KEY
 from utils.common_utils import extract_collibra_descriptions
 
@@ -42,6 +43,11 @@ class CollibraTable:
         self.business_terms = self.__create_business_terms(get_table_business_terms_response, smus_glossary_cache)
         self.pii_columns = self.__extract_pii_columns(get_pii_columns_response)
 
+    @classmethod
+    def from_table_details(cls, table_details: CollibraTableDetails, smus_asset_ids: List[str], smus_glossary_cache: SMUSGlossaryCache):
+        return cls(table_details.table, table_details.business_terms, table_details.pii_columns, smus_asset_ids,
+                   smus_glossary_cache)
+
     def get_business_term_ids(self):
         return [term.smus_term_id for term in self.business_terms]
 
@@ -0,0 +1,22 @@
+class CollibraTableDetails:
+    def __init__(self, data: dict[str, list]):
+        """
+        :param data: Response data of GET_AWS_TABLES_DETAILS_QUERY for one table, keyed by the aliases of the query:
+
+        {"table": [...], "businessTerms": [...], "piiColumns": [...]}
+        """
+        self._table = data['table'][0]
+        self._business_terms = data['businessTerms'][0]
+        self._pii_columns = data['piiColumns'][0]
+
+    @property
+    def table(self) -> dict:
+        return self._table
+
+    @property
+    def business_terms(self) -> dict:
+        return self._business_terms
+
+    @property
+    def pii_columns(self) -> dict:
+        return self._pii_columns
@@ -0,0 +1,55 @@
+class DataZoneOperationMetrics:
+    """
+    Calls made to one DataZone operation: how many went out, how long they took, how many failed, how many were
+    throttled and how many retries botocore made underneath them.
+    """
+
+    def __init__(self, operation_name: str):
+        self._operation_name = operation_name
+        self._calls = 0
+        self._errors = 0
+        self._throttles = 0
+        self._retries = 0
+        self._total_latency_in_seconds = 0.0
+        self._max_latency_in_seconds = 0.0
+
+    def record(self, latency_in_seconds: float, retries: int, error: bool = False, throttled: bool = False):
+        self._calls += 1
+        self._retries += retries
+        self._errors += int(error)
+        self._throttles += int(throttled)
+        self._total_latency_in_seconds += latency_in_seconds
+        self._max_latency_in_seconds = max(self._max_latency_in_seconds, latency_in_seconds)
+
+    @property
+    def operation_name(self) -> str:
+        return self._operation_name
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def errors(self) -> int:
+        return self._errors
+
+    @property
+    def throttles(self) -> int:
+        return self._throttles
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    @property
+    def average_latency_in_seconds(self) -> float:
+        return self._total_latency_in_seconds / self._calls if self._calls else 0.0
+
+    @property
+    def max_latency_in_seconds(self) -> float:
+        return self._max_latency_in_seconds
+
+    def __str__(self):
+        return (f"{self._operation_name}: calls={self._calls}, errors={self._errors}, throttles={self._throttles}, "
+                f"retries={self._retries}, avg_latency={self.average_latency_in_seconds:.3f}s, "
+                f"max_latency={self._max_latency_in_seconds:.3f}s")
@@ -0,0 +1,26 @@
+from typing import List, Tuple
+
+
+class SMUSAssetRevisionWriteResult:
+    """
+    Per-revision outcome of the asset revisions written to SMUS. Every submitted revision ends up either in
+    `completed` as (asset name, asset id) or in `failed` as (asset name, asset id, error).
+    """
+
+    def __init__(self):
+        self._completed = []
+        self._failed = []
+
+    def add_completed(self, asset_name: str, asset_id: str):
+        self._completed.append((asset_name, asset_id))
+
+    def add_failed(self, asset_name: str, asset_id: str, error: Exception):
+        self._failed.append((asset_name, asset_id, error))
+
+    @property
+    def completed(self) -> List[Tuple[str, str]]:
+        return self._completed
+
+    @property
+    def failed(self) -> List[Tuple[str, str, Exception]]:
+        return self._failed
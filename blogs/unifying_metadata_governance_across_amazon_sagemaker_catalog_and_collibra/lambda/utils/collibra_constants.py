@@ -1,5 +1,7 @@
 INCOMING_RELATIONS_KEY = "incomingRelations"
+OUTGOING_RELATIONS_KEY = "outgoingRelations"
 SOURCE_KEY = "source"
+TARGET_KEY = "target"
 DISPLAY_NAME_KEY = "displayName"
 FULL_NAME_KEY = "fullName"
 ID_KEY = "id"
@@ -44,3 +46,12 @@ AWS_PRODUCER_PROJECT_ID_ATTRIBUTE_NAME = "AWS Producer Project Id"
 AWS_CONSUMER_PROJECT_ID_ATTRIBUTE_NAME = "AWS Consumer Project Id"
 COLLIBRA_PRODUCER_PROJECT_ID_ATTRIBUTE_NAME = "Collibra Producer Project Id"
 COLLIBRA_CONSUMER_PROJECT_ID_ATTRIBUTE_NAME = "Collibra Consumer Project Id"
+
+# Upper bound of ids or names per batched lookup query, which is also the page size of the query
+COLLIBRA_MAX_LOOKUP_BATCH_SIZE = 100
+
+# Upper bound of columns and of business terms fetched per table
+COLLIBRA_MAX_RELATIONS_PER_TABLE = 1000
+
+# Upper bound of items per bulk REST write, so that a single failing request doesn't roll back too much work
+COLLIBRA_MAX_BULK_WRITE_BATCH_SIZE = 500
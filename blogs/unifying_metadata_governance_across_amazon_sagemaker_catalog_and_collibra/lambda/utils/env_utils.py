@@ -26,3 +26,26 @@ COLLIBRA_AWS_USER_DOMAIN_ID = EnvUtils.get_env_var("COLLIBRA_AWS_USER_DOMAIN_ID"
 COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID = EnvUtils.get_env_var("COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID", required=True)
 COLLIBRA_SUBSCRIPTION_REQUEST_REJECTED_STATUS_ID = EnvUtils.get_env_var("COLLIBRA_SUBSCRIPTION_REQUEST_REJECTED_STATUS_ID", required=True)
 COLLIBRA_SUBSCRIPTION_REQUEST_GRANTED_STATUS_ID = EnvUtils.get_env_var("COLLIBRA_SUBSCRIPTION_REQUEST_GRANTED_STATUS_ID", required=True)
+
+COLLIBRA_HTTP_POOL_SIZE = int(EnvUtils.get_env_var("COLLIBRA_HTTP_POOL_SIZE", default="10", required=False))
+COLLIBRA_MAX_CONCURRENCY = int(EnvUtils.get_env_var("COLLIBRA_MAX_CONCURRENCY", default="10", required=False))
+COLLIBRA_MAX_REQUESTS_PER_SECOND = float(EnvUtils.get_env_var("COLLIBRA_MAX_REQUESTS_PER_SECOND", default="20", required=False))
+COLLIBRA_BUSINESS_TERMS_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_BUSINESS_TERMS_PAGE_SIZE", default="50", required=False))
+COLLIBRA_TABLES_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_TABLES_PAGE_SIZE", default="10", required=False))
+COLLIBRA_BUSINESS_TERM_HIERARCHY_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_BUSINESS_TERM_HIERARCHY_PAGE_SIZE", default="500", required=False))
+COLLIBRA_SUBSCRIPTION_REQUESTS_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_SUBSCRIPTION_REQUESTS_PAGE_SIZE", default="100", required=False))
+COLLIBRA_DELTA_SYNC_ENABLED = EnvUtils.get_env_var("COLLIBRA_DELTA_SYNC_ENABLED", default="false", required=False).lower() == "true"
+SYNC_STATE_PARAMETER_PREFIX = EnvUtils.get_env_var("SYNC_STATE_PARAMETER_PREFIX", default="/smus-collibra-integration/sync-state", required=False)
+COLLIBRA_CREDENTIALS_TTL_IN_SECONDS = int(EnvUtils.get_env_var("COLLIBRA_CREDENTIALS_TTL_IN_SECONDS", default="3600", required=False))
+COLLIBRA_TABLE_NAME_INDEX_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_TABLE_NAME_INDEX_PAGE_SIZE", default="1000", required=False))
+COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS = int(EnvUtils.get_env_var("COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS", default="900", required=False))
+COLLIBRA_AWS_USERS_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_AWS_USERS_PAGE_SIZE", default="500", required=False))
+COLLIBRA_AWS_PROJECTS_PAGE_SIZE = int(EnvUtils.get_env_var("COLLIBRA_AWS_PROJECTS_PAGE_SIZE", default="500", required=False))
+AWS_CLIENT_MAX_POOL_CONNECTIONS = int(EnvUtils.get_env_var("AWS_CLIENT_MAX_POOL_CONNECTIONS", default="25", required=False))
+AWS_CLIENT_MAX_ATTEMPTS = int(EnvUtils.get_env_var("AWS_CLIENT_MAX_ATTEMPTS", default="10", required=False))
+AWS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS = int(EnvUtils.get_env_var("AWS_CLIENT_CONNECT_TIMEOUT_IN_SECONDS", default="5", required=False))
+AWS_CLIENT_READ_TIMEOUT_IN_SECONDS = int(EnvUtils.get_env_var("AWS_CLIENT_READ_TIMEOUT_IN_SECONDS", default="30", required=False))
+SMUS_PROJECTS_TTL_IN_SECONDS = int(EnvUtils.get_env_var("SMUS_PROJECTS_TTL_IN_SECONDS", default="300", required=False))
+SMUS_DOMAIN_WIDE_ASSET_SEARCH_ENABLED = EnvUtils.get_env_var("SMUS_DOMAIN_WIDE_ASSET_SEARCH_ENABLED", default="true", required=False).lower() == "true"
+SMUS_ASSET_SEARCH_MAX_CONCURRENCY = int(EnvUtils.get_env_var("SMUS_ASSET_SEARCH_MAX_CONCURRENCY", default="10", required=False))
+SMUS_ASSET_REVISION_WRITER_MAX_CONCURRENCY = int(EnvUtils.get_env_var("SMUS_ASSET_REVISION_WRITER_MAX_CONCURRENCY", default="5", required=False))
@@ -1,85 +1,75 @@
-GET_BUSINESS_TERMS_QUERY = """
-query Assets {
-    assets(
-        limit: 50
-        order: { id: asc }
-        where: {
-            type: { publicId: { eq: "BusinessTerm" } }
-        }
-    ) {
-        id
-        fullName
-        displayName
-        stringAttributes {
-            stringValue
-        }
-    }
-}
-"""
+from utils.collibra_constants import COLLIBRA_MAX_LOOKUP_BATCH_SIZE, COLLIBRA_MAX_RELATIONS_PER_TABLE
 
-GET_BUSINESS_TERMS_WITH_CURSOR_QUERY = """
-query Assets($lastSeenId: UUID!) {
-    assets(
-        limit: 50
-        order: { id: asc }
-        where: {
-            type: { publicId: { eq: "BusinessTerm" } }
-            id: {gt: $lastSeenId}
-        }
-    ) {
-        id
-        fullName
-        displayName
-        stringAttributes {
-            stringValue
-        }
+# Projections and filters of the paged asset queries, which are compiled by utils.query_builder.build_assets_query
+BUSINESS_TERM_FIELDS = (
+    "id",
+    "fullName",
+    "displayName",
+    """stringAttributes {
+    stringValue
+}""",
+)
+
+BUSINESS_TERM_FILTERS = (
+    'type: { publicId: { eq: "BusinessTerm" } }',
+)
+
+AWS_TABLE_FIELDS = (
+    "id",
+    "fullName",
+    "displayName",
+    """stringAttributes(where: { type: { name: { eq: "AWS Resource Metadata" } } }) {
+    stringValue
+    type {
+        name
     }
-}
-"""
+}""",
+)
 
-GET_AWS_TABLE_ASSETS_QUERY = """
-query Assets {
-    assets(
-        limit: 10
-        order: { id: asc }
-        where: {
-            type: { publicId: { eq: "Table" } }
-            fullName: { startsWith: "AWS", notContains: ">pg_" }
-            stringAttributes: {
-                any: { type: { name: { eq: "AWS Resource Metadata" } } }
-            }
-        }
-    ) {
-        id
-        fullName
+AWS_TABLE_FILTERS = (
+    'type: { publicId: { eq: "Table" } }',
+    'fullName: { startsWith: "AWS", notContains: ">pg_" }',
+    """stringAttributes: {
+    any: { type: { name: { eq: "AWS Resource Metadata" } } }
+}""",
+)
+
+TABLE_NAME_FIELDS = (
+    "id",
+    "displayName",
+)
+
+TABLE_NAME_FILTERS = (
+    'type: { publicId: { eq: "Table" } }',
+    'fullName: { startsWith: "AWS" }',
+)
+
+BUSINESS_TERM_HIERARCHY_FIELDS = (
+    "id",
+    "displayName",
+    """incomingRelations(
+    limit: 100
+    where: { source: { type: { publicId: { eq: "BusinessTerm" } } } }
+) {
+    source {
         displayName
-        stringAttributes(where: { type: { name: { eq: "AWS Resource Metadata" } } }) {
-            stringValue
-            type {
-                name
-            }
-        }
     }
-}
-"""
+}""",
+)
 
-GET_AWS_TABLE_ASSETS_WITH_CURSOR_QUERY = """
-query Assets($lastSeenId: UUID!) {
-    assets(
-        limit: 10
-        order: { id: asc }
-        where: {
-            type: { publicId: { eq: "Table" } }
-            id: {gt: $lastSeenId}
-            fullName: {
-                startsWith: "AWS"
-                notContains: ">pg_"
-            }
-            stringAttributes: {
-                any: { type: { name: { eq: "AWS Resource Metadata" } } }
-            }
-        }
-    ) {
+BUSINESS_TERM_HIERARCHY_FILTERS = (
+    'type: { publicId: { eq: "BusinessTerm" } }',
+    'incomingRelations: { empty: false }',
+)
+
+SUBSCRIPTION_REQUEST_FIELDS = (
+    "id",
+    "displayName",
+    """outgoingRelations(
+    limit: 1
+    where: { target: { fullName: { startsWith: "AWS" } } }
+) {
+    target {
         id
         fullName
         displayName
@@ -90,16 +80,52 @@ query Assets($lastSeenId: UUID!) {
             }
         }
     }
-}
-"""
+}""",
+    """stringAttributes(where: { type: { name: { in: ["AWS Producer Project Id", "AWS Consumer Project Id"] } } }) {
+    stringValue
+    type {
+        name
+    }
+}""",
+)
 
-GET_AWS_TABLE_ASSET_QUERY = """
-query Assets($assetId: UUID!) {
-    assets(
-        limit: 1
+SUBSCRIPTION_REQUEST_FILTERS = (
+    'displayName: { contains: "Subscription Request" }',
+    'status: { name: { eq: $status } }',
+    'outgoingRelations: { empty: false }',
+)
+
+SUBSCRIPTION_REQUEST_VARIABLES = ("$status: String!",)
+
+# Assets of the `$type` type with their string attributes of the `$stringAttributeType` type
+ASSET_WITH_STRING_ATTRIBUTES_FIELDS = (
+    "id",
+    "displayName",
+    """stringAttributes(where: { type: { id: { eq: $stringAttributeType } } }) {
+    id
+    stringValue
+}""",
+)
+
+ASSET_WITH_STRING_ATTRIBUTES_FILTERS = (
+    "type: { id: { eq: $type } }",
+)
+
+ASSET_WITH_STRING_ATTRIBUTES_VARIABLES = ("$type: UUID!", "$stringAttributeType: UUID!")
+
+# Restricts the paged asset queries to assets changed since the last successful sync
+MODIFIED_AFTER_FILTER = "modifiedOn: { gt: $modifiedAfter }"
+MODIFIED_AFTER_VARIABLE = "$modifiedAfter: DateTime!"
+
+# The tables of a whole lookup batch are fetched at once, each with up to COLLIBRA_MAX_RELATIONS_PER_TABLE columns and
+# business terms
+GET_AWS_TABLES_DETAILS_QUERY = """
+query Assets($assetIds: [UUID!]!) {
+    table: assets(
+        limit: %(batch_size)d
         where: {
             type: { publicId: { eq: "Table" } }
-            id: { eq: $assetId }
+            id: { in: $assetIds }
         }
     ) {
         id
@@ -109,7 +135,7 @@ query Assets($assetId: UUID!) {
             id
             stringValue
         }
-        incomingRelations(limit: 1000, where: { source: {type: { publicId: { eq: "Column" } }} }) {
+        incomingRelations(limit: %(relations_per_table)d, where: { source: {type: { publicId: { eq: "Column" } }} }) {
             source {
                 id
                 fullName
@@ -128,22 +154,17 @@ query Assets($assetId: UUID!) {
             }
         }
     }
-}
-"""
-
-GET_AWS_TABLE_BUSINESS_TERMS_QUERY = """
-query Assets($assetId: UUID!) {
-    assets(
-        limit: 1
+    businessTerms: assets(
+        limit: %(batch_size)d
         where: {
             type: { publicId: { eq: "Table" } }
-            id: { eq: $assetId }
+            id: { in: $assetIds }
         }
     ) {
         id
         fullName
         displayName
-        incomingRelations(limit: 1000, where: { source: {type: { publicId: { eq: "BusinessTerm" } }} }) {
+        incomingRelations(limit: %(relations_per_table)d, where: { source: {type: { publicId: { eq: "BusinessTerm" } }} }) {
             source {
                 id
                 fullName
@@ -151,17 +172,13 @@ query Assets($assetId: UUID!) {
             }
         }
     }
-}
-"""
-
-GET_PII_COLUMNS_QUERY = """
-query Assets($assetId: UUID!) {
-    assets(
-        limit: 1
-        where: { type: { publicId: { eq: "Table" } }, id: { eq: $assetId } }
+    piiColumns: assets(
+        limit: %(batch_size)d
+        where: { type: { publicId: { eq: "Table" } }, id: { in: $assetIds } }
     ) {
+        id
         incomingRelations(
-            limit: 1000
+            limit: %(relations_per_table)d
             where: { source: { type: { publicId: { eq: "Column" } } } }
         ) {
             source {
@@ -187,85 +204,27 @@ query Assets($assetId: UUID!) {
         }
     }
 }
-"""
+""" % {"batch_size": COLLIBRA_MAX_LOOKUP_BATCH_SIZE, "relations_per_table": COLLIBRA_MAX_RELATIONS_PER_TABLE}
 
-GET_BUSINESS_TERM_HIERARCHY_QUERY = """
-query Assets {
-    assets(
-        limit: 600
-        where: {
-            type: { publicId: { eq: "BusinessTerm" } }
-            incomingRelations: { empty: false }
-        }
-    ) {
-        displayName
-        incomingRelations(
-            limit: 40
-            where: { source: { type: { publicId: { eq: "BusinessTerm" } } } }
-        ) {
-            source {
-                displayName
-            }
-        }
-    }
-}
-"""
-
-GET_TABLE_BY_NAME_QUERY = """
-query Assets($tableName: String!) {
-    assets(
-        limit: 1
-        where: {
-            type: { publicId: { eq: "Table" } }
-            displayName: { eq: $tableName }
-            fullName: {
-                startsWith: "AWS"
-            }
-        }
-    ) {
-        id
-    }
-}
-"""
-
-GET_SUBSCRIPTION_REQUESTS_BY_STATUS_QUERY = """
-query Assets($status: String!) {
-    assets(
-        limit: 100
-        where: {
-            displayName: { contains: "Subscription Request" }
-            status: { name: { eq: $status } }
-            outgoingRelations: { empty: false }
-        }
-        order: { modifiedOn: desc }
-    ) {
-        id
-        displayName
+# Relations of the `$relationType` type from the `$sourceId` asset to any of a lookup batch of `$targetIds` assets
+GET_RELATED_ASSET_IDS_QUERY = """
+query Assets($sourceId: UUID!, $relationType: UUID!, $targetIds: [UUID!]!) {
+    assets(limit: 1, where: { id: { eq: $sourceId } }) {
         outgoingRelations(
-            limit: 1
-            where: { target: { fullName: { startsWith: "AWS" } } }
+            limit: %(batch_size)d
+            where: { type: { id: { eq: $relationType } }, target: { id: { in: $targetIds } } }
         ) {
             target {
                 id
-                fullName
-                displayName
-                stringAttributes(where: { type: { name: { eq: "AWS Resource Metadata" } } }) {
-                    stringValue
-                    type {
-                        name
-                    }
-                }
-            }
-        }
-        stringAttributes(where: { type: { name: { in: ["AWS Producer Project Id", "AWS Consumer Project Id"] } } }) {
-            stringValue
-            type {
-                name
             }
         }
     }
 }
-"""
+""" % {"batch_size": COLLIBRA_MAX_LOOKUP_BATCH_SIZE}
+
+# Restricts the paged table name query to the tables with one of the `$tableNames` names
+TABLE_NAMES_FILTER = "displayName: { in: $tableNames }"
+TABLE_NAMES_VARIABLE = "$tableNames: [String!]!"
 
 GET_ASSET_BY_NAME_QUERY = """
 query Assets($assetName: String!) {
@@ -280,35 +239,4 @@ query Assets($assetName: String!) {
         displayName
     }
 }
-"""
-
-GET_ASSET_BY_NAME_AND_TYPE_QUERY = """
-query Assets($assetName: String!, $typeId: UUID!) {
-    assets(limit: 1, where: { displayName: { eq: $assetName } type: {id: { eq: $typeId}}}) {
-        id
-        fullName
-        displayName
-    }
-}
-"""
-
-
-GET_ASSET_AND_STRING_ATTRIBUTES_BY_NAME_AND_TYPE_QUERY = """
-query Assets($assetName: String!, $type: UUID!, $stringAttributeType: UUID!) {
-    assets(
-        limit: 1
-        where: {
-            displayName: { eq: $assetName }
-            type: { id: { eq: $type } }
-        }
-    ) {
-        id
-        fullName
-        displayName
-        stringAttributes(where: {type: {id: {eq: $stringAttributeType}}}) {
-            id
-            stringValue
-        }
-    }
-}
 """
\ No newline at end of file
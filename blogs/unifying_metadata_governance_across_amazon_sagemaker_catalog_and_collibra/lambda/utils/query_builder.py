@@ -0,0 +1,56 @@
+from functools import lru_cache
+from typing import Tuple
+
+INDENT = "    "
+CURSOR_VARIABLE = "$lastSeenId: UUID!"
+CURSOR_FILTER = "id: { gt: $lastSeenId }"
+CURSOR_ORDER = "id: asc"
+
+
+@lru_cache(maxsize=128)
+def build_assets_query(fields: Tuple[str, ...], filters: Tuple[str, ...] = (), page_size: int = None,
+                       with_cursor: bool = False, order: str = CURSOR_ORDER, variables: Tuple[str, ...] = ()) -> str:
+    """
+    Builds a GraphQL query document over Collibra assets. Documents are cached per combination of arguments,
+    so all arguments must be hashable.
+
+    :param fields: Fields to project. A nested selection is passed as a single, possibly multi-line, field
+    :param filters: Conditions of the `where` argument, all of which have to match
+    :param page_size: Value of the `limit` argument, or None to use the Collibra default
+    :param with_cursor: Whether to only fetch assets after the `$lastSeenId` variable, which requires ordering by id
+    :param order: Value of the `order` argument, or None for unordered results
+    :param variables: Declarations of the variables used by the filters, e.g. `$status: String!`
+    :return: GraphQL query document
+    """
+    if with_cursor:
+        if order != CURSOR_ORDER:
+            raise ValueError(f"Paging with a cursor requires order '{CURSOR_ORDER}', got '{order}'")
+        variables = (CURSOR_VARIABLE,) + variables
+        filters = (CURSOR_FILTER,) + filters
+
+    arguments = []
+    if page_size is not None:
+        arguments.append(f"limit: {page_size}")
+    if order:
+        arguments.append(f"order: {{ {order} }}")
+    if filters:
+        arguments.append("where: {")
+        arguments.extend(_indent(condition, 1) for condition in filters)
+        arguments.append("}")
+
+    variable_declarations = f"({', '.join(variables)})" if variables else ""
+    lines = [f"query Assets{variable_declarations} {{"]
+    if arguments:
+        lines.append(_indent("assets(", 1))
+        lines.extend(_indent(argument, 2) for argument in arguments)
+        lines.append(_indent(") {", 1))
+    else:
+        lines.append(_indent("assets {", 1))
+    lines.extend(_indent(field, 2) for field in fields)
+    lines.append(_indent("}", 1))
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _indent(text: str, level: int) -> str:
+    return "\n".join(INDENT * level + line for line in text.split("\n"))
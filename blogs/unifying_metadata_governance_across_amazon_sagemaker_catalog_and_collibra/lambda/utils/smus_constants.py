@@ -26,4 +26,18 @@ REDSHIFT_SERVERLESS_EXTERNAL_IDENTIFIER_INFIX = "redshift:serverless"
 REDSHIFT_CLUSTER_EXTERNAL_IDENTIFIER_INFIX = "redshift:cluster"
 REDSHIFT_SERVERLESS_STORAGE_TYPE = "SERVERLESS"
 REDSHIFT_CLUSTER_STORAGE_TYPE = "CLUSTER"
-STORAGE_TYPE_KEY = "storageType"
\ No newline at end of file
+STORAGE_TYPE_KEY = "storageType"
+THROTTLING_EXCEPTION_CODE = "ThrottlingException"
+THROTTLING_HTTP_STATUS_CODE = 429
+# Errors of the domain-wide search which mean it is not available to the integration, rather than that it failed
+DOMAIN_WIDE_SEARCH_UNSUPPORTED_ERROR_CODES = ("AccessDeniedException", "ValidationException")
+# Requests per second allowed per DataZone operation, following the published DataZone API throttling limits
+SMUS_OPERATION_MAX_REQUESTS_PER_SECOND = {
+    "CreateAssetRevision": 10,
+    "GetAsset": 20,
+    "Search": 20,
+    "SearchListings": 20,
+    "CreateGlossaryTerm": 10,
+    "UpdateGlossaryTerm": 10,
+}
+SMUS_DEFAULT_MAX_REQUESTS_PER_SECOND = 10
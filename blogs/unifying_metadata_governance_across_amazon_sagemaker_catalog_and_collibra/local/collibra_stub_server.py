@@ -0,0 +1,516 @@
+"""
+Local stand-in for the Collibra endpoints used by lambda/adapter/CollibraAdapter.py, for measuring the throughput of
+the sync workflows offline.
+
+The server answers the knowledge graph GraphQL queries of lambda/utils/queries.py and the /rest/2.0 routes for assets,
+relations, attributes and workflow instances from a synthetic catalog of configurable size. Latency, error rates and
+429 throttling can be injected per route.
+
+CollibraAdapter only talks HTTPS, so the server has to be started with a certificate trusted by `requests`:
+
+    openssl req -x509 -newkey rsa:2048 -nodes -days 30 -subj "/CN=localhost" \\
+        -addext "subjectAltName=DNS:localhost" -keyout key.pem -out cert.pem
+    python local/collibra_stub_server.py --port 8443 --certfile cert.pem --keyfile key.pem \\
+        --tables 5000 --latency graphql=0.2 --throttle-rate graphql=0.05
+    export REQUESTS_CA_BUNDLE=$PWD/cert.pem
+
+and the Collibra config secret pointed at `localhost:8443`.
+"""
+import argparse
+import base64
+import json
+import random
+import re
+import ssl
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+
+GRAPHQL_PATH = "/graphql/knowledgeGraph/v1"
+REST_PATH_PREFIX = "/rest/2.0/"
+GRAPHQL_ROUTE = "graphql"
+ROUTES = (GRAPHQL_ROUTE, "assets", "relations", "attributes", "workflowInstances")
+
+APPROVED_STATUS = "Approved"
+PII_DATA_CATEGORY = "Personal Identifiable Information"
+GLUE_REGION = "NORTHERNVIRGINIA"
+
+DEFAULT_AWS_USER_TYPE_ID = "00000000-0000-0000-0000-00000000a001"
+DEFAULT_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID = "00000000-0000-0000-0000-00000000a002"
+DEFAULT_AWS_PROJECT_TYPE_ID = "00000000-0000-0000-0000-00000000a003"
+DEFAULT_AWS_PROJECT_ATTRIBUTE_TYPE_ID = "00000000-0000-0000-0000-00000000a004"
+
+
+class RouteFaults:
+    """
+    Faults injected into every request of a route
+    """
+
+    def __init__(self, latency_in_seconds: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after_in_seconds: int = 1):
+        """
+        :param latency_in_seconds: Delay added before the request is answered
+        :param error_rate: Share of requests answered with 500
+        :param throttle_rate: Share of requests answered with 429 and a Retry-After header
+        :param retry_after_in_seconds: Value of the Retry-After header of throttled requests
+        """
+        self.latency_in_seconds = latency_in_seconds
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after_in_seconds = retry_after_in_seconds
+
+
+class SyntheticCollibraCatalog:
+    """
+    Deterministic in-memory catalog with AWS Glue tables and their columns, business terms with a hierarchy,
+    AWS users, AWS projects and subscription requests. Table `i` is named `table_{i:05d}` in database
+    `database_{i // tables_per_database}` of account `account_id`, so a matching SMUS catalog can be generated from
+    the same parameters. Writes through the REST routes are applied to the catalog.
+    """
+
+    def __init__(self, num_tables: int = 1000, num_columns_per_table: int = 10, tables_per_database: int = 100,
+                 num_business_terms: int = 500, num_users: int = 100, num_projects: int = 20,
+                 num_subscription_requests: int = 50, account_id: str = "123456789012", seed: int = 0,
+                 aws_user_type_id: str = DEFAULT_AWS_USER_TYPE_ID,
+                 aws_user_project_attribute_type_id: str = DEFAULT_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID,
+                 aws_project_type_id: str = DEFAULT_AWS_PROJECT_TYPE_ID,
+                 aws_project_attribute_type_id: str = DEFAULT_AWS_PROJECT_ATTRIBUTE_TYPE_ID):
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+        self.__modified_on = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.__account_id = account_id
+
+        self.__business_terms = {}
+        for i in range(num_business_terms):
+            term_id = self.__new_id()
+            parent_id = self.__random.choice(list(self.__business_terms)) if i and i % 5 else None
+            self.__business_terms[term_id] = {"id": term_id, "displayName": f"Term {i:05d}",
+                                              "definition": f"Definition of term {i}", "parentId": parent_id,
+                                              "modifiedOn": self.__next_modified_on()}
+
+        term_ids = list(self.__business_terms)
+        self.__tables = {}
+        for i in range(num_tables):
+            table_id = self.__new_id()
+            database = f"database_{i // tables_per_database}"
+            columns = []
+            for j in range(num_columns_per_table):
+                columns.append({"id": self.__new_id(), "displayName": f"column_{j:03d}",
+                                "description": f"Column {j} of table {i}",
+                                "businessTermIds": [self.__random.choice(term_ids)] if term_ids and j % 3 == 0 else [],
+                                "isPii": j == 1})
+            self.__tables[table_id] = {"id": table_id, "displayName": f"table_{i:05d}",
+                                       "fullName": f"AWS>{account_id}>{database}>table_{i:05d}",
+                                       "description": f"Synthetic table {i}", "columns": columns,
+                                       "businessTermIds": [self.__random.choice(term_ids)] if term_ids else [],
+                                       "modifiedOn": self.__next_modified_on()}
+
+        # Assets created through the REST routes are typed, so users and projects live next to them
+        self.__assets = {}
+        self.__relations = []
+        for i in range(num_projects):
+            self.__create_asset({"name": f"project_{i:03d}", "typeId": aws_project_type_id},
+                                {aws_project_attribute_type_id: [f"smus-project-{i:03d}"]})
+        project_names = [f"project_{i:03d}" for i in range(num_projects)]
+        for i in range(num_users):
+            projects = self.__random.sample(project_names, min(2, len(project_names)))
+            self.__create_asset({"name": f"user_{i:04d}", "typeId": aws_user_type_id},
+                                {aws_user_project_attribute_type_id: projects})
+
+        table_ids = list(self.__tables)
+        self.__subscription_requests = {}
+        for i in range(num_subscription_requests):
+            request_id = self.__new_id()
+            self.__subscription_requests[request_id] = {
+                "id": request_id, "displayName": f"Subscription Request {i:05d}", "status": APPROVED_STATUS,
+                "tableId": self.__random.choice(table_ids) if table_ids else None,
+                "producerProjectId": f"smus-project-{i % max(num_projects, 1):03d}",
+                "consumerProjectId": f"smus-project-{(i + 1) % max(num_projects, 1):03d}"}
+
+    @property
+    def account_id(self) -> str:
+        return self.__account_id
+
+    def execute_graphql(self, query: str, variables: dict) -> dict:
+        """
+        Answers a query of lambda/utils/queries.py. The query is recognised by its variables and filters rather than
+        parsed, and the selected assets are returned with all fields read by CollibraAdapter.
+        """
+        with self.__lock:
+            if "assetIds" in variables:
+                tables = [self.__tables[table_id] for table_id in variables["assetIds"] if table_id in self.__tables]
+                return self.__table_details(tables)
+            if "sourceId" in variables:
+                return {"assets": self.__related_assets(query, variables)}
+            return {"assets": self.__page(query, variables)}
+
+    def create_asset(self, payload: dict) -> dict:
+        with self.__lock:
+            return self.__create_asset(payload, {})
+
+    def create_relation(self, payload: dict) -> dict:
+        with self.__lock:
+            relation = {"id": self.__new_id(), "source": {"id": payload["sourceId"]},
+                        "target": {"id": payload["targetId"]}, "type": {"id": payload["typeId"]}}
+            self.__relations.append(relation)
+            return relation
+
+    def add_attribute(self, payload: dict) -> dict:
+        with self.__lock:
+            asset = self.__get_asset(payload["assetId"])
+            asset["attributes"].setdefault(payload["typeId"], []).append(payload["value"])
+            return {"id": self.__new_id(), "asset": {"id": asset["id"]}, "type": {"id": payload["typeId"]},
+                    "value": payload["value"]}
+
+    def set_attributes(self, asset_id: str, payload: dict) -> List[dict]:
+        with self.__lock:
+            asset = self.__get_asset(asset_id)
+            asset["attributes"][payload["typeId"]] = list(payload["values"])
+            return [{"id": self.__new_id(), "asset": {"id": asset_id}, "type": {"id": payload["typeId"]},
+                     "value": value} for value in payload["values"]]
+
+    def update_asset(self, asset_id: str, payload: dict) -> dict:
+        with self.__lock:
+            if asset_id in self.__subscription_requests:
+                subscription_request = self.__subscription_requests[asset_id]
+                if "statusId" in payload:
+                    subscription_request["status"] = payload["statusId"]
+                return {"id": asset_id, "displayName": subscription_request["displayName"]}
+            asset = self.__get_asset(asset_id)
+            return {"id": asset_id, "displayName": asset["displayName"]}
+
+    def __create_asset(self, payload: dict, attributes: Dict[str, List[str]]) -> dict:
+        asset_id = self.__new_id()
+        self.__assets[asset_id] = {"id": asset_id, "displayName": payload["name"], "typeId": payload["typeId"],
+                                   "domainId": payload.get("domainId"), "attributes": attributes,
+                                   "modifiedOn": self.__next_modified_on()}
+        return {"id": asset_id, "name": payload["name"], "displayName": payload["name"]}
+
+    def __get_asset(self, asset_id: str) -> dict:
+        if asset_id not in self.__assets:
+            raise KeyError(f"Asset {asset_id} not found")
+        return self.__assets[asset_id]
+
+    def __page(self, query: str, variables: dict) -> List[dict]:
+        if "Subscription Request" in query:
+            assets = [self.__subscription_request(request) for request in self.__subscription_requests.values()
+                      if request["status"] == variables["status"]]
+        elif "type" in variables and "stringAttributeType" in variables:
+            assets = [self.__typed_asset(asset, variables["stringAttributeType"]) for asset in self.__assets.values()
+                      if asset["typeId"] == variables["type"]]
+        elif '"BusinessTerm"' in query.split(") {")[0]:
+            terms = self.__modified_after(self.__business_terms.values(), variables)
+            if "incomingRelations: { empty: false }" in query:
+                assets = [self.__business_term_with_parent(term) for term in terms if term["parentId"]]
+            else:
+                assets = [self.__business_term(term) for term in terms]
+        else:
+            tables = self.__modified_after(self.__tables.values(), variables)
+            if "tableNames" in variables:
+                names = set(variables["tableNames"])
+                tables = [table for table in tables if table["displayName"] in names]
+            if "AWS Resource Metadata" in query:
+                assets = [self.__table_with_resource_metadata(table) for table in tables]
+            else:
+                assets = [self.__table_name(table) for table in tables]
+
+        assets.sort(key=lambda asset: asset["id"])
+        if "lastSeenId" in variables:
+            assets = [asset for asset in assets if asset["id"] > variables["lastSeenId"]]
+        limit = re.search(r"limit: (\d+)", query.split(") {")[0])
+        return assets[:int(limit.group(1))] if limit else assets
+
+    def __related_assets(self, query: str, variables: dict) -> List[dict]:
+        if variables["sourceId"] not in self.__assets:
+            return []
+        target_ids = set(variables["targetIds"])
+        relations = [{"target": relation["target"]} for relation in self.__relations
+                     if relation["source"]["id"] == variables["sourceId"]
+                     and relation["type"]["id"] == variables["relationType"] and relation["target"]["id"] in target_ids]
+        limit = re.search(r"outgoingRelations\(\s*limit: (\d+)", query)
+        return [{"outgoingRelations": relations[:int(limit.group(1))] if limit else relations}]
+
+    @staticmethod
+    def __modified_after(assets, variables: dict) -> list:
+        if "modifiedAfter" not in variables:
+            return list(assets)
+        modified_after = datetime.fromisoformat(variables["modifiedAfter"])
+        return [asset for asset in assets if asset["modifiedOn"] > modified_after]
+
+    def __tables_by_ids(self, table_ids: List[str]) -> List[dict]:
+        return [self.__tables[table_id] for table_id in table_ids if table_id in self.__tables]
+
+    def __table_details(self, tables: List[dict]) -> dict:
+        return {"table": [self.__table(table) for table in tables],
+                "businessTerms": [self.__table_business_terms(table) for table in tables],
+                "piiColumns": [{"id": table["id"], **self.__pii_columns(table)} for table in tables]}
+
+    @staticmethod
+    def __table_name(table: dict) -> dict:
+        return {"id": table["id"], "displayName": table["displayName"]}
+
+    def __table_with_resource_metadata(self, table: dict) -> dict:
+        resource_metadata = {"glueAccessRoleArn": f"arn:aws:iam::{self.__account_id}:role/glue-access",
+                             "region": GLUE_REGION}
+        return {"id": table["id"], "fullName": table["fullName"], "displayName": table["displayName"],
+                "stringAttributes": [{"stringValue": json.dumps(resource_metadata),
+                                      "type": {"name": "AWS Resource Metadata"}}]}
+
+    def __table(self, table: dict) -> dict:
+        return {"id": table["id"], "fullName": table["fullName"], "displayName": table["displayName"],
+                "stringAttributes": [{"id": self.__attribute_id(table["id"]), "stringValue": table["description"]}],
+                "incomingRelations": [{"source": {
+                    "id": column["id"], "fullName": f"{table['fullName']}>{column['displayName']}",
+                    "displayName": column["displayName"],
+                    "stringAttributes": [{"id": self.__attribute_id(column["id"]),
+                                          "stringValue": column["description"]}],
+                    "incomingRelations": [{"source": self.__business_term_reference(term_id)}
+                                          for term_id in column["businessTermIds"]]
+                }} for column in table["columns"]]}
+
+    def __table_business_terms(self, table: dict) -> dict:
+        return {"id": table["id"], "fullName": table["fullName"], "displayName": table["displayName"],
+                "incomingRelations": [{"source": self.__business_term_reference(term_id)}
+                                      for term_id in table["businessTermIds"]]}
+
+    @staticmethod
+    def __pii_columns(table: dict) -> dict:
+        return {"incomingRelations": [{"source": {
+            "displayName": column["displayName"],
+            "incomingRelations": [{"source": {"incomingRelations": [
+                {"source": {"displayName": PII_DATA_CATEGORY, "type": {"publicId": "DataCategory"}}}
+            ] if column["isPii"] else []}}]
+        }} for column in table["columns"]]}
+
+    def __business_term_reference(self, term_id: str) -> dict:
+        term = self.__business_terms[term_id]
+        return {"id": term_id, "fullName": term["displayName"], "displayName": term["displayName"]}
+
+    @staticmethod
+    def __business_term(term: dict) -> dict:
+        return {"id": term["id"], "fullName": term["displayName"], "displayName": term["displayName"],
+                "stringAttributes": [{"stringValue": term["definition"]}]}
+
+    def __business_term_with_parent(self, term: dict) -> dict:
+        parent = self.__business_terms[term["parentId"]]
+        return {"id": term["id"], "displayName": term["displayName"],
+                "incomingRelations": [{"source": {"displayName": parent["displayName"]}}]}
+
+    def __typed_asset(self, asset: dict, string_attribute_type_id: str | None) -> dict:
+        values = asset["attributes"].get(string_attribute_type_id, []) if string_attribute_type_id else []
+        return {"id": asset["id"], "fullName": asset["displayName"], "displayName": asset["displayName"],
+                "stringAttributes": [{"id": self.__attribute_id(f"{asset['id']}{value}"), "stringValue": value}
+                                     for value in values]}
+
+    def __subscription_request(self, request: dict) -> dict:
+        table = self.__tables.get(request["tableId"])
+        return {"id": request["id"], "displayName": request["displayName"],
+                "outgoingRelations": [{"target": self.__table_with_resource_metadata(table)}] if table else [],
+                "stringAttributes": [
+                    {"stringValue": request["producerProjectId"], "type": {"name": "AWS Producer Project Id"}},
+                    {"stringValue": request["consumerProjectId"], "type": {"name": "AWS Consumer Project Id"}}]}
+
+    def __new_id(self) -> str:
+        return str(uuid.UUID(int=self.__random.getrandbits(128), version=4))
+
+    @staticmethod
+    def __attribute_id(seed: str) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, seed))
+
+    def __next_modified_on(self) -> datetime:
+        self.__modified_on += timedelta(seconds=1)
+        return self.__modified_on
+
+
+class CollibraStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address: Tuple[str, int], catalog: SyntheticCollibraCatalog,
+                 route_faults: Dict[str, RouteFaults] = None, username: str = None, password: str = None,
+                 seed: int = 0):
+        """
+        :param route_faults: Faults injected per route, keyed by one of ROUTES
+        :param username: If set together with password, requests without matching Basic credentials are answered
+        with 401
+        """
+        super().__init__(server_address, CollibraStubRequestHandler)
+        self.catalog = catalog
+        self.route_faults = route_faults or {}
+        self.authorization = None
+        if username is not None and password is not None:
+            self.authorization = "Basic " + base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("utf-8")
+        self.__random = random.Random(seed)
+        self.__random_lock = threading.Lock()
+
+    def random(self) -> float:
+        with self.__random_lock:
+            return self.__random.random()
+
+
+class CollibraStubRequestHandler(BaseHTTPRequestHandler):
+    server: CollibraStubServer
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.__handle()
+
+    def do_PUT(self):
+        self.__handle()
+
+    def do_PATCH(self):
+        self.__handle()
+
+    def log_message(self, format, *args):
+        pass
+
+    def __handle(self):
+        body = self.__read_json()
+        route = self.__get_route()
+        if route is None:
+            return self.__respond(404, {"message": f"Unknown path {self.path}"})
+
+        if self.server.authorization and self.headers.get("Authorization") != self.server.authorization:
+            return self.__respond(401, {"message": "Unauthorized"})
+
+        faults = self.server.route_faults.get(route)
+        if faults:
+            time.sleep(faults.latency_in_seconds)
+            chance = self.server.random()
+            if chance < faults.throttle_rate:
+                return self.__respond(429, {"message": "Too Many Requests"},
+                                      {"Retry-After": str(faults.retry_after_in_seconds)})
+            if chance < faults.throttle_rate + faults.error_rate:
+                return self.__respond(500, {"message": "Injected error"})
+
+        try:
+            if route == GRAPHQL_ROUTE:
+                data = self.server.catalog.execute_graphql(body["query"], body.get("variables", {}))
+                return self.__respond(200, {"data": data})
+            return self.__handle_rest(body)
+        except KeyError as e:
+            return self.__respond(404, {"message": str(e)})
+
+    def __handle_rest(self, body):
+        catalog = self.server.catalog
+        segments = self.path[len(REST_PATH_PREFIX):].split("/")
+        resource = segments[0]
+        is_bulk = len(segments) == 2 and segments[1] == "bulk"
+        create = {"assets": catalog.create_asset, "relations": catalog.create_relation,
+                  "attributes": catalog.add_attribute}.get(resource)
+
+        if self.command == "POST" and create and is_bulk:
+            return self.__respond(200, [create(item) for item in body])
+        if self.command == "POST" and create and len(segments) == 1:
+            return self.__respond(201, create(body))
+        if self.command == "PUT" and resource == "assets" and len(segments) == 3 and segments[2] == "attributes":
+            return self.__respond(200, catalog.set_attributes(segments[1], body))
+        if self.command == "PATCH" and resource == "assets" and len(segments) == 2:
+            return self.__respond(200, catalog.update_asset(segments[1], body))
+        if self.command == "POST" and resource == "workflowInstances" and len(segments) == 1:
+            return self.__respond(201, [{"id": str(uuid.uuid4()),
+                                         "workflowDefinition": {"id": body.get("workflowDefinitionId")}}])
+        return self.__respond(404, {"message": f"Unsupported {self.command} {self.path}"})
+
+    def __get_route(self) -> str | None:
+        if self.path == GRAPHQL_PATH:
+            return GRAPHQL_ROUTE
+        if self.path.startswith(REST_PATH_PREFIX):
+            resource = self.path[len(REST_PATH_PREFIX):].split("/")[0]
+            if resource in ROUTES:
+                return resource
+        return None
+
+    def __read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def __respond(self, status: int, payload, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse_route_values(values: List[str], value_type=float) -> Dict[str, float]:
+    """
+    :param values: Values in the form `route=value`, where route is one of ROUTES or `all`
+    """
+    route_values = {}
+    for value in values or []:
+        route, _, route_value = value.partition("=")
+        if route != "all" and route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown route {route}. Expected one of {', '.join(ROUTES)} or all")
+        for target in (ROUTES if route == "all" else (route,)):
+            route_values[target] = value_type(route_value)
+    return route_values
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the Collibra endpoints used by the integration",
+                                     formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--certfile", help="Certificate to serve HTTPS with")
+    parser.add_argument("--keyfile", help="Private key of the certificate")
+    parser.add_argument("--username", help="Expected Collibra username. Any credentials are accepted if not set")
+    parser.add_argument("--password", help="Expected Collibra password")
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--columns-per-table", type=int, default=10)
+    parser.add_argument("--tables-per-database", type=int, default=100)
+    parser.add_argument("--business-terms", type=int, default=500)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--subscription-requests", type=int, default=50)
+    parser.add_argument("--account-id", default="123456789012")
+    parser.add_argument("--aws-user-type-id", default=DEFAULT_AWS_USER_TYPE_ID)
+    parser.add_argument("--aws-user-project-attribute-type-id", default=DEFAULT_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID)
+    parser.add_argument("--aws-project-type-id", default=DEFAULT_AWS_PROJECT_TYPE_ID)
+    parser.add_argument("--aws-project-attribute-type-id", default=DEFAULT_AWS_PROJECT_ATTRIBUTE_TYPE_ID)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", action="append", metavar="ROUTE=SECONDS",
+                        help=f"Latency added per request of a route, one of {', '.join(ROUTES)} or all")
+    parser.add_argument("--error-rate", action="append", metavar="ROUTE=RATE",
+                        help="Share of requests of a route answered with 500")
+    parser.add_argument("--throttle-rate", action="append", metavar="ROUTE=RATE",
+                        help="Share of requests of a route answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After of throttled requests in seconds")
+    args = parser.parse_args()
+
+    latencies = parse_route_values(args.latency)
+    error_rates = parse_route_values(args.error_rate)
+    throttle_rates = parse_route_values(args.throttle_rate)
+    route_faults = {route: RouteFaults(latencies.get(route, 0.0), error_rates.get(route, 0.0),
+                                       throttle_rates.get(route, 0.0), args.retry_after) for route in ROUTES}
+
+    catalog = SyntheticCollibraCatalog(args.tables, args.columns_per_table, args.tables_per_database,
+                                       args.business_terms, args.users, args.projects, args.subscription_requests,
+                                       args.account_id, args.seed, args.aws_user_type_id,
+                                       args.aws_user_project_attribute_type_id, args.aws_project_type_id,
+                                       args.aws_project_attribute_type_id)
+    server = CollibraStubServer((args.host, args.port), catalog, route_faults, args.username, args.password,
+                                args.seed)
+    scheme = "http"
+    if args.certfile:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(args.certfile, args.keyfile)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        scheme = "https"
+
+    print(f"Serving synthetic Collibra catalog with {args.tables} tables on {scheme}://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,508 @@
+"""
+Local stand-in for the DataZone APIs used by lambda/adapter/SMUSAdapter.py, for measuring the throughput of the asset,
+glossary, project and subscription sync workflows offline.
+
+The stand-in is an in-process replacement of the boto3 `datazone` client, backed by a synthetic SMUS catalog that
+mirrors the tables of local/collibra_stub_server.py when both are generated with the same parameters. Latency, error
+rates and throttling can be injected per DataZone operation. It is plugged in through AWSClientFactory before any
+adapter is created:
+
+    from business.AWSClientFactory import AWSClientFactory
+    from collibra_stub_server import RouteFaults
+    from datazone_stub_client import DataZoneStubClient, SyntheticSMUSCatalog
+
+    catalog = SyntheticSMUSCatalog(num_tables=5000, admin_role_arn=SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN)
+    AWSClientFactory.register("datazone", DataZoneStubClient(catalog, {
+        "Search": RouteFaults(latency_in_seconds=0.05, throttle_rate=0.02),
+        "CreateAssetRevision": RouteFaults(latency_in_seconds=0.1)}))
+
+with `local` on the Python path next to `lambda`. Unlike the boto3 client, the stand-in does not retry throttled
+requests itself, so every injected throttle reaches the integration.
+"""
+import copy
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+from botocore.exceptions import ClientError
+
+from collibra_stub_server import RouteFaults
+
+GLUE_TABLE_ASSET_TYPE = "amazon.datazone.GlueTableAssetType"
+GLUE_TABLE_FORM_TYPE = "amazon.datazone.GlueTableFormType"
+ASSET_COMMON_DETAILS_FORM_TYPE = "amazon.datazone.AssetCommonDetailsFormType"
+ADMIN_USER_ID = "smus-admin-user"
+DEFAULT_ADMIN_ROLE_ARN = "arn:aws:iam::123456789012:role/SMUSCollibraIntegrationAdminRole"
+DEFAULT_MAX_RESULTS = 50
+
+
+class DataZoneStubClientError(ClientError):
+    """
+    Error raised by DataZoneStubClient in the shape of the modeled exceptions of the boto3 client
+    """
+    CODE = None
+    HTTP_STATUS_CODE = 400
+
+    def __init__(self, message: str, operation_name: str = None):
+        """
+        :param operation_name: DataZone operation that failed. The catalog raises errors without it and
+        DataZoneStubClient raises them again for the operation that was called
+        """
+        super().__init__({"Error": {"Code": self.CODE, "Message": message},
+                          "ResponseMetadata": {"HTTPStatusCode": self.HTTP_STATUS_CODE, "RetryAttempts": 0}},
+                         operation_name)
+
+    @property
+    def message(self) -> str:
+        return self.response["Error"]["Message"]
+
+
+class ResourceNotFoundException(DataZoneStubClientError):
+    CODE = "ResourceNotFoundException"
+    HTTP_STATUS_CODE = 404
+
+
+class ConflictException(DataZoneStubClientError):
+    CODE = "ConflictException"
+    HTTP_STATUS_CODE = 409
+
+
+class ThrottlingException(DataZoneStubClientError):
+    CODE = "ThrottlingException"
+    HTTP_STATUS_CODE = 429
+
+
+class InternalServerException(DataZoneStubClientError):
+    CODE = "InternalServerException"
+    HTTP_STATUS_CODE = 500
+
+
+class DataZoneStubExceptions:
+    ResourceNotFoundException = ResourceNotFoundException
+    ConflictException = ConflictException
+    ThrottlingException = ThrottlingException
+    InternalServerException = InternalServerException
+
+
+class SyntheticSMUSCatalog:
+    """
+    Deterministic in-memory SMUS domain with one Glue table asset and one published listing per table, projects,
+    SSO users with their project memberships, the IAM user of the integration admin role, glossaries and
+    subscriptions. Table `i` is named `table_{i:05d}` in database `database_{i // tables_per_database}` of account
+    `account_id`, like in SyntheticCollibraCatalog, and is owned by project `smus-project-{i % num_projects:03d}`.
+    Writes are applied to the catalog.
+    """
+
+    def __init__(self, num_tables: int = 1000, num_columns_per_table: int = 10, tables_per_database: int = 100,
+                 num_users: int = 100, num_projects: int = 20, account_id: str = "123456789012",
+                 region: str = "us-east-1", admin_role_arn: str = DEFAULT_ADMIN_ROLE_ARN, seed: int = 0):
+        self.__random = random.Random(seed)
+        self.__lock = threading.RLock()
+        self.__account_id = account_id
+        self.__region = region
+
+        self.__projects = {}
+        for i in range(num_projects):
+            project_id = f"smus-project-{i:03d}"
+            self.__projects[project_id] = {"id": project_id, "name": f"project_{i:03d}", "projectStatus": "ACTIVE",
+                                           "domainId": "", "createdAt": self.__now()}
+
+        self.__user_profiles = {ADMIN_USER_ID: {"id": ADMIN_USER_ID, "type": "IAM", "status": "ACTIVATED",
+                                                "details": {"iam": {"arn": admin_role_arn}}}}
+        self.__memberships = {project_id: [] for project_id in self.__projects}
+        for i in range(num_users):
+            user_id = f"smus-user-{i:04d}"
+            self.__user_profiles[user_id] = {"id": user_id, "type": "SSO", "status": "ACTIVATED",
+                                             "details": {"sso": {"username": f"user_{i:04d}", "firstName": "User",
+                                                                 "lastName": f"{i:04d}"}}}
+            for project_id in self.__random.sample(list(self.__projects), min(2, num_projects)):
+                self.__memberships[project_id].append(
+                    {"designation": "PROJECT_CONTRIBUTOR", "memberDetails": {"user": {"userId": user_id}}})
+        for project_id in self.__projects:
+            self.__memberships[project_id].append(
+                {"designation": "PROJECT_OWNER", "memberDetails": {"user": {"userId": ADMIN_USER_ID}}})
+
+        self.__assets = {}
+        self.__asset_ids_by_name = {}
+        self.__listings = {}
+        self.__listing_ids_by_project = {project_id: [] for project_id in self.__projects}
+        project_ids = list(self.__projects)
+        for i in range(num_tables):
+            database = f"database_{i // tables_per_database}"
+            owning_project_id = project_ids[i % num_projects] if project_ids else None
+            asset = self.__create_table_asset(f"table_{i:05d}", database, num_columns_per_table, owning_project_id)
+            self.__publish(asset)
+
+        self.__glossaries = {}
+        self.__glossary_terms = {}
+        self.__subscription_requests = {}
+        self.__subscriptions = {}
+
+    @property
+    def account_id(self) -> str:
+        return self.__account_id
+
+    def search(self, searchScope: str, searchText: str = None, owningProjectIdentifier: str = None,
+               filters: dict = None, additionalAttributes: List[str] = None, **kwargs) -> List[dict]:
+        with self.__lock:
+            if searchScope == "ASSET":
+                assets = self.__find_assets_by_name(searchText)
+                return [self.__asset_search_item(asset, additionalAttributes) for asset in assets
+                        if owningProjectIdentifier is None or asset["owningProjectId"] == owningProjectIdentifier]
+            if searchScope == "GLOSSARY":
+                return [{"glossaryItem": dict(glossary)} for glossary in self.__glossaries.values()
+                        if self.__matches_text(glossary["name"], searchText)]
+            if searchScope == "GLOSSARY_TERM":
+                glossary_id = self.__get_filter_values(filters).get("BusinessGlossaryTermForm.businessGlossaryId")
+                return [{"glossaryTermItem": dict(term)} for term in self.__glossary_terms.values()
+                        if (glossary_id is None or term["glossaryId"] == glossary_id)
+                        and self.__matches_text(term["name"], searchText)]
+        raise ValueError(f"Unsupported search scope {searchScope}")
+
+    def search_listings(self, searchText: str = None, filters: dict = None, **kwargs) -> List[dict]:
+        filter_values = self.__get_filter_values(filters)
+        project_id = filter_values.get("owningProjectId")
+        with self.__lock:
+            listing_ids = self.__listing_ids_by_project.get(project_id, []) if project_id else list(self.__listings)
+            return [{"assetListing": copy.deepcopy(self.__listings[listing_id])} for listing_id in listing_ids
+                    if self.__matches_text(self.__listings[listing_id]["name"], searchText)]
+
+    def get_asset(self, identifier: str, **kwargs) -> dict:
+        with self.__lock:
+            return copy.deepcopy(self.__get(self.__assets, identifier, "Asset"))
+
+    def create_asset_revision(self, identifier: str, name: str, formsInput: List[dict] = None,
+                              description: str = None, glossaryTerms: List[str] = None, **kwargs) -> dict:
+        with self.__lock:
+            asset = self.__get(self.__assets, identifier, "Asset")
+            asset["name"] = name
+            asset["formsOutput"] = [self.__form_output(form) for form in formsInput or []]
+            if description is not None:
+                asset["description"] = description
+            if glossaryTerms is not None:
+                asset["glossaryTerms"] = list(glossaryTerms)
+            asset["revision"] = str(int(asset["revision"]) + 1)
+            return copy.deepcopy(asset)
+
+    def create_glossary(self, name: str, owningProjectIdentifier: str, description: str = None,
+                        status: str = "ENABLED", **kwargs) -> dict:
+        with self.__lock:
+            if any(glossary["name"] == name for glossary in self.__glossaries.values()):
+                raise ConflictException(f"Glossary {name} already exists")
+            glossary = {"id": self.__new_id(), "name": name, "owningProjectId": owningProjectIdentifier,
+                        "description": description, "status": status}
+            self.__glossaries[glossary["id"]] = glossary
+            return dict(glossary)
+
+    def create_glossary_term(self, glossaryIdentifier: str, name: str, status: str = "ENABLED",
+                             shortDescription: str = None, longDescription: str = None, **kwargs) -> dict:
+        with self.__lock:
+            self.__get(self.__glossaries, glossaryIdentifier, "Glossary")
+            if any(term["glossaryId"] == glossaryIdentifier and term["name"] == name
+                   for term in self.__glossary_terms.values()):
+                raise ConflictException(f"Glossary term {name} already exists")
+            term = {"id": self.__new_id(), "glossaryId": glossaryIdentifier, "name": name, "status": status}
+            self.__set_descriptions(term, shortDescription, longDescription)
+            self.__glossary_terms[term["id"]] = term
+            return dict(term)
+
+    def update_glossary_term(self, identifier: str, glossaryIdentifier: str = None, name: str = None,
+                             status: str = None, shortDescription: str = None, longDescription: str = None,
+                             termRelations: dict = None, **kwargs) -> dict:
+        with self.__lock:
+            term = self.__get(self.__glossary_terms, identifier, "Glossary term")
+            if glossaryIdentifier is not None:
+                self.__get(self.__glossaries, glossaryIdentifier, "Glossary")
+                term["glossaryId"] = glossaryIdentifier
+            if name is not None:
+                term["name"] = name
+            if status is not None:
+                term["status"] = status
+            if termRelations is not None:
+                term["termRelations"] = termRelations
+            self.__set_descriptions(term, shortDescription, longDescription)
+            return dict(term)
+
+    def get_project(self, identifier: str, **kwargs) -> dict:
+        with self.__lock:
+            return dict(self.__get(self.__projects, identifier, "Project"))
+
+    def list_projects(self, userIdentifier: str = None, **kwargs) -> List[dict]:
+        with self.__lock:
+            if userIdentifier is not None:
+                self.__get(self.__user_profiles, userIdentifier, "User")
+                return [dict(self.__projects[project_id]) for project_id, members in self.__memberships.items()
+                        if any(member["memberDetails"]["user"]["userId"] == userIdentifier for member in members)]
+            return [dict(project) for project in self.__projects.values()]
+
+    def list_project_memberships(self, projectIdentifier: str, **kwargs) -> List[dict]:
+        with self.__lock:
+            return copy.deepcopy(self.__get(self.__memberships, projectIdentifier, "Project"))
+
+    def get_user_profile(self, userIdentifier: str, **kwargs) -> dict:
+        with self.__lock:
+            return copy.deepcopy(self.__get(self.__user_profiles, userIdentifier, "User"))
+
+    def search_user_profiles(self, userType: str, searchText: str = None, **kwargs) -> List[dict]:
+        profile_type = "IAM" if userType == "DATAZONE_IAM_USER" else "SSO"
+        with self.__lock:
+            return [copy.deepcopy(profile) for profile in self.__user_profiles.values()
+                    if profile["type"] == profile_type
+                    and self.__matches_text(json.dumps(profile["details"]), searchText)]
+
+    def create_subscription_request(self, subscribedListings: List[dict], subscribedPrincipals: List[dict],
+                                    requestReason: str, **kwargs) -> dict:
+        """
+        Subscription requests are accepted right away, as if the producer project auto-approved them
+        """
+        with self.__lock:
+            listing = self.__get(self.__listings, subscribedListings[0]["identifier"], "Listing")
+            request_id = self.__new_id()
+            request = {"id": request_id, "status": "ACCEPTED", "requestReason": requestReason,
+                       "subscribedListings": [{"id": listing["listingId"], "ownerProjectId": listing["owningProjectId"]}],
+                       "subscribedPrincipals": copy.deepcopy(subscribedPrincipals),
+                       "consumerProjectId": subscribedPrincipals[0]["project"]["identifier"],
+                       "createdAt": self.__now(), "updatedAt": self.__now()}
+            self.__subscription_requests[request_id] = request
+            self.__create_subscription(request)
+            return copy.deepcopy(request)
+
+    def accept_subscription_request(self, identifier: str, decisionComment: str = None, **kwargs) -> dict:
+        with self.__lock:
+            request = self.__get(self.__subscription_requests, identifier, "Subscription request")
+            if request["status"] != "ACCEPTED":
+                request["status"] = "ACCEPTED"
+                request["decisionComment"] = decisionComment
+                request["updatedAt"] = self.__now()
+                self.__create_subscription(request)
+            return copy.deepcopy(request)
+
+    def list_subscription_requests(self, status: str = None, subscribedListingId: str = None,
+                                   owningProjectId: str = None, approverProjectId: str = None,
+                                   **kwargs) -> List[dict]:
+        with self.__lock:
+            return [copy.deepcopy(request) for request in self.__subscription_requests.values()
+                    if (status is None or request["status"] == status)
+                    and (subscribedListingId is None or request["subscribedListings"][0]["id"] == subscribedListingId)
+                    and (owningProjectId is None or request["consumerProjectId"] == owningProjectId)
+                    and (approverProjectId is None
+                         or request["subscribedListings"][0]["ownerProjectId"] == approverProjectId)]
+
+    def list_subscriptions(self, status: str = None, subscriptionRequestIdentifier: str = None,
+                           owningProjectId: str = None, **kwargs) -> List[dict]:
+        with self.__lock:
+            return [copy.deepcopy(subscription) for subscription in self.__subscriptions.values()
+                    if (status is None or subscription["status"] == status)
+                    and (subscriptionRequestIdentifier is None
+                         or subscription["subscriptionRequestId"] == subscriptionRequestIdentifier)
+                    and (owningProjectId is None or subscription["consumerProjectId"] == owningProjectId)]
+
+    def __create_table_asset(self, table_name: str, database: str, num_columns: int,
+                             owning_project_id: str) -> dict:
+        table_arn = f"arn:aws:glue:{self.__region}:{self.__account_id}:table/{database}/{table_name}"
+        glue_table_form = {"region": self.__region, "tableArn": table_arn, "catalogId": self.__account_id,
+                           "databaseName": database, "tableName": table_name,
+                           "columns": [{"columnName": f"column_{j:03d}", "dataType": "string"}
+                                       for j in range(num_columns)]}
+        asset = {"id": self.__new_id(), "name": table_name, "typeIdentifier": GLUE_TABLE_ASSET_TYPE,
+                 "typeRevision": "1", "externalIdentifier": table_arn, "owningProjectId": owning_project_id,
+                 "revision": "1", "glossaryTerms": [],
+                 "formsOutput": [
+                     {"formName": "GlueTableForm", "typeName": GLUE_TABLE_FORM_TYPE, "typeRevision": "1",
+                      "content": json.dumps(glue_table_form)},
+                     {"formName": "AssetCommonDetailsForm", "typeName": ASSET_COMMON_DETAILS_FORM_TYPE,
+                      "typeRevision": "1", "content": json.dumps({})}]}
+        self.__assets[asset["id"]] = asset
+        self.__asset_ids_by_name.setdefault(table_name, []).append(asset["id"])
+        return asset
+
+    def __publish(self, asset: dict):
+        listing_id = self.__new_id()
+        forms = {form["formName"]: json.loads(form["content"]) for form in asset["formsOutput"]}
+        self.__listings[listing_id] = {"listingId": listing_id, "listingRevision": "1", "name": asset["name"],
+                                       "entityId": asset["id"], "entityRevision": asset["revision"],
+                                       "entityType": GLUE_TABLE_ASSET_TYPE,
+                                       "owningProjectId": asset["owningProjectId"],
+                                       "additionalAttributes": {"forms": json.dumps(forms)}}
+        if asset["owningProjectId"] is not None:
+            self.__listing_ids_by_project[asset["owningProjectId"]].append(listing_id)
+
+    def __find_assets_by_name(self, search_text: str | None) -> List[dict]:
+        # Table names are looked up in an index, so that matching stays cheap on large catalogs
+        if search_text in self.__asset_ids_by_name:
+            return [self.__assets[asset_id] for asset_id in self.__asset_ids_by_name[search_text]]
+        return [asset for asset in self.__assets.values() if self.__matches_text(asset["name"], search_text)]
+
+    @staticmethod
+    def __asset_search_item(asset: dict, additional_attributes: List[str] | None) -> dict:
+        item = {"identifier": asset["id"], "name": asset["name"], "typeIdentifier": asset["typeIdentifier"],
+                "typeRevision": asset["typeRevision"], "externalIdentifier": asset["externalIdentifier"],
+                "owningProjectId": asset["owningProjectId"], "glossaryTerms": list(asset["glossaryTerms"])}
+        if additional_attributes and "FORMS" in additional_attributes:
+            item["additionalAttributes"] = {"formsOutput": copy.deepcopy(asset["formsOutput"])}
+        return {"assetItem": item}
+
+    @staticmethod
+    def __form_output(form_input: dict) -> dict:
+        return {"formName": form_input["formName"], "typeName": form_input.get("typeIdentifier"),
+                "typeRevision": form_input.get("typeRevision", "1"), "content": form_input.get("content")}
+
+    def __create_subscription(self, request: dict):
+        subscription_id = self.__new_id()
+        self.__subscriptions[subscription_id] = {
+            "id": subscription_id, "status": "APPROVED", "subscriptionRequestId": request["id"],
+            "subscribedListing": copy.deepcopy(request["subscribedListings"][0]),
+            "consumerProjectId": request["consumerProjectId"], "createdAt": self.__now()}
+
+    @staticmethod
+    def __set_descriptions(term: dict, short_description: str | None, long_description: str | None):
+        if short_description is not None:
+            term["shortDescription"] = short_description
+        if long_description is not None:
+            term["longDescription"] = long_description
+
+    @staticmethod
+    def __get_filter_values(filters: dict | None) -> Dict[str, str]:
+        """
+        :return: Values of the attribute filters of a search, flattened across `and` and `or` clauses
+        """
+        if not filters:
+            return {}
+        if "filter" in filters:
+            return {filters["filter"]["attribute"]: filters["filter"]["value"]}
+        values = {}
+        for clause in filters.get("and", []) + filters.get("or", []):
+            values.update(SyntheticSMUSCatalog.__get_filter_values(clause))
+        return values
+
+    @staticmethod
+    def __matches_text(value: str, search_text: str | None) -> bool:
+        return not search_text or search_text.lower() in value.lower()
+
+    @staticmethod
+    def __get(entities: dict, identifier: str, entity_name: str):
+        if identifier not in entities:
+            raise ResourceNotFoundException(f"{entity_name} {identifier} not found")
+        return entities[identifier]
+
+    def __new_id(self) -> str:
+        return str(uuid.UUID(int=self.__random.getrandbits(128), version=4))
+
+    @staticmethod
+    def __now() -> datetime:
+        return datetime.now(timezone.utc)
+
+
+class DataZoneStubClient:
+    """
+    Drop-in replacement of the boto3 `datazone` client for the operations of SMUSAdapter, answering from a
+    SyntheticSMUSCatalog. List and search operations are paged with `maxResults` and `nextToken` like DataZone.
+    """
+    exceptions = DataZoneStubExceptions
+
+    def __init__(self, catalog: SyntheticSMUSCatalog, operation_faults: Dict[str, RouteFaults] = None,
+                 seed: int = 0):
+        """
+        :param operation_faults: Faults injected per DataZone operation name, e.g. `Search`. Errors are raised as
+        InternalServerException and throttles as ThrottlingException
+        """
+        self.__catalog = catalog
+        self.__operation_faults = operation_faults or {}
+        self.__random = random.Random(seed)
+        self.__random_lock = threading.Lock()
+
+    def search(self, **kwargs) -> dict:
+        return self.__invoke_paged("Search", self.__catalog.search, kwargs, "items")
+
+    def search_listings(self, **kwargs) -> dict:
+        return self.__invoke_paged("SearchListings", self.__catalog.search_listings, kwargs, "items")
+
+    def get_asset(self, **kwargs) -> dict:
+        return self.__invoke("GetAsset", self.__catalog.get_asset, kwargs)
+
+    def create_asset_revision(self, **kwargs) -> dict:
+        return self.__invoke("CreateAssetRevision", self.__catalog.create_asset_revision, kwargs)
+
+    def create_glossary(self, **kwargs) -> dict:
+        return self.__invoke("CreateGlossary", self.__catalog.create_glossary, kwargs)
+
+    def create_glossary_term(self, **kwargs) -> dict:
+        return self.__invoke("CreateGlossaryTerm", self.__catalog.create_glossary_term, kwargs)
+
+    def update_glossary_term(self, **kwargs) -> dict:
+        return self.__invoke("UpdateGlossaryTerm", self.__catalog.update_glossary_term, kwargs)
+
+    def get_project(self, **kwargs) -> dict:
+        return self.__invoke("GetProject", self.__catalog.get_project, kwargs)
+
+    def list_projects(self, **kwargs) -> dict:
+        return self.__invoke_paged("ListProjects", self.__catalog.list_projects, kwargs, "items")
+
+    def list_project_memberships(self, **kwargs) -> dict:
+        return self.__invoke_paged("ListProjectMemberships", self.__catalog.list_project_memberships, kwargs,
+                                   "members")
+
+    def get_user_profile(self, **kwargs) -> dict:
+        return self.__invoke("GetUserProfile", self.__catalog.get_user_profile, kwargs)
+
+    def search_user_profiles(self, **kwargs) -> dict:
+        return self.__invoke_paged("SearchUserProfiles", self.__catalog.search_user_profiles, kwargs, "items")
+
+    def create_subscription_request(self, **kwargs) -> dict:
+        return self.__invoke("CreateSubscriptionRequest", self.__catalog.create_subscription_request, kwargs)
+
+    def accept_subscription_request(self, **kwargs) -> dict:
+        return self.__invoke("AcceptSubscriptionRequest", self.__catalog.accept_subscription_request, kwargs)
+
+    def list_subscription_requests(self, **kwargs) -> dict:
+        return self.__invoke_paged("ListSubscriptionRequests", self.__catalog.list_subscription_requests, kwargs,
+                                   "items")
+
+    def list_subscriptions(self, **kwargs) -> dict:
+        return self.__invoke_paged("ListSubscriptions", self.__catalog.list_subscriptions, kwargs, "items")
+
+    def __invoke_paged(self, operation_name: str, handler: Callable[..., List[dict]], kwargs: dict,
+                       items_key: str) -> dict:
+        max_results = kwargs.pop("maxResults", DEFAULT_MAX_RESULTS)
+        start = int(kwargs.pop("nextToken", None) or 0)
+        items = self.__invoke(operation_name, handler, kwargs, with_metadata=False)
+        page, next_token = self.__page(items, start, max_results)
+        response = {items_key: page}
+        if next_token is not None:
+            response["nextToken"] = next_token
+        return self.__with_metadata(response)
+
+    def __invoke(self, operation_name: str, handler: Callable, kwargs: dict, with_metadata: bool = True):
+        kwargs.pop("domainIdentifier", None)
+        faults = self.__operation_faults.get(operation_name)
+        if faults:
+            time.sleep(faults.latency_in_seconds)
+            chance = self.__next_random()
+            if chance < faults.throttle_rate:
+                raise ThrottlingException("Rate exceeded", operation_name)
+            if chance < faults.throttle_rate + faults.error_rate:
+                raise InternalServerException("Injected error", operation_name)
+
+        try:
+            response = handler(**kwargs)
+        except DataZoneStubClientError as e:
+            raise type(e)(e.message, operation_name) from None
+        return self.__with_metadata(response) if with_metadata else response
+
+    @staticmethod
+    def __page(items: List[dict], start: int, max_results: int) -> Tuple[List[dict], str | None]:
+        end = start + max_results
+        return items[start:end], str(end) if end < len(items) else None
+
+    @staticmethod
+    def __with_metadata(response: dict) -> dict:
+        response["ResponseMetadata"] = {"HTTPStatusCode": 200, "RetryAttempts": 0}
+        return response
+
+    def __next_random(self) -> float:
+        with self.__random_lock:
+            return self.__random.random()
@@ -0,0 +1,79 @@
+"""
+Unit tests for lambda/adapter/AsyncCollibraAdapter.py
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from adapter.AsyncCollibraAdapter import AsyncCollibraAdapter
+
+
+@pytest.mark.unit
+class TestAsyncCollibraAdapter:
+    """Tests for AsyncCollibraAdapter class"""
+
+    @pytest.fixture
+    def mock_collibra_adapter(self):
+        """Mock synchronous Collibra adapter"""
+        return MagicMock()
+
+    def test_get_tables_by_names_delegates_to_collibra_adapter(self, mock_collibra_adapter):
+        """Test coroutine methods return the result of the wrapped adapter call"""
+        mock_collibra_adapter.get_tables_by_names.return_value = {'customers': {'id': 'table-123'}}
+        adapter = AsyncCollibraAdapter(mock_collibra_adapter)
+
+        result = asyncio.run(adapter.get_tables_by_names(['customers']))
+
+        assert result == {'customers': {'id': 'table-123'}}
+        mock_collibra_adapter.get_tables_by_names.assert_called_once_with(['customers'])
+
+    def test_get_related_asset_ids_propagates_exceptions(self, mock_collibra_adapter):
+        """Test exceptions of the wrapped adapter call are raised by the coroutine"""
+        mock_collibra_adapter.get_related_asset_ids.side_effect = Exception("Failed to fetch relations")
+        adapter = AsyncCollibraAdapter(mock_collibra_adapter)
+
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(adapter.get_related_asset_ids('source-1', ['target-1'], 'relation-type-1'))
+
+        assert 'Failed to fetch relations' in str(exc_info.value)
+
+    def test_calls_run_concurrently_up_to_max_concurrency(self, mock_collibra_adapter):
+        """Test no more than max_concurrency calls are in flight at once"""
+        lock = threading.Lock()
+        in_flight = {'current': 0, 'max': 0}
+
+        def get_tables_by_names(table_names):
+            with lock:
+                in_flight['current'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['current'])
+            time.sleep(0.05)
+            with lock:
+                in_flight['current'] -= 1
+            return {table_names[0]: {'id': table_names[0]}}
+
+        mock_collibra_adapter.get_tables_by_names.side_effect = get_tables_by_names
+        adapter = AsyncCollibraAdapter(mock_collibra_adapter, max_concurrency=2)
+
+        async def get_tables():
+            return await asyncio.gather(*[adapter.get_tables_by_names([f"table-{i}"]) for i in range(6)])
+
+        results = asyncio.run(get_tables())
+
+        assert [list(result) for result in results] == [[f"table-{i}"] for i in range(6)]
+        assert in_flight['max'] == 2
+
+    def test_adapter_is_reusable_across_event_loops(self, mock_collibra_adapter):
+        """Test the concurrency limit isn't bound to the event loop of the first call"""
+        mock_collibra_adapter.get_tables_by_names.return_value = {}
+        adapter = AsyncCollibraAdapter(mock_collibra_adapter, max_concurrency=1)
+
+        async def get_tables():
+            return await asyncio.gather(*[adapter.get_tables_by_names([f"table-{i}"]) for i in range(3)])
+
+        asyncio.run(get_tables())
+        asyncio.run(get_tables())
+
+        assert mock_collibra_adapter.get_tables_by_names.call_count == 6
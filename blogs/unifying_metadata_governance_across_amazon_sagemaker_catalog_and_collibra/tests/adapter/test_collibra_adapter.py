@@ -6,7 +6,9 @@ from unittest.mock import MagicMock, patch, Mock
 import json
 
 from adapter.CollibraAdapter import CollibraAdapter
+from business.CollibraCredentialsProvider import CollibraCredentialsProvider
 from model.CollibraAssetType import CollibraAssetType
+from utils.collibra_constants import COLLIBRA_MAX_LOOKUP_BATCH_SIZE
 from utils.env_utils import COLLIBRA_SUBSCRIPTION_REQUEST_GRANTED_STATUS_ID
 
 
@@ -14,6 +16,13 @@ from utils.env_utils import COLLIBRA_SUBSCRIPTION_REQUEST_GRANTED_STATUS_ID
 class TestCollibraAdapter:
     """Tests for CollibraAdapter class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_credentials(self):
+        """Clear the process-wide Collibra credentials cache around each test"""
+        CollibraCredentialsProvider.reset()
+        yield
+        CollibraCredentialsProvider.reset()
+
     @pytest.fixture
     def mock_secrets_client(self):
         """Mock AWS Secrets Manager client"""
@@ -30,13 +39,13 @@ class TestCollibraAdapter:
     @pytest.fixture
     def adapter(self, mock_logger, mock_secrets_client):
         """Create CollibraAdapter instance with mocked dependencies"""
-        with patch('adapter.CollibraAdapter.AWSClientFactory.create', return_value=mock_secrets_client):
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
             return CollibraAdapter(mock_logger)
 
     def test_init_creates_adapter_successfully(self, mock_logger, mock_secrets_client):
         """Test initialization creates adapter and can make API calls"""
-        with patch('adapter.CollibraAdapter.AWSClientFactory.create', return_value=mock_secrets_client):
-            with patch('adapter.CollibraAdapter.requests.post') as mock_post:
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            with patch('requests.Session.post') as mock_post:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {'data': {'assets': []}}
@@ -49,7 +58,7 @@ class TestCollibraAdapter:
                 assert result == []
                 assert mock_post.called
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_business_term_metadata_success(self, mock_post, adapter, mock_logger):
         """Test get_business_term_metadata returns data on success"""
         mock_response = Mock()
@@ -67,7 +76,7 @@ class TestCollibraAdapter:
         assert result[0]['id'] == '1'
         mock_logger.info.assert_called()
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_business_term_metadata_with_cursor(self, mock_post, adapter):
         """Test get_business_term_metadata with last_seen_id returns correct data"""
         mock_response = Mock()
@@ -85,7 +94,7 @@ class TestCollibraAdapter:
         assert len(result) == 1
         assert result[0]['id'] == 'term-after-cursor'
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_business_term_metadata_failure(self, mock_post, adapter):
         """Test get_business_term_metadata raises exception on failure"""
         mock_response = Mock()
@@ -98,7 +107,7 @@ class TestCollibraAdapter:
         
         assert 'Failed to fetch BusinessTerm data from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_tables_success(self, mock_post, adapter, mock_logger):
         """Test get_tables returns table data on success"""
         mock_response = Mock()
@@ -115,24 +124,48 @@ class TestCollibraAdapter:
         assert len(result) == 1
         assert result[0]['id'] == 't1'
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_business_term_hierarchy_success(self, mock_post, adapter, mock_logger):
-        """Test get_business_term_hierarchy returns hierarchy data"""
+        """Test get_business_term_hierarchy yields child and parent term name pairs"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': '1', 'parent': '2'}]
-            }
-        }
+        mock_response.json.side_effect = [
+            {'data': {'assets': [{
+                'id': '1',
+                'displayName': 'Customer ID',
+                'incomingRelations': [{'source': {'displayName': 'Identifier'}}, {'target': {}}]
+            }]}},
+            {'data': {'assets': []}}
+        ]
         mock_post.return_value = mock_response
         
-        result = adapter.get_business_term_hierarchy()
+        result = list(adapter.get_business_term_hierarchy())
         
-        assert len(result) == 1
-        mock_logger.info.assert_called_with('Successfully fetched business term hierarchy from Collibra')
+        assert result == [('Customer ID', 'Identifier')]
+        mock_logger.info.assert_called_with('Successfully fetched business term hierarchy of 1 terms from Collibra')
+
+    @patch('requests.Session.post')
+    def test_get_business_term_hierarchy_pages_with_cursor(self, mock_post, adapter):
+        """Test get_business_term_hierarchy follows the last seen id cursor across pages"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.side_effect = [
+            {'data': {'assets': [{'id': '1', 'displayName': 'A', 'incomingRelations': [{'source': {'displayName': 'P'}}]}]}},
+            {'data': {'assets': [{'id': '2', 'displayName': 'B', 'incomingRelations': [{'source': {'displayName': 'P'}}]}]}},
+            {'data': {'assets': []}}
+        ]
+        mock_post.return_value = mock_response
+        
+        hierarchy = adapter.get_business_term_hierarchy()
+        
+        assert next(hierarchy) == ('A', 'P')
+        assert mock_post.call_count == 1
+        assert list(hierarchy) == [('B', 'P')]
+        assert mock_post.call_count == 3
+        assert mock_post.call_args_list[1][1]['json']['variables'] == {'lastSeenId': '1'}
+        assert mock_post.call_args_list[2][1]['json']['variables'] == {'lastSeenId': '2'}
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_business_term_hierarchy_failure(self, mock_post, adapter):
         """Test get_business_term_hierarchy raises exception on failure"""
         mock_response = Mock()
@@ -141,132 +174,125 @@ class TestCollibraAdapter:
         mock_post.return_value = mock_response
         
         with pytest.raises(Exception) as exc_info:
-            adapter.get_business_term_hierarchy()
+            list(adapter.get_business_term_hierarchy())
         
         assert 'Failed to fetch business term hierarchy from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_success(self, mock_post, adapter, mock_logger):
-        """Test get_table returns single table"""
+    @patch('requests.Session.post')
+    def test_get_tables_details_fans_out_results_by_id(self, mock_post, adapter):
+        """Test get_tables_details fetches several tables in one call and keys them by id"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
             'data': {
-                'assets': [{'id': 'table-123', 'name': 'MyTable'}]
+                'table': [{'id': 't1', 'displayName': 'customers'}, {'id': 't2', 'displayName': 'orders'}],
+                'businessTerms': [{'id': 't2', 'incomingRelations': []}, {'id': 't1', 'incomingRelations': []}],
+                'piiColumns': [{'id': 't1', 'incomingRelations': []}, {'id': 't2', 'incomingRelations': []}]
             }
         }
         mock_post.return_value = mock_response
-        
-        result = adapter.get_table('table-123')
-        
-        assert result['id'] == 'table-123'
-        mock_logger.info.assert_called()
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_raises_error_when_multiple_results(self, mock_post, adapter):
-        """Test get_table raises exception when multiple tables returned"""
+        result = adapter.get_tables_details(['t1', 't2', 't3'])
+
+        assert set(result.keys()) == {'t1', 't2'}
+        assert result['t2'].table['displayName'] == 'orders'
+        assert result['t2'].business_terms['id'] == 't2'
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs['json']['variables'] == {'assetIds': ['t1', 't2', 't3']}
+
+    @patch('requests.Session.post')
+    def test_get_tables_details_failure(self, mock_post, adapter):
+        """Test get_tables_details raises exception on API failure"""
         mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': '1'}, {'id': '2'}]
-            }
-        }
+        mock_response.status_code = 500
+        mock_response.text = 'Internal Server Error'
         mock_post.return_value = mock_response
-        
+
         with pytest.raises(Exception) as exc_info:
-            adapter.get_table('table-123')
-        
-        assert 'Failed to fetch table with id table-123' in str(exc_info.value)
+            adapter.get_tables_details(['t1'])
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_by_name_success(self, mock_post, adapter, mock_logger):
-        """Test get_table_by_name returns table by name"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 't1', 'name': 'customers'}]
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        result = adapter.get_table_by_name('customers')
-        
-        assert result['name'] == 'customers'
-        mock_logger.info.assert_called()
+        assert 'Failed to fetch details of tables from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_by_name_raises_error_when_not_found(self, mock_post, adapter):
-        """Test get_table_by_name raises exception when no table found"""
+    @patch('requests.Session.post')
+    def test_get_tables_details_limits_query_to_batch_size(self, mock_post, adapter):
+        """Test get_tables_details queries a whole batch and rejects larger batches"""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': []
-            }
-        }
+        mock_response.json.return_value = {'data': {'table': [], 'businessTerms': [], 'piiColumns': []}}
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_table_by_name('nonexistent')
-        
-        assert 'No table found with name nonexistent' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_business_terms_success(self, mock_post, adapter, mock_logger):
-        """Test get_table_business_terms returns business terms"""
+        adapter.get_tables_details(['t1'])
+
+        assert mock_post.call_args.kwargs['json']['query'].count(f'limit: {COLLIBRA_MAX_LOOKUP_BATCH_SIZE}\n') == 3
+        with pytest.raises(ValueError):
+            adapter.get_tables_details([f't{i}' for i in range(COLLIBRA_MAX_LOOKUP_BATCH_SIZE + 1)])
+
+    @patch('requests.Session.post')
+    def test_get_tables_by_names_keeps_first_table_per_name(self, mock_post, adapter):
+        """Test get_tables_by_names returns the first table found for each name"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
             'data': {
-                'assets': [{'id': 't1', 'terms': ['term1', 'term2']}]
+                'assets': [{'id': 't1', 'displayName': 'customers'},
+                           {'id': 't2', 'displayName': 'customers'},
+                           {'id': 't3', 'displayName': 'orders'}]
             }
         }
         mock_post.return_value = mock_response
-        
-        result = adapter.get_table_business_terms('table-123')
-        
-        assert result['id'] == 't1'
-        mock_logger.info.assert_called()
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_pii_columns_success(self, mock_post, adapter, mock_logger):
-        """Test get_pii_columns returns PII column data"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 't1', 'pii_columns': ['ssn', 'email']}]
-            }
-        }
+        result = adapter.get_tables_by_names(['customers', 'orders', 'missing'])
+
+        assert result == {'customers': {'id': 't1', 'displayName': 'customers'},
+                          'orders': {'id': 't3', 'displayName': 'orders'}}
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.kwargs['json']['variables'] == {'tableNames': ['customers', 'orders', 'missing']}
+        assert f'limit: {COLLIBRA_MAX_LOOKUP_BATCH_SIZE}' in mock_post.call_args.kwargs['json']['query']
+
+    @patch('requests.Session.post')
+    def test_get_tables_by_names_pages_past_duplicate_names(self, mock_post, adapter):
+        """Test get_tables_by_names fetches the next page when duplicates of one name fill the first page"""
+        duplicates = [{'id': f't{i:03}', 'displayName': 'customers'} for i in range(COLLIBRA_MAX_LOOKUP_BATCH_SIZE)]
+        first_page = Mock(status_code=200)
+        first_page.json.return_value = {'data': {'assets': duplicates}}
+        second_page = Mock(status_code=200)
+        second_page.json.return_value = {'data': {'assets': [{'id': 'u1', 'displayName': 'orders'}]}}
+        mock_post.side_effect = [first_page, second_page]
+
+        result = adapter.get_tables_by_names(['customers', 'orders'])
+
+        assert result == {'customers': duplicates[0], 'orders': {'id': 'u1', 'displayName': 'orders'}}
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.kwargs['json']['variables'] == {'tableNames': ['customers', 'orders'],
+                                                                    'lastSeenId': duplicates[-1]['id']}
+
+    @patch('requests.Session.post')
+    def test_get_tables_by_names_stops_once_all_names_are_found(self, mock_post, adapter):
+        """Test get_tables_by_names doesn't fetch another page once every name has a table"""
+        tables = [{'id': f't{i:03}', 'displayName': f'table_{i}'} for i in range(COLLIBRA_MAX_LOOKUP_BATCH_SIZE)]
+        mock_response = Mock(status_code=200)
+        mock_response.json.return_value = {'data': {'assets': tables}}
         mock_post.return_value = mock_response
-        
-        result = adapter.get_pii_columns('table-123')
-        
-        assert result['id'] == 't1'
-        mock_logger.info.assert_called()
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_pii_columns_raises_error_when_multiple_results(self, mock_post, adapter):
-        """Test get_pii_columns raises exception when multiple results"""
+        result = adapter.get_tables_by_names([table['displayName'] for table in tables])
+
+        assert len(result) == COLLIBRA_MAX_LOOKUP_BATCH_SIZE
+        assert mock_post.call_count == 1
+
+    @patch('requests.Session.post')
+    def test_get_tables_by_names_failure(self, mock_post, adapter):
+        """Test get_tables_by_names raises exception on API failure"""
         mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': '1'}, {'id': '2'}]
-            }
-        }
+        mock_response.status_code = 500
+        mock_response.text = 'Internal Server Error'
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_pii_columns('table-123')
-        
-        assert 'Failed to fetch PII columns for table with id table-123' in str(exc_info.value)
 
+        with pytest.raises(Exception) as exc_info:
+            adapter.get_tables_by_names(['customers'])
 
+        assert 'Failed to fetch tables by name from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_start_subscription_request_creation_workflow_success(self, mock_post, adapter):
         """Test start_subscription_request_creation_workflow creates workflow"""
         mock_response = Mock()
@@ -280,7 +306,7 @@ class TestCollibraAdapter:
         # Verify REST API was called
         assert 'workflowInstances' in mock_post.call_args[0][0]
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_start_subscription_request_creation_workflow_failure(self, mock_post, adapter):
         """Test start_subscription_request_creation_workflow raises exception on failure"""
         mock_response = Mock()
@@ -293,9 +319,9 @@ class TestCollibraAdapter:
         
         assert 'Failed to start subscription workflow' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_subscription_requests_by_status_success(self, mock_post, adapter, mock_logger):
-        """Test get_subscription_requests_by_status returns requests"""
+        """Test get_subscription_requests_by_status yields requests until an empty page"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {
@@ -303,49 +329,44 @@ class TestCollibraAdapter:
                 'assets': [{'id': 'req-1', 'status': 'Approved'}]
             }
         }
-        mock_post.return_value = mock_response
+        empty_response = Mock()
+        empty_response.status_code = 200
+        empty_response.json.return_value = {'data': {'assets': []}}
+        mock_post.side_effect = [mock_response, empty_response]
         
-        result = adapter.get_subscription_requests_by_status('Approved')
+        result = list(adapter.get_subscription_requests_by_status('Approved'))
         
         assert len(result) == 1
         assert result[0]['status'] == 'Approved'
-        mock_logger.info.assert_called()
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_or_create_aws_project_returns_existing(self, mock_post, adapter):
-        """Test get_or_create_aws_project returns existing project"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 'proj-123', 'name': 'MyProject'}]
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        result = adapter.get_or_create_aws_project('MyProject', 'smus-id-123')
-        
-        assert result['id'] == 'proj-123'
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_project_success(self, mock_post, adapter, mock_logger):
-        """Test get_aws_project returns project"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 'proj-123', 'name': 'MyProject'}]
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        result = adapter.get_aws_project('MyProject')
-        
-        assert len(result) == 1
-        assert result[0]['id'] == 'proj-123'
-        mock_logger.info.assert_called()
-
-    @patch('adapter.CollibraAdapter.requests.post')
+        mock_logger.info.assert_any_call('Successfully fetched 1 Approved subscription requests from Collibra')
+
+    @patch('requests.Session.post')
+    def test_get_subscription_requests_by_status_pages_with_cursor(self, mock_post, adapter):
+        """Test get_subscription_requests_by_status fetches each following page after the last seen id"""
+        first_page = Mock()
+        first_page.status_code = 200
+        first_page.json.return_value = {'data': {'assets': [{'id': 'req-1'}, {'id': 'req-2'}]}}
+        second_page = Mock()
+        second_page.status_code = 200
+        second_page.json.return_value = {'data': {'assets': [{'id': 'req-3'}]}}
+        empty_page = Mock()
+        empty_page.status_code = 200
+        empty_page.json.return_value = {'data': {'assets': []}}
+        mock_post.side_effect = [first_page, second_page, empty_page]
+
+        requests = adapter.get_subscription_requests_by_status('Approved')
+
+        assert next(requests)['id'] == 'req-1'
+        assert mock_post.call_count == 1
+        assert [request['id'] for request in requests] == ['req-2', 'req-3']
+        payloads = [call.kwargs['json'] for call in mock_post.call_args_list]
+        assert payloads[0]['variables'] == {'status': 'Approved'}
+        assert '$lastSeenId' not in payloads[0]['query']
+        assert payloads[1]['variables'] == {'status': 'Approved', 'lastSeenId': 'req-2'}
+        assert 'id: { gt: $lastSeenId }' in payloads[1]['query']
+        assert payloads[2]['variables'] == {'status': 'Approved', 'lastSeenId': 'req-3'}
+
+    @patch('requests.Session.post')
     def test_create_aws_project_success(self, mock_post, adapter):
         """Test create_aws_project creates new project"""
         mock_response = Mock()
@@ -357,7 +378,7 @@ class TestCollibraAdapter:
         
         assert result['id'] == 'proj-new'
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_create_aws_project_failure(self, mock_post, adapter):
         """Test create_aws_project raises exception on failure"""
         mock_response = Mock()
@@ -369,7 +390,7 @@ class TestCollibraAdapter:
         
         assert 'Failed to create project with name NewProject' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.put')
+    @patch('requests.Session.put')
     def test_add_aws_project_attributes_success(self, mock_put, adapter, mock_logger):
         """Test add_aws_project_attributes adds attributes"""
         mock_response = Mock()
@@ -382,7 +403,7 @@ class TestCollibraAdapter:
         assert result['success'] is True
         mock_logger.info.assert_called()
 
-    @patch('adapter.CollibraAdapter.requests.put')
+    @patch('requests.Session.put')
     def test_add_aws_project_attributes_failure(self, mock_put, adapter):
         """Test add_aws_project_attributes raises exception on failure"""
         mock_response = Mock()
@@ -394,7 +415,7 @@ class TestCollibraAdapter:
         
         assert 'Failed to add project attribute' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_create_relation_success(self, mock_post, adapter):
         """Test create_relation creates relation between assets"""
         mock_response = Mock()
@@ -406,7 +427,7 @@ class TestCollibraAdapter:
         
         assert result['id'] == 'rel-123'
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_create_relation_failure(self, mock_post, adapter):
         """Test create_relation raises exception on failure"""
         mock_response = Mock()
@@ -419,122 +440,7 @@ class TestCollibraAdapter:
         
         assert 'Failed to create collibra asset relation' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_or_create_aws_user_returns_existing(self, mock_post, adapter):
-        """Test get_or_create_aws_user returns existing user"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 'user-123', 'name': 'testuser'}]
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        result = adapter.get_or_create_aws_user('testuser')
-        
-        assert result['id'] == 'user-123'
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_or_create_aws_user_creates_new_when_not_found(self, mock_post, adapter, mock_logger):
-        """Test get_or_create_aws_user creates new user when not found"""
-        # First call fails (user not found), second call succeeds (user created)
-        mock_response_get = Mock()
-        mock_response_get.status_code = 200
-        mock_response_get.json.return_value = {'data': {'assets': []}}
-        
-        mock_response_create = Mock()
-        mock_response_create.status_code = 201
-        mock_response_create.json.return_value = {'id': 'user-new', 'name': 'newuser'}
-        
-        mock_post.side_effect = [mock_response_get, mock_response_create]
-        
-        result = adapter.get_or_create_aws_user('newuser')
-        
-        assert result['id'] == 'user-new'
-        mock_logger.info.assert_called()
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_user_success(self, mock_post, adapter, mock_logger):
-        """Test get_aws_user returns user"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [{'id': 'user-123', 'name': 'testuser'}]
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        result = adapter.get_aws_user('testuser')
-        
-        assert result['id'] == 'user-123'
-        mock_logger.info.assert_called()
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_user_raises_error_when_not_found(self, mock_post, adapter):
-        """Test get_aws_user raises exception when user not found"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {'data': {'assets': []}}
-        mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_aws_user('nonexistent')
-        
-        assert 'Failed to fetch user with username nonexistent' in str(exc_info.value)
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_create_aws_user_success(self, mock_post, adapter, mock_logger):
-        """Test create_aws_user creates new user"""
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {'id': 'user-new', 'name': 'newuser'}
-        mock_post.return_value = mock_response
-        
-        result = adapter.create_aws_user('newuser')
-        
-        assert result['id'] == 'user-new'
-        mock_logger.info.assert_called()
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_create_aws_user_failure(self, mock_post, adapter):
-        """Test create_aws_user raises exception on failure"""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = 'Bad Request'
-        mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.create_aws_user('newuser')
-        
-        assert 'Failed to create user newuser' in str(exc_info.value)
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_add_aws_user_attributes_success(self, mock_post, adapter):
-        """Test add_aws_user_attributes adds attributes"""
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = {'success': True}
-        mock_post.return_value = mock_response
-        
-        result = adapter.add_aws_user_attributes('user-123', 'project-name')
-        
-        assert result['success'] is True
-
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_add_aws_user_attributes_failure(self, mock_post, adapter):
-        """Test add_aws_user_attributes raises exception on failure"""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.add_aws_user_attributes('user-123', 'project-name')
-        
-        assert 'Failed to add attributes for user user-123' in str(exc_info.value)
-
-    @patch('adapter.CollibraAdapter.requests.patch')
+    @patch('requests.Session.patch')
     def test_update_subscription_request_status_success(self, mock_patch, adapter):
         """Test update_subscription_request_status updates status"""
         mock_response = Mock()
@@ -546,7 +452,7 @@ class TestCollibraAdapter:
         
         assert result is not None
 
-    @patch('adapter.CollibraAdapter.requests.patch')
+    @patch('requests.Session.patch')
     def test_update_subscription_request_status_failure(self, mock_patch, adapter):
         """Test update_subscription_request_status raises exception on failure"""
         mock_response = Mock()
@@ -560,7 +466,7 @@ class TestCollibraAdapter:
 
     # Additional exception tests for comprehensive coverage
 
-    @patch('adapter.CollibraAdapter.requests.post')
+    @patch('requests.Session.post')
     def test_get_tables_failure(self, mock_post, adapter):
         """Test get_tables raises exception on API failure"""
         mock_response = Mock()
@@ -573,139 +479,368 @@ class TestCollibraAdapter:
         
         assert 'Failed to fetch Table data from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_failure(self, mock_post, adapter):
-        """Test get_table raises exception on API failure"""
+    @patch('requests.Session.post')
+    def test_get_subscription_requests_by_status_failure(self, mock_post, adapter):
+        """Test get_subscription_requests_by_status raises exception on API failure"""
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = 'Internal Server Error'
         mock_post.return_value = mock_response
         
         with pytest.raises(Exception) as exc_info:
-            adapter.get_table('table-123')
+            list(adapter.get_subscription_requests_by_status('PENDING'))
         
-        assert 'Failed to fetch table with id table-123 from Collibra' in str(exc_info.value)
+        assert 'Failed to fetch PENDING subscription requests from Collibra' in str(exc_info.value)
+
+    @patch('requests.Session.post')
+    def test_throttled_request_is_retried_and_lowers_rate(self, mock_post, adapter):
+        """Test throttled Collibra responses are retried after notifying the shared rate limiter"""
+        throttled_response = Mock()
+        throttled_response.status_code = 429
+        throttled_response.headers = {'Retry-After': '2'}
+        ok_response = Mock()
+        ok_response.status_code = 201
+        ok_response.json.return_value = {'id': 'rel-123'}
+        mock_post.side_effect = [throttled_response, ok_response]
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            mock_rate_limiter.rate = 10.0
+            result = adapter.create_relation('source-1', 'target-1', 'relation-type-1')
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_raises_error_when_no_results(self, mock_post, adapter):
-        """Test get_table raises exception when no table found"""
+        assert result['id'] == 'rel-123'
+        assert mock_post.call_count == 2
+        assert mock_rate_limiter.acquire.call_count == 2
+        mock_rate_limiter.on_throttle.assert_called_once_with(2.0)
+        mock_rate_limiter.on_success.assert_called_once()
+
+    @patch('requests.Session.post')
+    def test_throttled_request_fails_after_max_retries(self, mock_post, adapter):
+        """Test requests still throttled after all retries surface as failures"""
+        throttled_response = Mock()
+        throttled_response.status_code = 503
+        throttled_response.headers = {}
+        throttled_response.text = 'Service Unavailable'
+        mock_post.return_value = throttled_response
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            mock_rate_limiter.rate = 10.0
+            with pytest.raises(Exception) as exc_info:
+                list(adapter.get_business_term_hierarchy())
+
+        assert 'Failed to fetch business term hierarchy' in str(exc_info.value)
+        assert mock_post.call_count == CollibraAdapter.MAX_THROTTLED_RETRIES + 1
+        mock_rate_limiter.on_throttle.assert_called_with(None)
+
+    @patch('requests.Session.post')
+    def test_unavailable_write_is_not_retried(self, mock_post, adapter):
+        """Test a 503 for a write that is not idempotent lowers the rate but is not retried"""
+        unavailable_response = Mock()
+        unavailable_response.status_code = 503
+        unavailable_response.headers = {}
+        unavailable_response.text = 'Service Unavailable'
+        mock_post.return_value = unavailable_response
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            mock_rate_limiter.rate = 10.0
+            with pytest.raises(Exception):
+                adapter.start_subscription_request_creation_workflow('asset-1', 'consumer-project')
+
+        assert mock_post.call_count == 1
+        mock_rate_limiter.on_throttle.assert_called_once_with(None)
+
+    @patch('requests.Session.put')
+    def test_unavailable_put_is_retried(self, mock_put, adapter):
+        """Test a 503 for an idempotent PUT is retried"""
+        unavailable_response = Mock()
+        unavailable_response.status_code = 503
+        unavailable_response.headers = {}
+        ok_response = Mock()
+        ok_response.status_code = 200
+        ok_response.json.return_value = [{'id': 'attr-1'}]
+        mock_put.side_effect = [unavailable_response, ok_response]
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            mock_rate_limiter.rate = 10.0
+            assert adapter.add_aws_project_attributes('collibra-proj-1', 'smus-proj-1') == [{'id': 'attr-1'}]
+
+        assert mock_put.call_count == 2
+
+    @patch('requests.Session.patch')
+    def test_unavailable_subscription_request_status_update_is_retried(self, mock_patch, adapter):
+        """Test a 503 for the idempotent status PATCH is retried"""
+        unavailable_response = Mock()
+        unavailable_response.status_code = 503
+        unavailable_response.headers = {}
+        ok_response = Mock()
+        ok_response.status_code = 200
+        ok_response.json.return_value = {'id': 'req-123'}
+        mock_patch.side_effect = [unavailable_response, ok_response]
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            mock_rate_limiter.rate = 10.0
+            result = adapter.update_subscription_request_status('req-123',
+                                                                COLLIBRA_SUBSCRIPTION_REQUEST_GRANTED_STATUS_ID)
+
+        assert result == {'id': 'req-123'}
+        assert mock_patch.call_count == 2
+
+    @pytest.mark.parametrize('status_code', [400, 404, 500])
+    @patch('requests.Session.post')
+    def test_error_response_does_not_raise_rate(self, mock_post, status_code, adapter):
+        """Test error responses which are not throttles neither raise nor lower the shared request rate"""
+        error_response = Mock()
+        error_response.status_code = status_code
+        error_response.text = 'Error'
+        mock_post.return_value = error_response
+
+        with patch.object(CollibraAdapter, '_CollibraAdapter__rate_limiter') as mock_rate_limiter:
+            with pytest.raises(Exception):
+                adapter.create_relation('source-1', 'target-1', 'relation-type-1')
+
+        assert mock_post.call_count == 1
+        mock_rate_limiter.on_success.assert_not_called()
+        mock_rate_limiter.on_throttle.assert_not_called()
+
+    @patch('requests.Session.post')
+    def test_get_tables_uses_configured_page_size_and_cursor(self, mock_post, adapter):
+        """Test get_tables builds the paged query from the configured page size and last seen id"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'data': {'assets': []}}
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_table('table-123')
-        
-        assert 'Failed to fetch table with id table-123 from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_by_name_failure(self, mock_post, adapter):
-        """Test get_table_by_name raises exception on API failure"""
+        adapter.get_tables('table-10')
+
+        payload = mock_post.call_args[1]['json']
+        assert payload['variables'] == {'lastSeenId': 'table-10'}
+        assert 'limit: 10' in payload['query']
+        assert 'id: { gt: $lastSeenId }' in payload['query']
+
+    @patch('requests.Session.post')
+    def test_get_business_term_metadata_filters_by_modified_after(self, mock_post, adapter):
+        """Test get_business_term_metadata only queries terms modified after the given timestamp"""
         mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = 'Internal Server Error'
+        mock_response.status_code = 200
+        mock_response.json.return_value = {'data': {'assets': []}}
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_table_by_name('customers')
-        
-        assert 'Failed to fetch table with name customers from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_table_business_terms_failure(self, mock_post, adapter):
-        """Test get_table_business_terms raises exception on API failure"""
+        adapter.get_business_term_metadata(None, modified_after='2026-01-01T00:00:00+00:00')
+
+        payload = mock_post.call_args[1]['json']
+        assert payload['variables'] == {'modifiedAfter': '2026-01-01T00:00:00+00:00'}
+        assert '$modifiedAfter: DateTime!' in payload['query']
+        assert 'modifiedOn: { gt: $modifiedAfter }' in payload['query']
+
+    @patch('requests.Session.post')
+    def test_requests_are_sent_with_cached_authorization_header(self, mock_post, adapter):
+        """Test every Collibra request carries the Basic authorization header built from the cached secret"""
         mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = 'Internal Server Error'
+        mock_response.status_code = 201
+        mock_response.json.return_value = {'id': 'rel-123'}
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_table_business_terms('table-123')
-        
-        assert 'Failed to fetch business terms of table with id table-123 from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_pii_columns_failure(self, mock_post, adapter):
-        """Test get_pii_columns raises exception on API failure"""
+        adapter.create_relation('source-1', 'target-1', 'relation-type-1')
+
+        headers = mock_post.call_args.kwargs['headers']
+        assert headers['Authorization'] == 'Basic dGVzdF91c2VyOnRlc3RfcGFzcw=='
+        assert 'auth' not in mock_post.call_args.kwargs
+
+    def test_adapters_share_cached_credentials(self, mock_logger, mock_secrets_client):
+        """Test creating several adapters reads the Collibra secret only once"""
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            CollibraAdapter(mock_logger)
+            CollibraAdapter(mock_logger)
+
+        mock_secrets_client.get_secret_value.assert_called_once()
+
+    @patch('requests.Session.post')
+    def test_unauthorized_request_refreshes_credentials_and_retries_once(self, mock_post, adapter, mock_secrets_client):
+        """Test a 401 response reloads the Collibra secret and retries the request a single time"""
+        unauthorized_response = Mock()
+        unauthorized_response.status_code = 401
+        unauthorized_response.text = 'Unauthorized'
+        mock_post.return_value = unauthorized_response
+        mock_secrets_client.get_secret_value.return_value = {
+            'SecretString': json.dumps({'url': 'test.collibra.com', 'username': 'test_user', 'password': 'rotated'})
+        }
+
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            with pytest.raises(Exception) as exc_info:
+                adapter.create_relation('source-1', 'target-1', 'relation-type-1')
+
+        assert 'Failed to create collibra asset relation' in str(exc_info.value)
+        assert mock_post.call_count == 2
+        assert mock_post.call_args.kwargs['headers']['Authorization'] == 'Basic dGVzdF91c2VyOnJvdGF0ZWQ='
+
+    @patch('requests.Session.post')
+    def test_get_related_asset_ids_queries_candidate_targets_only(self, mock_post, adapter):
+        """Test get_related_asset_ids restricts the relations of the source to the candidate targets"""
         mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = 'Internal Server Error'
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'data': {'assets': [{'outgoingRelations': [{'target': {'id': 'table-1'}}, {'target': {'id': 'table-3'}}]}]}
+        }
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_pii_columns('table-123')
-        
-        assert 'Failed to fetch PII columns for table with id table-123 from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_pii_columns_raises_error_when_no_results(self, mock_post, adapter):
-        """Test get_pii_columns raises exception when no results"""
+        result = adapter.get_related_asset_ids('proj-1', ['table-1', 'table-2', 'table-3'], 'relation-type-id')
+
+        assert result == {'table-1', 'table-3'}
+        payload = mock_post.call_args.kwargs['json']
+        assert payload['variables'] == {'sourceId': 'proj-1', 'relationType': 'relation-type-id',
+                                        'targetIds': ['table-1', 'table-2', 'table-3']}
+        assert f'limit: {COLLIBRA_MAX_LOOKUP_BATCH_SIZE}' in payload['query']
+
+    @patch('requests.Session.post')
+    def test_get_related_asset_ids_returns_nothing_for_missing_source(self, mock_post, adapter):
+        """Test get_related_asset_ids returns no ids when the source asset doesn't exist"""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {'data': {'assets': []}}
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_pii_columns('table-123')
-        
-        assert 'Failed to fetch PII columns for table with id table-123 from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_subscription_requests_by_status_failure(self, mock_post, adapter):
-        """Test get_subscription_requests_by_status raises exception on API failure"""
+        assert adapter.get_related_asset_ids('proj-1', ['table-1'], 'relation-type-id') == set()
+
+    @patch('requests.Session.post')
+    def test_get_related_asset_ids_rejects_batches_above_query_limit(self, mock_post, adapter):
+        """Test get_related_asset_ids refuses more candidates than the query returns relations"""
+        with pytest.raises(ValueError):
+            adapter.get_related_asset_ids('proj-1', [f't{i}' for i in range(COLLIBRA_MAX_LOOKUP_BATCH_SIZE + 1)],
+                                          'relation-type-id')
+
+        mock_post.assert_not_called()
+
+    @patch('requests.Session.post')
+    def test_get_related_asset_ids_failure(self, mock_post, adapter):
+        """Test get_related_asset_ids raises exception on API failure"""
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = 'Internal Server Error'
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_subscription_requests_by_status('PENDING')
-        
-        assert 'Failed to fetch pending subscription requests from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_project_failure(self, mock_post, adapter):
-        """Test get_aws_project raises exception on API failure"""
+        with pytest.raises(Exception) as exc_info:
+            adapter.get_related_asset_ids('proj-1', ['table-1'], 'relation-type-id')
+
+        assert 'Failed to fetch relations of asset proj-1 from Collibra' in str(exc_info.value)
+
+    @patch('requests.Session.post')
+    def test_create_relations_sends_chunked_bulk_requests(self, mock_post, adapter):
+        """Test create_relations writes relations through relations/bulk in chunks of the bulk batch size"""
+        def bulk_response(url, json=None, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = [{'id': f"rel-{payload['targetId']}"} for payload in json]
+            return response
+
+        mock_post.side_effect = bulk_response
+        relations = [('project-1', f"asset-{i}", 'relation-type-1') for i in range(3)]
+
+        with patch('adapter.CollibraAdapter.COLLIBRA_MAX_BULK_WRITE_BATCH_SIZE', 2):
+            result = adapter.create_relations(relations)
+
+        assert mock_post.call_count == 2
+        assert mock_post.call_args_list[0].args[0] == 'https://test.collibra.com/rest/2.0/relations/bulk'
+        assert len(mock_post.call_args_list[0].kwargs['json']) == 2
+        assert len(mock_post.call_args_list[1].kwargs['json']) == 1
+        assert [resource['id'] for _, resource in result.created] == ['rel-asset-0', 'rel-asset-1', 'rel-asset-2']
+        assert result.failed == []
+
+    @patch('requests.Session.post')
+    def test_bulk_write_falls_back_to_single_writes_when_chunk_is_rejected(self, mock_post, adapter):
+        """Test items of a rejected bulk request are written one by one to report per-item results"""
+        rejected_response = Mock()
+        rejected_response.status_code = 400
+        rejected_response.text = 'Invalid asset'
+        created_response = Mock()
+        created_response.status_code = 201
+        created_response.json.return_value = {'id': 'user-1'}
+        failed_response = Mock()
+        failed_response.status_code = 400
+        failed_response.text = 'Name already exists'
+        mock_post.side_effect = [rejected_response, created_response, failed_response]
+
+        result = adapter.create_aws_users(['alice', 'bob'])
+
+        assert mock_post.call_args_list[1].args[0] == 'https://test.collibra.com/rest/2.0/assets'
+        assert [(item['name'], resource['id']) for item, resource in result.created] == [('alice', 'user-1')]
+        assert [(item['name'], error) for item, error in result.failed] == [('bob', 'Name already exists')]
+
+    @patch('requests.Session.post')
+    def test_add_aws_users_attributes_sends_attributes_bulk_request(self, mock_post, adapter):
+        """Test add_aws_users_attributes posts all attributes to attributes/bulk"""
         mock_response = Mock()
-        mock_response.status_code = 500
-        mock_response.text = 'Internal Server Error'
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{'id': 'attr-1'}]
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_aws_project('my-project')
-        
-        assert 'Failed to fetch asset with name my-project from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_user_failure(self, mock_post, adapter):
-        """Test get_aws_user raises exception on API failure"""
+        result = adapter.add_aws_users_attributes([('user-1', 'TestProject')])
+
+        assert mock_post.call_args.args[0] == 'https://test.collibra.com/rest/2.0/attributes/bulk'
+        assert mock_post.call_args.kwargs['json'] == [
+            {'assetId': 'user-1', 'typeId': 'test-user-project-attr-type-id', 'value': 'TestProject'}]
+        assert len(result.created) == 1
+
+    @patch('requests.Session.post')
+    def test_get_all_table_names_pages_until_empty_page(self, mock_post, adapter):
+        """Test get_all_table_names yields the tables of all pages using the last seen id as cursor"""
+        first_page = Mock()
+        first_page.status_code = 200
+        first_page.json.return_value = {'data': {'assets': [{'id': 'table-1', 'displayName': 'customers'}]}}
+        empty_page = Mock()
+        empty_page.status_code = 200
+        empty_page.json.return_value = {'data': {'assets': []}}
+        mock_post.side_effect = [first_page, empty_page]
+
+        tables = list(adapter.get_all_table_names())
+
+        assert tables == [{'id': 'table-1', 'displayName': 'customers'}]
+        payloads = [call.kwargs['json'] for call in mock_post.call_args_list]
+        assert 'limit: 1000' in payloads[0]['query']
+        assert payloads[1]['variables'] == {'lastSeenId': 'table-1'}
+
+    @patch('requests.Session.post')
+    def test_get_all_table_names_failure(self, mock_post, adapter):
+        """Test get_all_table_names raises exception on API failure"""
         mock_response = Mock()
         mock_response.status_code = 500
         mock_response.text = 'Internal Server Error'
         mock_post.return_value = mock_response
-        
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_aws_user('testuser')
-        
-        assert 'Failed to fetch tuser with username testuser from Collibra' in str(exc_info.value)
 
-    @patch('adapter.CollibraAdapter.requests.post')
-    def test_get_aws_user_raises_error_when_multiple_results(self, mock_post, adapter):
-        """Test get_aws_user raises exception when multiple users found"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            'data': {
-                'assets': [
-                    {'id': 'user-1', 'name': 'testuser'},
-                    {'id': 'user-2', 'name': 'testuser'}
-                ]
-            }
-        }
-        mock_post.return_value = mock_response
-        
         with pytest.raises(Exception) as exc_info:
-            adapter.get_aws_user('testuser')
-        
-        assert 'Failed to fetch user with username testuser from Collibra' in str(exc_info.value)
+            list(adapter.get_all_table_names())
+
+        assert 'Failed to fetch table names from Collibra' in str(exc_info.value)
+
+    @patch('requests.Session.post')
+    def test_get_all_aws_users_pages_with_user_type_variables(self, mock_post, adapter):
+        """Test get_all_aws_users queries users of the AWS user type with their project attributes page by page"""
+        first_page = Mock()
+        first_page.status_code = 200
+        first_page.json.return_value = {'data': {'assets': [{'id': 'user-1', 'displayName': 'alice'}]}}
+        empty_page = Mock()
+        empty_page.status_code = 200
+        empty_page.json.return_value = {'data': {'assets': []}}
+        mock_post.side_effect = [first_page, empty_page]
+
+        users = list(adapter.get_all_aws_users())
+
+        assert users == [{'id': 'user-1', 'displayName': 'alice'}]
+        payloads = [call.kwargs['json'] for call in mock_post.call_args_list]
+        assert payloads[0]['variables'] == {'type': 'test-user-type-id',
+                                            'stringAttributeType': 'test-user-project-attr-type-id'}
+        assert payloads[1]['variables']['lastSeenId'] == 'user-1'
+        assert 'query Assets($lastSeenId: UUID!, $type: UUID!, $stringAttributeType: UUID!)' in payloads[1]['query']
+
+    @patch('requests.Session.post')
+    def test_get_all_aws_projects_queries_project_type_and_attribute(self, mock_post, adapter):
+        """Test get_all_aws_projects queries AWS projects with their SMUS project id attributes"""
+        empty_page = Mock()
+        empty_page.status_code = 200
+        empty_page.json.return_value = {'data': {'assets': []}}
+        mock_post.return_value = empty_page
+
+        assert list(adapter.get_all_aws_projects()) == []
+
+        payload = mock_post.call_args.kwargs['json']
+        assert payload['variables'] == {'type': 'test-project-type-id',
+                                        'stringAttributeType': 'test-project-attr-type-id'}
+        assert 'outgoingRelations' not in payload['query']
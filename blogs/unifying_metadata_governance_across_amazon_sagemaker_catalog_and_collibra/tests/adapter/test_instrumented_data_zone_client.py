@@ -0,0 +1,142 @@
+"""
+Unit tests for lambda/adapter/InstrumentedDataZoneClient.py
+"""
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import MagicMock, patch
+
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
+from business.SMUSRateLimiters import SMUSRateLimiters
+
+
+def client_error(code, retry_attempts=0, http_status_code=400):
+    return ClientError({'Error': {'Code': code, 'Message': code},
+                        'ResponseMetadata': {'RetryAttempts': retry_attempts, 'HTTPStatusCode': http_status_code}},
+                       'GetAsset')
+
+
+@pytest.mark.unit
+class TestInstrumentedDataZoneClient:
+    """Tests for InstrumentedDataZoneClient class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_metrics(self):
+        """Clear the process-wide DataZone metrics and rate limiters around each test"""
+        InstrumentedDataZoneClient.reset()
+        SMUSRateLimiters.reset()
+        yield
+        InstrumentedDataZoneClient.reset()
+        SMUSRateLimiters.reset()
+
+    @pytest.fixture
+    def mock_datazone_client(self):
+        """Mock AWS DataZone client"""
+        return MagicMock()
+
+    @pytest.fixture
+    def client(self, mock_logger, mock_datazone_client):
+        """Create InstrumentedDataZoneClient wrapping the mocked client"""
+        return InstrumentedDataZoneClient(mock_logger, mock_datazone_client)
+
+    def test_instrumented_operation_records_call(self, client, mock_datazone_client):
+        """Test an instrumented call is passed through and recorded without lowering the rate"""
+        mock_datazone_client.get_asset.return_value = {'id': 'asset-1', 'ResponseMetadata': {'RetryAttempts': 0}}
+        initial_rate = SMUSRateLimiters.get('GetAsset').rate
+
+        result = client.get_asset(domainIdentifier='domain', identifier='asset-1')
+
+        assert result['id'] == 'asset-1'
+        mock_datazone_client.get_asset.assert_called_once_with(domainIdentifier='domain', identifier='asset-1')
+        assert SMUSRateLimiters.get('GetAsset').rate == initial_rate
+        metrics = InstrumentedDataZoneClient.get_metrics()['GetAsset']
+        assert (metrics.calls, metrics.errors, metrics.throttles, metrics.retries) == (1, 0, 0, 0)
+
+    def test_call_retried_by_botocore_records_retries_without_changing_rate(self, client, mock_datazone_client):
+        """Test a call that succeeded after botocore retries records them, but is neither a throttle nor a success"""
+        mock_datazone_client.get_asset.return_value = {'id': 'asset-1', 'ResponseMetadata': {'RetryAttempts': 2}}
+
+        with patch('adapter.InstrumentedDataZoneClient.SMUSRateLimiters.get') as mock_get_rate_limiter:
+            assert client.get_asset(domainIdentifier='domain', identifier='asset-1')['id'] == 'asset-1'
+
+        mock_get_rate_limiter.return_value.on_throttle.assert_not_called()
+        mock_get_rate_limiter.return_value.on_success.assert_not_called()
+        metrics = InstrumentedDataZoneClient.get_metrics()['GetAsset']
+        assert (metrics.calls, metrics.errors, metrics.throttles, metrics.retries) == (1, 0, 0, 2)
+
+    def test_throttled_operation_lowers_rate_and_reraises(self, client, mock_datazone_client):
+        """Test a throttled call is recorded, slows its operation down and is raised to the caller"""
+        mock_datazone_client.get_asset.side_effect = client_error('ThrottlingException', retry_attempts=9)
+        initial_rate = SMUSRateLimiters.get('GetAsset').rate
+
+        with pytest.raises(ClientError):
+            client.get_asset(domainIdentifier='domain', identifier='asset-1')
+
+        assert SMUSRateLimiters.get('GetAsset').rate < initial_rate
+        metrics = InstrumentedDataZoneClient.get_metrics()['GetAsset']
+        assert (metrics.calls, metrics.errors, metrics.throttles, metrics.retries) == (1, 1, 1, 9)
+
+    def test_http_429_lowers_rate(self, client, mock_datazone_client):
+        """Test a call rejected with HTTP 429 counts as throttled whatever its error code"""
+        mock_datazone_client.get_asset.side_effect = client_error('TooManyRequestsException', http_status_code=429)
+        initial_rate = SMUSRateLimiters.get('GetAsset').rate
+
+        with pytest.raises(ClientError):
+            client.get_asset(domainIdentifier='domain', identifier='asset-1')
+
+        assert SMUSRateLimiters.get('GetAsset').rate < initial_rate
+        assert InstrumentedDataZoneClient.get_metrics()['GetAsset'].throttles == 1
+
+    def test_retried_server_errors_are_not_throttles(self, client, mock_datazone_client):
+        """Test a call failing with a 5xx after botocore retries records the retries but doesn't lower the rate"""
+        mock_datazone_client.get_asset.side_effect = client_error('InternalServerException', retry_attempts=9,
+                                                                  http_status_code=500)
+        initial_rate = SMUSRateLimiters.get('GetAsset').rate
+
+        with pytest.raises(ClientError):
+            client.get_asset(domainIdentifier='domain', identifier='asset-1')
+
+        assert SMUSRateLimiters.get('GetAsset').rate == initial_rate
+        metrics = InstrumentedDataZoneClient.get_metrics()['GetAsset']
+        assert (metrics.calls, metrics.errors, metrics.throttles, metrics.retries) == (1, 1, 0, 9)
+
+    def test_other_errors_do_not_lower_rate(self, client, mock_datazone_client):
+        """Test a call failing for another reason is recorded as an error only"""
+        mock_datazone_client.search.side_effect = client_error('ValidationException')
+        initial_rate = SMUSRateLimiters.get('Search').rate
+
+        with pytest.raises(ClientError):
+            client.search(domainIdentifier='domain')
+
+        assert SMUSRateLimiters.get('Search').rate == initial_rate
+        metrics = InstrumentedDataZoneClient.get_metrics()['Search']
+        assert (metrics.errors, metrics.throttles) == (1, 0)
+
+    def test_operations_go_through_their_rate_limiter(self, client):
+        """Test each instrumented call acquires a token of its own operation"""
+        with patch('adapter.InstrumentedDataZoneClient.SMUSRateLimiters.get') as mock_get_rate_limiter:
+            client.search_listings(domainIdentifier='domain')
+
+        mock_get_rate_limiter.assert_called_once_with('SearchListings')
+        mock_get_rate_limiter.return_value.acquire.assert_called_once()
+        mock_get_rate_limiter.return_value.on_success.assert_called_once()
+
+    def test_other_attributes_are_passed_through(self, client, mock_datazone_client):
+        """Test operations that are not instrumented and client exceptions come from the wrapped client"""
+        mock_datazone_client.get_project.return_value = {'id': 'project-1'}
+
+        assert client.get_project(identifier='project-1') == {'id': 'project-1'}
+        assert client.exceptions is mock_datazone_client.exceptions
+        assert InstrumentedDataZoneClient.get_metrics() == {}
+
+    def test_flush_metrics_logs_summary_and_clears(self, client, mock_logger, mock_datazone_client):
+        """Test flushing logs one line per operation and starts a new measurement window"""
+        mock_datazone_client.get_user_profile.return_value = {}
+        client.get_user_profile(domainIdentifier='domain', userIdentifier='user-1')
+        client.list_project_memberships(domainIdentifier='domain', projectIdentifier='project-1')
+
+        InstrumentedDataZoneClient.flush_metrics(mock_logger)
+
+        logged_lines = [call.args[0] for call in mock_logger.info.call_args_list]
+        assert any('GetUserProfile: calls=1' in line for line in logged_lines)
+        assert any('ListProjectMemberships: calls=1' in line for line in logged_lines)
+        assert InstrumentedDataZoneClient.get_metrics() == {}
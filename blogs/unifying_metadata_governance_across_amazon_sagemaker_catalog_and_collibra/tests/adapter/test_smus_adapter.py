@@ -4,13 +4,27 @@ Unit tests for lambda/adapter/SMUSAdapter.py
 import pytest
 from unittest.mock import MagicMock, patch
 
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
 from adapter.SMUSAdapter import SMUSAdapter
+from business.SMUSBootstrapCache import SMUSBootstrapCache
+from business.SMUSRateLimiters import SMUSRateLimiters
 
 
 @pytest.mark.unit
 class TestSMUSAdapter:
     """Tests for SMUSAdapter class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_bootstrap_cache(self):
+        """Clear the process-wide admin user and glossary ids, rate limiters and DataZone metrics around each test"""
+        SMUSBootstrapCache.reset()
+        SMUSRateLimiters.reset()
+        InstrumentedDataZoneClient.reset()
+        yield
+        SMUSBootstrapCache.reset()
+        SMUSRateLimiters.reset()
+        InstrumentedDataZoneClient.reset()
+
     @pytest.fixture
     def mock_datazone_client(self):
         """Mock AWS DataZone client"""
@@ -192,6 +206,18 @@ class TestSMUSAdapter:
         assert result[0]['assetItem']['id'] == 'asset-1'
         assert result[1]['assetItem']['id'] == 'asset-2'
 
+    def test_search_all_assets_by_name_in_domain_searches_all_projects(self, adapter, mock_datazone_client):
+        """Test search_all_assets_by_name_in_domain doesn't restrict the search to a project"""
+        mock_datazone_client.search.return_value = {
+            'items': [{'assetItem': {'id': 'asset-1', 'owningProjectId': 'proj-1'}}]
+        }
+
+        result = adapter.search_all_assets_by_name_in_domain('table1')
+
+        assert len(result) == 1
+        assert 'owningProjectIdentifier' not in mock_datazone_client.search.call_args[1]
+        assert mock_datazone_client.search.call_args[1]['searchText'] == 'table1'
+
     def test_search_asset_by_name_success(self, adapter, mock_datazone_client):
         """Test search_asset_by_name returns search results"""
         mock_datazone_client.search.return_value = {
@@ -236,6 +262,18 @@ class TestSMUSAdapter:
         
         assert len(result) == 2
 
+    def test_iter_listings_stops_paging_at_first_match(self, adapter, mock_datazone_client):
+        """Test iter_listings doesn't fetch further pages once the caller stops iterating"""
+        mock_datazone_client.search_listings.side_effect = [
+            {'items': [{'assetListing': {'listingId': 'listing-1'}}], 'nextToken': 'token1'},
+            {'items': [{'assetListing': {'listingId': 'listing-2'}}]}
+        ]
+
+        listing = next(adapter.iter_listings('proj-123', 'table'))
+
+        assert listing['assetListing']['listingId'] == 'listing-1'
+        mock_datazone_client.search_listings.assert_called_once()
+
     def test_search_listings_with_search_text(self, adapter, mock_datazone_client):
         """Test search_listings passes search text correctly"""
         mock_datazone_client.search_listings.return_value = {'items': []}
@@ -312,6 +350,7 @@ class TestSMUSAdapter:
         result = adapter.get_asset('asset-123')
         
         assert result['id'] == 'asset-123'
+        assert InstrumentedDataZoneClient.get_metrics()['GetAsset'].calls == 1
 
     def test_create_asset_revision_success(self, adapter, mock_datazone_client):
         """Test create_asset_revision creates revision"""
@@ -402,3 +441,54 @@ class TestSMUSAdapter:
         # Verify behavior: pagination token is passed
         call_args = mock_datazone_client.list_projects.call_args
         assert call_args[1]['nextToken'] == 'token123'
+
+    def test_admin_role_user_id_is_shared_across_adapters(self, mock_logger, mock_datazone_client):
+        """Test the admin role user is looked up once for all adapters"""
+        with patch('adapter.SMUSAdapter.AWSClientFactory.create', return_value=mock_datazone_client):
+            SMUSAdapter(mock_logger)
+            adapter = SMUSAdapter(mock_logger)
+
+        adapter.list_projects(5)
+
+        mock_datazone_client.search_user_profiles.assert_called_once()
+        assert mock_datazone_client.list_projects.call_args[1]['userIdentifier'] == 'admin-user-id'
+
+    def test_list_projects_looks_up_admin_role_user_again_when_not_found(self, adapter, mock_datazone_client):
+        """Test list_projects invalidates the cached admin role user id on not-found and retries once"""
+        class ResourceNotFoundException(Exception):
+            pass
+        mock_datazone_client.exceptions.ResourceNotFoundException = ResourceNotFoundException
+        mock_datazone_client.list_projects.side_effect = [ResourceNotFoundException(), {'items': []}]
+
+        result = adapter.list_projects(5)
+
+        assert result == {'items': []}
+        assert mock_datazone_client.search_user_profiles.call_count == 2
+
+    def test_create_or_get_glossary_is_cached(self, adapter, mock_datazone_client):
+        """Test the glossary is searched once across calls"""
+        mock_datazone_client.search.return_value = {
+            'items': [{'glossaryItem': {'id': 'glossary-123', 'name': 'CollibraSyncedGlossary-test-domain-id'}}]
+        }
+
+        assert adapter.create_or_get_glossary() == 'glossary-123'
+        assert adapter.create_or_get_glossary() == 'glossary-123'
+
+        mock_datazone_client.search.assert_called_once()
+
+    def test_create_glossary_term_invalidates_glossary_id_when_not_found(self, adapter, mock_datazone_client):
+        """Test the cached glossary id is resolved again after the glossary was not found"""
+        class ResourceNotFoundException(Exception):
+            pass
+        mock_datazone_client.exceptions.ResourceNotFoundException = ResourceNotFoundException
+        mock_datazone_client.search.return_value = {
+            'items': [{'glossaryItem': {'id': 'glossary-123', 'name': 'CollibraSyncedGlossary-test-domain-id'}}]
+        }
+        mock_datazone_client.create_glossary_term.side_effect = ResourceNotFoundException()
+        glossary_id = adapter.create_or_get_glossary()
+
+        with pytest.raises(ResourceNotFoundException):
+            adapter.create_glossary_term(glossary_id, 'Term', [])
+        adapter.create_or_get_glossary()
+
+        assert mock_datazone_client.search.call_count == 2
@@ -3,17 +3,33 @@ Unit tests for lambda/business/business_metadata_sync_workflow/AssetMetadataSync
 """
 import pytest
 import json
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch, call
 from datetime import datetime, timedelta
 
+from botocore.exceptions import ClientError
+
+from business.SMUSProjectCache import SMUSProjectCache
 from business.business_metadata_sync_workflow.AssetMetadataSyncBusinessLogic import AssetMetadataSyncBusinessLogic
 from model.CollibraTable import CollibraTable, CollibraColumn
+from model.CollibraTableDetails import CollibraTableDetails
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'Search')
 
 
 @pytest.mark.unit
 class TestAssetMetadataSyncBusinessLogic:
     """Tests for AssetMetadataSyncBusinessLogic class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_smus_project_cache(self):
+        """Clear the process-wide SMUS project cache around each test"""
+        SMUSProjectCache.reset()
+        yield
+        SMUSProjectCache.reset()
+
     @pytest.fixture
     def mock_smus_adapter(self):
         """Mock SMUS adapter"""
@@ -67,6 +83,7 @@ class TestAssetMetadataSyncBusinessLogic:
         mock_collibra_adapter.get_tables.return_value = [
             {'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}
         ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.side_effect = Exception("Search failed")
         mock_smus_adapter.search_all_assets_by_name.side_effect = Exception("Search failed")
         
         result = business_logic.sync(None)
@@ -81,6 +98,65 @@ class TestAssetMetadataSyncBusinessLogic:
         
         assert result is None
 
+    def test_sync_processes_all_pages(self, business_logic, mock_collibra_adapter, mock_smus_adapter):
+        """Test sync follows the last seen id across pages and returns None once all tables are synced"""
+        mock_collibra_adapter.get_tables.side_effect = [
+            [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
+            [{'id': 'table-2', 'displayName': 'orders', 'fullName': 'db>orders'}],
+            []
+        ]
+        mock_smus_adapter.search_all_assets_by_name.return_value = []
+        
+        result = business_logic.sync(None)
+        
+        assert result is None
+        assert [call[0][0] for call in mock_collibra_adapter.get_tables.call_args_list] == [None, 'table-1', 'table-2']
+
+    @pytest.fixture
+    def delta_business_logic(self, mock_logger, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache):
+        """Create AssetMetadataSyncBusinessLogic instance with delta sync enabled and a mocked high-water mark"""
+        mock_high_water_mark = MagicMock()
+        mock_high_water_mark.modified_after = '2026-01-01T00:00:00+00:00'
+        module = 'business.business_metadata_sync_workflow.AssetMetadataSyncBusinessLogic'
+        with patch(f'{module}.SMUSAdapter', return_value=mock_smus_adapter), \
+                patch(f'{module}.CollibraAdapter', return_value=mock_collibra_adapter), \
+                patch(f'{module}.SMUSGlossaryCache', return_value=mock_glossary_cache), \
+                patch(f'{module}.COLLIBRA_DELTA_SYNC_ENABLED', True), \
+                patch(f'{module}.SyncHighWaterMark', return_value=mock_high_water_mark):
+            return AssetMetadataSyncBusinessLogic(mock_logger), mock_high_water_mark
+
+    def test_sync_in_delta_mode_fetches_tables_modified_after_high_water_mark(self, delta_business_logic, mock_collibra_adapter, mock_smus_adapter):
+        """Test delta sync only fetches modified tables and advances the high-water mark once all are synced"""
+        business_logic, mock_high_water_mark = delta_business_logic
+        mock_collibra_adapter.get_tables.side_effect = [
+            [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
+            []
+        ]
+        mock_smus_adapter.search_all_assets_by_name.return_value = []
+        
+        result = business_logic.sync(None)
+        
+        assert result is None
+        mock_collibra_adapter.get_tables.assert_any_call(None, modified_after='2026-01-01T00:00:00+00:00')
+        mock_high_water_mark.start_run.assert_called_once()
+        mock_high_water_mark.complete_run.assert_called_once()
+        mock_high_water_mark.mark_run_failed.assert_not_called()
+
+    def test_sync_in_delta_mode_marks_run_failed_on_table_failure(self, delta_business_logic, mock_collibra_adapter, mock_smus_adapter):
+        """Test a failing table prevents the high-water mark from skipping it in the next run"""
+        business_logic, mock_high_water_mark = delta_business_logic
+        mock_collibra_adapter.get_tables.side_effect = [
+            [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
+            []
+        ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.side_effect = Exception("Search failed")
+        mock_smus_adapter.search_all_assets_by_name.side_effect = Exception("Search failed")
+        
+        business_logic.sync('table-0')
+        
+        mock_high_water_mark.start_run.assert_not_called()
+        mock_high_water_mark.mark_run_failed.assert_called_once()
+
     def test_sync_returns_last_seen_id(self, business_logic, mock_collibra_adapter):
         """Test sync returns last seen asset ID"""
         mock_collibra_adapter.get_tables.return_value = [
@@ -257,20 +333,58 @@ class TestAssetMetadataSyncBusinessLogic:
         form_names = [f['formName'] for f in forms_input]
         assert 'ColumnBusinessMetadataForm' in form_names
 
-    def test_sync_searches_all_projects(self, business_logic, mock_collibra_adapter, mock_smus_adapter):
-        """Test sync searches assets across all projects"""
+    def test_sync_searches_domain_filtered_to_projects(self, business_logic, mock_collibra_adapter, mock_smus_adapter, mock_logger):
+        """Test sync searches assets with one domain-wide search and keeps those of the admin projects"""
         mock_collibra_adapter.get_tables.return_value = [
             {'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}
         ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.return_value = [
+            {'assetItem': {'identifier': 'asset-1', 'owningProjectId': 'proj-2'}},
+            {'assetItem': {'identifier': 'asset-2', 'owningProjectId': 'other-project'}}
+        ]
+        mock_smus_adapter.get_asset.return_value = {'id': 'asset-1', 'name': 'customers'}
+
+        with patch('business.CollibraSMUSAssetMatcher.CollibraSMUSAssetMatcher.match', return_value=True):
+            business_logic.sync(None)
+
+        mock_smus_adapter.search_all_assets_by_name_in_domain.assert_called_once_with('customers')
+        mock_smus_adapter.search_all_assets_by_name.assert_not_called()
+        mock_smus_adapter.get_asset.assert_any_call('asset-1')
+        assert call('asset-2') not in mock_smus_adapter.get_asset.call_args_list
+
+    def test_sync_searches_all_projects_when_domain_search_is_denied(self, business_logic, mock_collibra_adapter, mock_smus_adapter):
+        """Test sync falls back to searching assets in every project once the domain-wide search is denied"""
+        mock_collibra_adapter.get_tables.return_value = [
+            {'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'},
+            {'id': 'table-2', 'displayName': 'orders', 'fullName': 'db>orders'}
+        ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.side_effect = client_error('AccessDeniedException')
         mock_smus_adapter.search_all_assets_by_name.return_value = []
         
-        business_logic.sync(None)
+        with patch('business.business_metadata_sync_workflow.AssetMetadataSyncBusinessLogic.ThreadPoolExecutor',
+                   wraps=ThreadPoolExecutor) as mock_executor_class:
+            business_logic.sync(None)
         
-        # Should search in both projects
-        assert mock_smus_adapter.search_all_assets_by_name.call_count == 2
+        # Both tables are searched in both projects on one worker pool, in whichever order the workers pick them up,
+        # and the denied domain-wide search is not tried again
+        mock_executor_class.assert_called_once()
+        mock_smus_adapter.search_all_assets_by_name_in_domain.assert_called_once()
         calls = mock_smus_adapter.search_all_assets_by_name.call_args_list
-        assert calls[0][0] == ('customers', 'proj-1')
-        assert calls[1][0] == ('customers', 'proj-2')
+        assert sorted(c[0] for c in calls) == [('customers', 'proj-1'), ('customers', 'proj-2'),
+                                         ('orders', 'proj-1'), ('orders', 'proj-2')]
+
+    def test_sync_does_not_search_per_project_when_domain_search_is_throttled(self, business_logic, mock_collibra_adapter,
+                                                                             mock_smus_adapter, mock_logger):
+        """Test a throttled domain-wide search fails the table instead of falling back to one search per project"""
+        mock_collibra_adapter.get_tables.return_value = [
+            {'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}
+        ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.side_effect = client_error('ThrottlingException')
+
+        business_logic.sync(None)
+
+        mock_smus_adapter.search_all_assets_by_name.assert_not_called()
+        mock_logger.error.assert_called()
 
     def test_update_asset_metadata_without_optional_fields(self, business_logic, mock_smus_adapter):
         """Test update_asset_metadata works without description and glossary terms"""
@@ -305,27 +419,25 @@ class TestAssetMetadataSyncBusinessLogic:
             [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
             []
         ]
-        # Return asset for first project, empty for second project
-        mock_smus_adapter.search_all_assets_by_name.side_effect = [
-            [{'assetItem': {'identifier': 'asset-1'}}],
-            []
-        ]
-        mock_smus_adapter.get_asset.side_effect = [
-            {'id': 'asset-1', 'name': 'customers', 'typeIdentifier': 'datazone:GlueTable'},
-            {
-                'id': 'asset-1',
-                'name': 'customers',
-                'formsOutput': [{
-                    'formName': 'GlueTableForm',
-                    'typeName': 'type1',
-                    'typeRevision': '1',
-                    'content': json.dumps({'columns': [{'columnName': 'id'}]})
-                }]
-            }
+        mock_smus_adapter.search_all_assets_by_name_in_domain.return_value = [
+            {'assetItem': {'identifier': 'asset-1', 'owningProjectId': 'proj-1'}}
         ]
-        mock_collibra_adapter.get_table.return_value = {'id': 'table-1', 'displayName': 'customers'}
-        mock_collibra_adapter.get_table_business_terms.return_value = []
-        mock_collibra_adapter.get_pii_columns.return_value = []
+        mock_smus_adapter.get_asset.return_value = {
+            'id': 'asset-1',
+            'name': 'customers',
+            'typeIdentifier': 'datazone:GlueTable',
+            'formsOutput': [{
+                'formName': 'GlueTableForm',
+                'typeName': 'type1',
+                'typeRevision': '1',
+                'content': json.dumps({'columns': [{'columnName': 'id'}]})
+            }]
+        }
+        mock_collibra_adapter.get_tables_details.return_value = {'table-1': CollibraTableDetails({
+            'table': [{'id': 'table-1', 'displayName': 'customers'}],
+            'businessTerms': [{}],
+            'piiColumns': [{}]
+        })}
         
         with patch('business.CollibraSMUSAssetMatcher.CollibraSMUSAssetMatcher.match', return_value=True):
             with patch('model.CollibraTable.CollibraTable') as mock_table_class:
@@ -342,6 +454,8 @@ class TestAssetMetadataSyncBusinessLogic:
                 
                 assert any('Found 1 assets for collibra table customers in SMUS' in str(c) for c in mock_logger.info.call_args_list)
                 assert any('Successfully updated asset with name customers in SMUS' in str(c) for c in mock_logger.info.call_args_list)
+                # The asset fetched for matching is reused for the revision
+                mock_smus_adapter.get_asset.assert_called_once_with('asset-1')
 
     def test_sync_calls_collibra_apis_for_table_data(self, business_logic, mock_collibra_adapter, mock_smus_adapter):
         """Test sync calls Collibra APIs to fetch table data"""
@@ -350,18 +464,18 @@ class TestAssetMetadataSyncBusinessLogic:
             [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
             []
         ]
-        # Return asset for first project, empty for second project
-        mock_smus_adapter.search_all_assets_by_name.side_effect = [
-            [{'assetItem': {'identifier': 'asset-1'}}],
-            []
+        mock_smus_adapter.search_all_assets_by_name_in_domain.return_value = [
+            {'assetItem': {'identifier': 'asset-1', 'owningProjectId': 'proj-1'}}
         ]
         mock_smus_adapter.get_asset.side_effect = [
             {'id': 'asset-1', 'name': 'customers'},
             {'id': 'asset-1', 'formsOutput': [{'formName': 'GlueTableForm', 'typeName': 't', 'typeRevision': '1', 'content': '{}'}]}
         ]
-        mock_collibra_adapter.get_table.return_value = {'id': 'table-1'}
-        mock_collibra_adapter.get_table_business_terms.return_value = []
-        mock_collibra_adapter.get_pii_columns.return_value = []
+        mock_collibra_adapter.get_tables_details.return_value = {'table-1': CollibraTableDetails({
+            'table': [{'id': 'table-1', 'displayName': 'customers'}],
+            'businessTerms': [{}],
+            'piiColumns': [{}]
+        })}
         
         with patch('business.CollibraSMUSAssetMatcher.CollibraSMUSAssetMatcher.match', return_value=True):
             with patch('model.CollibraTable.CollibraTable') as mock_table_class:
@@ -376,9 +490,54 @@ class TestAssetMetadataSyncBusinessLogic:
                 
                 business_logic.sync(None)
                 
-                mock_collibra_adapter.get_table.assert_called_once_with('table-1')
-                mock_collibra_adapter.get_table_business_terms.assert_called_once_with('table-1')
-                mock_collibra_adapter.get_pii_columns.assert_called_once_with('table-1')
+                mock_collibra_adapter.get_tables_details.assert_called_once_with(['table-1'])
+
+    def test_sync_batches_table_details_for_matched_tables(self, business_logic, mock_collibra_adapter, mock_smus_adapter, mock_logger):
+        """Test sync fetches details of all matched tables in a page with one Collibra call"""
+        mock_collibra_adapter.get_tables.side_effect = [
+            [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'},
+             {'id': 'table-2', 'displayName': 'orders', 'fullName': 'db>orders'}],
+            []
+        ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.return_value = [
+            {'assetItem': {'identifier': 'asset-1', 'owningProjectId': 'proj-1'}}
+        ]
+        mock_smus_adapter.get_asset.return_value = {'id': 'asset-1', 'name': 'asset', 'formsOutput': []}
+        mock_collibra_adapter.get_tables_details.return_value = {'table-1': CollibraTableDetails({
+            'table': [{'id': 'table-1', 'displayName': 'customers'}],
+            'businessTerms': [{}],
+            'piiColumns': [{}]
+        })}
+
+        with patch('business.CollibraSMUSAssetMatcher.CollibraSMUSAssetMatcher.match', return_value=True):
+            business_logic.sync(None)
+
+        mock_collibra_adapter.get_tables_details.assert_called_once_with(['table-1', 'table-2'])
+        assert any('Successfully updated asset with name customers in SMUS' in str(c) for c in mock_logger.info.call_args_list)
+        assert any('Failed to update asset with name orders' in str(c) for c in mock_logger.error.call_args_list)
+
+    def test_sync_reports_failed_asset_revisions(self, business_logic, mock_collibra_adapter, mock_smus_adapter, mock_logger):
+        """Test a failed revision write is logged as a failed table update"""
+        mock_collibra_adapter.get_tables.side_effect = [
+            [{'id': 'table-1', 'displayName': 'customers', 'fullName': 'db>customers'}],
+            []
+        ]
+        mock_smus_adapter.search_all_assets_by_name_in_domain.return_value = [
+            {'assetItem': {'identifier': 'asset-1', 'owningProjectId': 'proj-1'}}
+        ]
+        mock_smus_adapter.get_asset.return_value = {'id': 'asset-1', 'name': 'customers', 'formsOutput': []}
+        mock_smus_adapter.create_asset_revision.side_effect = Exception("Validation failed")
+        mock_collibra_adapter.get_tables_details.return_value = {'table-1': CollibraTableDetails({
+            'table': [{'id': 'table-1', 'displayName': 'customers'}],
+            'businessTerms': [{}],
+            'piiColumns': [{}]
+        })}
+
+        with patch('business.CollibraSMUSAssetMatcher.CollibraSMUSAssetMatcher.match', return_value=True):
+            business_logic.sync(None)
+
+        assert any('Failed to update asset with name customers and id asset-1' in str(c) for c in mock_logger.error.call_args_list)
+        assert not any('Successfully updated asset with name customers' in str(c) for c in mock_logger.info.call_args_list)
 
     def test_update_asset_metadata_with_pii_columns_updates_readme(self, business_logic, mock_smus_adapter):
         """Test update_asset_metadata updates readme with PII columns"""
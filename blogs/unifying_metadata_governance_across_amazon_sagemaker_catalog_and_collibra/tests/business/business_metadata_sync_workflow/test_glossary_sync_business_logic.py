@@ -173,6 +173,41 @@ class TestGlossarySyncBusinessLogic:
         
         mock_collibra_adapter.get_business_term_metadata.assert_called_once_with('last-term-123')
 
+    def test_sync_processes_all_pages(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test sync keeps fetching pages of terms and returns None once all terms are synced"""
+        mock_collibra_adapter.get_business_term_metadata.side_effect = [
+            [{'id': 'term-1', 'displayName': 'Customer'}],
+            [{'id': 'term-2', 'displayName': 'Order'}],
+            []
+        ]
+        mock_smus_adapter.search_glossary_term_by_name.return_value = None
+        
+        result = business_logic.sync(None)
+        
+        assert result is None
+        assert mock_smus_adapter.create_glossary_term.call_count == 2
+        assert mock_collibra_adapter.get_business_term_metadata.call_args_list[1][0] == ('term-1',)
+
+    def test_sync_in_delta_mode_fetches_terms_modified_after_high_water_mark(self, mock_logger, mock_smus_adapter, mock_collibra_adapter):
+        """Test delta sync only fetches modified terms and advances the high-water mark once all are synced"""
+        mock_high_water_mark = MagicMock()
+        mock_high_water_mark.modified_after = '2026-01-01T00:00:00+00:00'
+        mock_collibra_adapter.get_business_term_metadata.return_value = []
+        module = 'business.business_metadata_sync_workflow.GlossarySyncBusinessLogic'
+        with patch(f'{module}.SMUSAdapter', return_value=mock_smus_adapter), \
+                patch(f'{module}.CollibraAdapter', return_value=mock_collibra_adapter), \
+                patch(f'{module}.COLLIBRA_DELTA_SYNC_ENABLED', True), \
+                patch(f'{module}.SyncHighWaterMark', return_value=mock_high_water_mark):
+            business_logic = GlossarySyncBusinessLogic(mock_logger)
+        
+        result = business_logic.sync(None)
+        
+        assert result is None
+        mock_collibra_adapter.get_business_term_metadata.assert_called_once_with(
+            None, modified_after='2026-01-01T00:00:00+00:00')
+        mock_high_water_mark.start_run.assert_called_once()
+        mock_high_water_mark.complete_run.assert_called_once()
+
     def test_sync_returns_none_when_no_terms(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
         """Test sync returns None when no terms found"""
         mock_collibra_adapter.get_business_term_metadata.return_value = []
@@ -50,18 +50,9 @@ class TestGlossaryTermHierarchyEstablisherBusinessLogic:
 
     def test_establish_updates_term_relations(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
         """Test establish updates glossary term relations"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Customer Data',
-                'incomingRelations': [
-                    {
-                        'source': {
-                            'displayName': 'Personal Information'
-                        }
-                    }
-                ]
-            }
-        ]
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([
+            ('Customer Data', 'Personal Information')
+        ])
         
         business_logic.establish()
         
@@ -71,29 +62,22 @@ class TestGlossaryTermHierarchyEstablisherBusinessLogic:
 
     def test_establish_handles_multiple_parent_terms(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
         """Test establish handles terms with multiple parents"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Customer ID',
-                'incomingRelations': [
-                    {'source': {'displayName': 'Identifier'}},
-                    {'source': {'displayName': 'Customer Data'}}
-                ]
-            }
-        ]
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([
+            ('Customer ID', 'Identifier'),
+            ('Customer ID', 'Customer Data')
+        ])
         
         business_logic.establish()
         
         # Child + 2 parents = 3 terms updated
         assert mock_smus_adapter.update_glossary_term_relations.call_count == 3
 
-    def test_establish_skips_terms_without_relations(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
-        """Test establish skips terms without incoming relations"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Root Term'
-                # No incomingRelations
-            }
-        ]
+    def test_establish_skips_terms_missing_in_smus_glossary(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
+        """Test establish skips relations whose terms are not present in the SMUS glossary"""
+        mock_glossary_cache.is_term_present.return_value = False
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([
+            ('Customer Data', 'Personal Information')
+        ])
         
         business_logic.establish()
         
@@ -102,48 +86,31 @@ class TestGlossaryTermHierarchyEstablisherBusinessLogic:
 
     def test_establish_handles_empty_hierarchy(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test establish handles empty hierarchy response"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = []
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([])
         
         business_logic.establish()
         
         mock_smus_adapter.update_glossary_term_relations.assert_not_called()
-        mock_logger.info.assert_any_call("Fetched business term hierarchy from Collibra. Indexing 0 terms")
-
-    def test_establish_handles_relations_without_source(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache):
-        """Test establish handles relations without source"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Customer Data',
-                'incomingRelations': [
-                    {
-                        'target': {'displayName': 'Something'}
-                        # No 'source' key
-                    }
-                ]
-            }
-        ]
+        mock_logger.info.assert_any_call("Fetched business term hierarchy from Collibra. Indexed 0 term relations")
+
+    def test_establish_consumes_hierarchy_lazily(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache):
+        """Test establish indexes relations from a generator as they are yielded"""
+        def hierarchy():
+            yield 'Customer ID', 'Identifier'
+            yield 'Order Date', 'Date'
+
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = hierarchy()
         
         business_logic.establish()
         
-        # Should not crash, should skip this relation
-        mock_smus_adapter.update_glossary_term_relations.assert_not_called()
+        assert mock_smus_adapter.update_glossary_term_relations.call_count == 4
 
     def test_establish_processes_multiple_terms(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
         """Test establish processes multiple terms"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Customer ID',
-                'incomingRelations': [
-                    {'source': {'displayName': 'Identifier'}}
-                ]
-            },
-            {
-                'displayName': 'Order Date',
-                'incomingRelations': [
-                    {'source': {'displayName': 'Date'}}
-                ]
-            }
-        ]
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([
+            ('Customer ID', 'Identifier'),
+            ('Order Date', 'Date')
+        ])
         
         business_logic.establish()
         
@@ -153,18 +120,13 @@ class TestGlossaryTermHierarchyEstablisherBusinessLogic:
 
     def test_establish_logs_progress(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_glossary_cache, mock_logger):
         """Test establish logs progress messages"""
-        mock_collibra_adapter.get_business_term_hierarchy.return_value = [
-            {
-                'displayName': 'Customer Data',
-                'incomingRelations': [
-                    {'source': {'displayName': 'Personal Information'}}
-                ]
-            }
-        ]
+        mock_collibra_adapter.get_business_term_hierarchy.return_value = iter([
+            ('Customer Data', 'Personal Information')
+        ])
         
         business_logic.establish()
         
         mock_logger.info.assert_any_call("Fetching business term hierarchy from Collibra")
-        mock_logger.info.assert_any_call("Fetched business term hierarchy from Collibra. Indexing 1 terms")
+        mock_logger.info.assert_any_call("Fetched business term hierarchy from Collibra. Indexed 1 term relations")
         mock_logger.info.assert_any_call("Initiating glossary term relation identification 2 terms")
         mock_logger.info.assert_any_call("Updating glossary term relations for Customer Data in glossary glossary-123")
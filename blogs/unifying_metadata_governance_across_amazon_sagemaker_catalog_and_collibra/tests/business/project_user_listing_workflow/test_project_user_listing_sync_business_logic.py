@@ -1,17 +1,38 @@
 """
 Unit tests for lambda/business/project_user_listing_workflow/ProjectUserListingSyncBusinessLogic.py
 """
+import threading
+
 import pytest
 from unittest.mock import MagicMock, patch
 
+from business.CollibraTableNameIndex import CollibraTableNameIndex
 from business.project_user_listing_workflow.ProjectUserListingSyncBusinessLogic import ProjectUserListingSyncBusinessLogic
+from model.CollibraBulkWriteResult import CollibraBulkWriteResult
 from model.ProjectUserListingSyncWorkflowEvent import ProjectUserListingSyncWorkflowEvent
+from utils.collibra_constants import COLLIBRA_MAX_LOOKUP_BATCH_SIZE
+
+
+def bulk_write_result(created=(), failed=()):
+    result = CollibraBulkWriteResult()
+    for item in created:
+        result.add_created(item, {'id': f"created-{len(result.created)}"})
+    for item, error in failed:
+        result.add_failed(item, error)
+    return result
 
 
 @pytest.mark.unit
 class TestProjectUserListingSyncBusinessLogic:
     """Tests for ProjectUserListingSyncBusinessLogic class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_collibra_table_name_index(self):
+        """Clear the process-wide Collibra table name index around each test"""
+        CollibraTableNameIndex.reset()
+        yield
+        CollibraTableNameIndex.reset()
+
     @pytest.fixture
     def mock_smus_adapter(self):
         """Mock SMUS adapter"""
@@ -38,8 +59,8 @@ class TestProjectUserListingSyncBusinessLogic:
             ]
         }
         mock_smus_adapter.get_project.return_value = {'name': 'Project1'}
-        mock_collibra_adapter.get_or_create_aws_project.return_value = {'id': 'collibra-proj-1'}
-        mock_smus_adapter.search_all_listings.return_value = []
+        mock_collibra_adapter.create_aws_project.return_value = {'id': 'collibra-proj-1'}
+        mock_smus_adapter.iter_listings.return_value = []
         mock_smus_adapter.list_all_users_in_project.return_value = []
         
         event = ProjectUserListingSyncWorkflowEvent({'next_project_token': None})
@@ -57,8 +78,8 @@ class TestProjectUserListingSyncBusinessLogic:
             'nextToken': 'next-token-123'
         }
         mock_smus_adapter.get_project.return_value = {'name': 'Project1'}
-        mock_collibra_adapter.get_or_create_aws_project.return_value = {'id': 'collibra-proj-1'}
-        mock_smus_adapter.search_all_listings.return_value = []
+        mock_collibra_adapter.create_aws_project.return_value = {'id': 'collibra-proj-1'}
+        mock_smus_adapter.iter_listings.return_value = []
         mock_smus_adapter.list_all_users_in_project.return_value = []
         
         event = ProjectUserListingSyncWorkflowEvent({'next_project_token': 'old-token'})
@@ -85,58 +106,222 @@ class TestProjectUserListingSyncBusinessLogic:
     def test_sync_project_creates_collibra_project(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test sync_project creates project in Collibra"""
         mock_smus_adapter.get_project.return_value = {'name': 'TestProject'}
-        mock_collibra_adapter.get_or_create_aws_project.return_value = {'id': 'collibra-proj-1'}
-        mock_smus_adapter.search_all_listings.return_value = []
+        mock_collibra_adapter.get_all_aws_projects.return_value = []
+        mock_collibra_adapter.create_aws_project.return_value = {'id': 'collibra-proj-1'}
+        mock_smus_adapter.iter_listings.return_value = []
         mock_smus_adapter.list_all_users_in_project.return_value = []
         
         business_logic.sync_project('proj-123')
         
-        mock_collibra_adapter.get_or_create_aws_project.assert_called_once_with('TestProject', 'proj-123')
+        mock_collibra_adapter.create_aws_project.assert_called_once_with('TestProject', 'proj-123')
         mock_collibra_adapter.add_aws_project_attributes.assert_called_once_with('collibra-proj-1', 'proj-123')
         mock_logger.info.assert_any_call("Successfully synced project with id proj-123 and name TestProject to Collibra")
 
+    def test_sync_project_skips_writes_for_up_to_date_project(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test sync_project neither looks up nor updates a project whose attribute already holds the SMUS id"""
+        mock_smus_adapter.get_project.return_value = {'name': 'TestProject'}
+        mock_collibra_adapter.get_all_aws_projects.return_value = [
+            {'id': 'collibra-proj-1', 'displayName': 'TestProject', 'stringAttributes': [{'stringValue': 'proj-123'}]}
+        ]
+        mock_smus_adapter.iter_listings.return_value = []
+        mock_smus_adapter.list_all_users_in_project.return_value = []
+
+        business_logic.sync_project('proj-123')
+
+        mock_collibra_adapter.create_aws_project.assert_not_called()
+        mock_collibra_adapter.add_aws_project_attributes.assert_not_called()
+        mock_logger.info.assert_any_call("Project attribute of project TestProject is up to date in Collibra")
+
+    def test_sync_project_updates_stale_project_attribute(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test sync_project rewrites the attribute of an existing project holding a different SMUS id"""
+        mock_smus_adapter.get_project.return_value = {'name': 'TestProject'}
+        mock_collibra_adapter.get_all_aws_projects.return_value = [
+            {'id': 'collibra-proj-1', 'displayName': 'TestProject', 'stringAttributes': [{'stringValue': 'old-proj'}]}
+        ]
+        mock_smus_adapter.iter_listings.return_value = []
+        mock_smus_adapter.list_all_users_in_project.return_value = []
+
+        business_logic.sync_project('proj-123')
+
+        mock_collibra_adapter.create_aws_project.assert_not_called()
+        mock_collibra_adapter.add_aws_project_attributes.assert_called_once_with('collibra-proj-1', 'proj-123')
+
     def test_associate_project_with_listings(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
-        """Test associate_project_with_listings creates relations"""
-        mock_smus_adapter.search_all_listings.return_value = [
+        """Test associate_project_with_listings creates all relations with a single bulk call"""
+        mock_smus_adapter.iter_listings.return_value = [
             {'assetListing': {'name': 'customers_table'}},
             {'assetListing': {'name': 'orders_table'}}
         ]
-        mock_collibra_adapter.get_table_by_name.side_effect = [
-            {'id': 'table-1'},
-            {'id': 'table-2'}
+        mock_collibra_adapter.get_all_table_names.return_value = [
+            {'id': 'table-1', 'displayName': 'customers_table'},
+            {'id': 'table-2', 'displayName': 'orders_table'}
         ]
+        mock_collibra_adapter.create_relations.return_value = bulk_write_result(
+            created=[{'targetId': 'table-1'}, {'targetId': 'table-2'}])
         collibra_project = {'id': 'proj-1'}
         
         business_logic.associate_project_with_listings('smus-proj-1', collibra_project)
         
-        assert mock_collibra_adapter.create_relation.call_count == 2
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
+        mock_collibra_adapter.create_relations.assert_called_once_with([
+            ('proj-1', 'table-1', 'test-relation-type-id'),
+            ('proj-1', 'table-2', 'test-relation-type-id')
+        ])
+        mock_collibra_adapter.create_relation.assert_not_called()
         mock_logger.info.assert_any_call("Successfully associated project proj-1 with asset table-1")
 
+    def test_associate_project_with_listings_scans_collibra_tables_once(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test the table name index built for the first project is reused for the following projects"""
+        mock_smus_adapter.iter_listings.return_value = [
+            {'assetListing': {'name': 'customers_table'}}
+        ]
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': 'table-1', 'displayName': 'customers_table'}]
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+        business_logic.associate_project_with_listings('smus-proj-2', {'id': 'proj-2'})
+
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
+        assert mock_collibra_adapter.create_relations.call_count == 2
+
+    def test_associate_project_with_listings_skips_existing_relations(self, business_logic, mock_smus_adapter,
+                                                                       mock_collibra_adapter, mock_logger):
+        """Test relations already present in Collibra are not written again"""
+        mock_smus_adapter.iter_listings.return_value = [
+            {'assetListing': {'name': 'customers_table'}},
+            {'assetListing': {'name': 'orders_table'}},
+            {'assetListing': {'name': 'customers_table'}}
+        ]
+        mock_collibra_adapter.get_all_table_names.return_value = [
+            {'id': 'table-1', 'displayName': 'customers_table'},
+            {'id': 'table-2', 'displayName': 'orders_table'}
+        ]
+        mock_collibra_adapter.get_related_asset_ids.return_value = {'table-1'}
+        mock_collibra_adapter.create_relations.return_value = bulk_write_result(created=[{'targetId': 'table-2'}])
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+
+        mock_collibra_adapter.get_related_asset_ids.assert_called_once_with('proj-1', ['table-1', 'table-2'],
+                                                                            'test-relation-type-id')
+        mock_collibra_adapter.create_relations.assert_called_once_with([('proj-1', 'table-2', 'test-relation-type-id')])
+        mock_collibra_adapter.get_all_aws_projects.assert_not_called()
+
+    def test_associate_project_with_listings_looks_up_relation_batches_concurrently(
+            self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test the relation lookups of all batches of a project are in flight at the same time"""
+        table_names = [f"table_{i:05d}" for i in range(3 * COLLIBRA_MAX_LOOKUP_BATCH_SIZE)]
+        mock_smus_adapter.iter_listings.return_value = [{'assetListing': {'name': name}} for name in table_names]
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': f"id-{name}", 'displayName': name}
+                                                                  for name in table_names]
+        all_batches_in_flight = threading.Barrier(3, timeout=5)
+
+        def get_related_asset_ids(project_id, asset_ids, relation_type_id):
+            all_batches_in_flight.wait()
+            return set()
+
+        mock_collibra_adapter.get_related_asset_ids.side_effect = get_related_asset_ids
+        mock_collibra_adapter.create_relations.return_value = bulk_write_result()
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+
+        relations, = mock_collibra_adapter.create_relations.call_args.args
+        assert [target_id for _, target_id, _ in relations] == [f"id-{name}" for name in table_names]
+
+    def test_associate_project_with_listings_skips_more_than_a_thousand_existing_relations(
+            self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test existing relations are looked up batch by batch, so none is missed for projects with many assets"""
+        table_names = [f"table_{i:05d}" for i in range(1500)]
+        mock_smus_adapter.iter_listings.return_value = [{'assetListing': {'name': name}} for name in table_names]
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': f"id-{name}", 'displayName': name}
+                                                                  for name in table_names]
+        mock_collibra_adapter.get_related_asset_ids.side_effect = \
+            lambda project_id, asset_ids, relation_type_id: set(asset_ids)
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+
+        assert mock_collibra_adapter.get_related_asset_ids.call_count == 15
+        assert all(len(call.args[1]) <= COLLIBRA_MAX_LOOKUP_BATCH_SIZE
+                   for call in mock_collibra_adapter.get_related_asset_ids.call_args_list)
+        mock_collibra_adapter.create_relations.assert_not_called()
+        mock_logger.info.assert_any_call("Project proj-1 is already associated with all of its assets in Collibra")
+
+    def test_associate_project_with_listings_skips_assets_whose_relations_failed_to_load(
+            self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test assets are not associated when their existing relations couldn't be looked up"""
+        mock_smus_adapter.iter_listings.return_value = [{'assetListing': {'name': 'customers_table'}}]
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': 'table-1', 'displayName': 'customers_table'}]
+        mock_collibra_adapter.get_related_asset_ids.side_effect = Exception("Collibra unavailable")
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+
+        mock_collibra_adapter.create_relations.assert_not_called()
+        assert any('Failed to fetch relations of project proj-1' in str(call) for call in mock_logger.warn.call_args_list)
+
     def test_associate_project_with_listings_skips_missing_tables(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test associate_project_with_listings skips tables not in Collibra"""
-        mock_smus_adapter.search_all_listings.return_value = [
+        mock_smus_adapter.iter_listings.return_value = [
             {'assetListing': {'name': 'nonexistent_table'}}
         ]
-        mock_collibra_adapter.get_table_by_name.side_effect = Exception("Table not found")
+        mock_collibra_adapter.get_all_table_names.return_value = []
+        mock_collibra_adapter.get_tables_by_names.return_value = {}
         collibra_project = {'id': 'proj-1'}
         
         business_logic.associate_project_with_listings('smus-proj-1', collibra_project)
         
-        mock_collibra_adapter.create_relation.assert_not_called()
+        mock_collibra_adapter.get_tables_by_names.assert_called_once_with(['nonexistent_table'])
+        mock_collibra_adapter.create_relations.assert_not_called()
         mock_logger.warn.assert_any_call("Asset with name nonexistent_table doesn't exist in Collibra. Skipping.")
 
+    def test_associate_project_with_listings_finds_tables_created_after_index(self, business_logic, mock_smus_adapter,
+                                                                              mock_collibra_adapter):
+        """Test tables missing from the index are looked up by name in one request and added to the index"""
+        mock_smus_adapter.iter_listings.return_value = [
+            {'assetListing': {'name': 'customers_table'}},
+            {'assetListing': {'name': 'orders_table'}}
+        ]
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': 'table-1', 'displayName': 'customers_table'}]
+        mock_collibra_adapter.get_tables_by_names.return_value = {
+            'orders_table': {'id': 'table-2', 'displayName': 'orders_table'}}
+
+        business_logic.associate_project_with_listings('smus-proj-1', {'id': 'proj-1'})
+        business_logic.associate_project_with_listings('smus-proj-2', {'id': 'proj-2'})
+
+        mock_collibra_adapter.get_tables_by_names.assert_called_once_with(['orders_table'])
+        mock_collibra_adapter.create_relations.assert_called_with([
+            ('proj-2', 'table-1', 'test-relation-type-id'),
+            ('proj-2', 'table-2', 'test-relation-type-id')
+        ])
+
+    def test_associate_project_with_listings_skips_tables_when_lookup_fails(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test associate_project_with_listings skips tables when the table name index fails to load"""
+        mock_smus_adapter.iter_listings.return_value = [
+            {'assetListing': {'name': 'customers_table'}},
+            {'assetListing': {'name': 'orders_table'}}
+        ]
+        mock_collibra_adapter.get_all_table_names.side_effect = Exception("Collibra unavailable")
+        collibra_project = {'id': 'proj-1'}
+        
+        business_logic.associate_project_with_listings('smus-proj-1', collibra_project)
+        business_logic.associate_project_with_listings('smus-proj-2', {'id': 'proj-2'})
+        
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
+        mock_collibra_adapter.get_tables_by_names.assert_not_called()
+        mock_collibra_adapter.create_relations.assert_not_called()
+        mock_logger.warn.assert_called()
+
     def test_associate_project_with_listings_handles_relation_creation_failure(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test associate_project_with_listings handles relation creation failures"""
-        mock_smus_adapter.search_all_listings.return_value = [
+        mock_smus_adapter.iter_listings.return_value = [
             {'assetListing': {'name': 'customers_table'}}
         ]
-        mock_collibra_adapter.get_table_by_name.return_value = {'id': 'table-1'}
-        mock_collibra_adapter.create_relation.side_effect = Exception("Relation already exists")
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': 'table-1', 'displayName': 'customers_table'}]
+        mock_collibra_adapter.create_relations.return_value = bulk_write_result(
+            failed=[({'targetId': 'table-1'}, "Relation already exists")])
         collibra_project = {'id': 'proj-1'}
         
         business_logic.associate_project_with_listings('smus-proj-1', collibra_project)
         
-        mock_logger.warn.assert_called()
+        mock_logger.warn.assert_any_call(
+            "Failed to associate project proj-1 with asset table-1. Exception: Relation already exists")
 
     def test_sync_users_and_associate_with_projects(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test sync_users_and_associate_with_projects syncs SSO users"""
@@ -147,14 +332,17 @@ class TestProjectUserListingSyncBusinessLogic:
             'type': 'SSO',
             'details': {'sso': {'username': 'testuser'}}
         }
-        mock_collibra_adapter.get_or_create_aws_user.return_value = {
-            'id': 'collibra-user-1'
-        }
+        mock_collibra_adapter.get_all_aws_users.return_value = [
+            {'id': 'collibra-user-1', 'displayName': 'testuser'}
+        ]
+        mock_collibra_adapter.add_aws_users_attributes.return_value = bulk_write_result(
+            created=[{'assetId': 'collibra-user-1'}])
         
         business_logic.sync_users_and_associate_with_projects('proj-1', 'TestProject')
         
-        mock_collibra_adapter.get_or_create_aws_user.assert_called_once_with('testuser')
-        mock_collibra_adapter.add_aws_user_attributes.assert_called_once_with('collibra-user-1', 'TestProject')
+        mock_collibra_adapter.get_all_aws_users.assert_called_once()
+        mock_collibra_adapter.create_aws_users.assert_not_called()
+        mock_collibra_adapter.add_aws_users_attributes.assert_called_once_with([('collibra-user-1', 'TestProject')])
 
     def test_sync_users_skips_iam_users(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
         """Test sync_users_and_associate_with_projects skips IAM users"""
@@ -167,7 +355,8 @@ class TestProjectUserListingSyncBusinessLogic:
         
         business_logic.sync_users_and_associate_with_projects('proj-1', 'TestProject')
         
-        mock_collibra_adapter.get_or_create_aws_user.assert_not_called()
+        mock_collibra_adapter.create_aws_users.assert_not_called()
+        mock_collibra_adapter.add_aws_users_attributes.assert_not_called()
 
     def test_sync_users_skips_adding_duplicate_project_attribute(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test sync_users_and_associate_with_projects skips duplicate project attributes"""
@@ -178,18 +367,62 @@ class TestProjectUserListingSyncBusinessLogic:
             'type': 'SSO',
             'details': {'sso': {'username': 'testuser'}}
         }
-        mock_collibra_adapter.get_or_create_aws_user.return_value = {
+        mock_collibra_adapter.get_all_aws_users.return_value = [{
             'id': 'collibra-user-1',
+            'displayName': 'testuser',
             'stringAttributes': [
                 {'stringValue': 'TestProject'}  # Already has this project
             ]
-        }
+        }]
         
         business_logic.sync_users_and_associate_with_projects('proj-1', 'TestProject')
         
-        mock_collibra_adapter.add_aws_user_attributes.assert_not_called()
+        mock_collibra_adapter.add_aws_users_attributes.assert_not_called()
         mock_logger.info.assert_any_call("Should add project attribute is False for user testuser")
 
+    def test_sync_users_creates_missing_users_in_bulk(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test sync_users_and_associate_with_projects creates users missing in Collibra with a single bulk call"""
+        mock_smus_adapter.list_all_users_in_project.return_value = [
+            {'memberDetails': {'user': {'userId': 'user-1'}}},
+            {'memberDetails': {'user': {'userId': 'user-2'}}}
+        ]
+        mock_smus_adapter.get_user_profile.side_effect = [
+            {'type': 'SSO', 'details': {'sso': {'username': 'alice'}}},
+            {'type': 'SSO', 'details': {'sso': {'username': 'bob'}}}
+        ]
+        mock_collibra_adapter.get_all_aws_users.return_value = []
+        mock_collibra_adapter.create_aws_users.return_value = bulk_write_result(
+            created=[{'name': 'alice'}], failed=[({'name': 'bob'}, "Invalid name")])
+        mock_collibra_adapter.add_aws_users_attributes.return_value = bulk_write_result(
+            created=[{'assetId': 'created-0'}])
+
+        business_logic.sync_users_and_associate_with_projects('proj-1', 'TestProject')
+
+        mock_collibra_adapter.create_aws_users.assert_called_once_with(['alice', 'bob'])
+        mock_collibra_adapter.add_aws_users_attributes.assert_called_once_with([('created-0', 'TestProject')])
+        mock_logger.warn.assert_any_call("Failed to create user bob in Collibra. Exception: Invalid name")
+
+    def test_sync_users_loads_user_directory_once_across_projects(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test users of several projects are diffed against a single load of the Collibra user directory"""
+        mock_smus_adapter.list_all_users_in_project.return_value = [
+            {'memberDetails': {'user': {'userId': 'user-1'}}}
+        ]
+        mock_smus_adapter.get_user_profile.return_value = {
+            'type': 'SSO',
+            'details': {'sso': {'username': 'alice'}}
+        }
+        mock_collibra_adapter.get_all_aws_users.return_value = []
+        mock_collibra_adapter.create_aws_users.return_value = bulk_write_result(created=[{'name': 'alice'}])
+        mock_collibra_adapter.add_aws_users_attributes.return_value = bulk_write_result(
+            created=[{'assetId': 'created-0'}])
+
+        business_logic.sync_users_and_associate_with_projects('proj-1', 'ProjectA')
+        business_logic.sync_users_and_associate_with_projects('proj-1', 'ProjectA')
+
+        mock_collibra_adapter.get_all_aws_users.assert_called_once()
+        mock_collibra_adapter.create_aws_users.assert_called_once_with(['alice'])
+        mock_collibra_adapter.add_aws_users_attributes.assert_called_once_with([('created-0', 'ProjectA')])
+
     def test_sync_users_handles_user_sync_failure(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test sync_users_and_associate_with_projects handles user sync failures"""
         mock_smus_adapter.list_all_users_in_project.return_value = [
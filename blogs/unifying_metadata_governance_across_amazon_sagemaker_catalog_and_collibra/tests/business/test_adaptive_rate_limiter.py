@@ -0,0 +1,83 @@
+"""
+Unit tests for lambda/business/AdaptiveRateLimiter.py
+"""
+import pytest
+
+from business.AdaptiveRateLimiter import AdaptiveRateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.unit
+class TestAdaptiveRateLimiter:
+    """Tests for AdaptiveRateLimiter class"""
+
+    @pytest.fixture
+    def clock(self):
+        """Provides a fake clock"""
+        return FakeClock()
+
+    def test_acquire_allows_burst_up_to_rate_without_waiting(self, clock):
+        """Test acquire does not wait while the bucket has tokens"""
+        limiter = AdaptiveRateLimiter(5, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+    def test_acquire_waits_for_refill_when_bucket_is_empty(self, clock):
+        """Test acquire waits one interval of the current rate once the bucket is drained"""
+        limiter = AdaptiveRateLimiter(5, clock=clock, sleep=clock.sleep)
+        for _ in range(5):
+            limiter.acquire()
+
+        limiter.acquire()
+
+        assert clock.sleeps == [pytest.approx(0.2)]
+
+    def test_on_throttle_halves_rate_down_to_min_rate(self, clock):
+        """Test on_throttle applies multiplicative decrease bounded by min_rate"""
+        limiter = AdaptiveRateLimiter(8, min_rate=1, clock=clock, sleep=clock.sleep)
+
+        limiter.on_throttle()
+        assert limiter.rate == 4
+
+        for _ in range(5):
+            limiter.on_throttle()
+        assert limiter.rate == 1
+
+    def test_on_success_increases_rate_up_to_max_rate(self, clock):
+        """Test on_success applies additive increase bounded by max_rate"""
+        limiter = AdaptiveRateLimiter(2, clock=clock, sleep=clock.sleep)
+        limiter.on_throttle()
+
+        limiter.on_success()
+        assert limiter.rate == pytest.approx(1.1)
+
+        for _ in range(20):
+            limiter.on_success()
+        assert limiter.rate == 2
+
+    def test_on_throttle_with_retry_after_blocks_acquire(self, clock):
+        """Test acquire waits for the Retry-After hint before sending again"""
+        limiter = AdaptiveRateLimiter(10, clock=clock, sleep=clock.sleep)
+
+        limiter.on_throttle(retry_after_in_seconds=3)
+        limiter.acquire()
+
+        assert clock.now >= 3
+        assert clock.sleeps[0] == 3
@@ -11,6 +11,13 @@ from business.AWSClientFactory import AWSClientFactory
 class TestAWSClientFactory:
     """Tests for AWSClientFactory class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_clients(self):
+        """Clear the process-wide client registry around each test"""
+        AWSClientFactory.reset()
+        yield
+        AWSClientFactory.reset()
+
     @patch('business.AWSClientFactory.boto3.client')
     def test_create_returns_boto3_client(self, mock_boto3_client):
         """Test create returns boto3 client for service"""
@@ -39,3 +46,48 @@ class TestAWSClientFactory:
         for service in services:
             AWSClientFactory.create(service)
             assert mock_boto3_client.call_args[0][0] == service
+
+    @patch('business.AWSClientFactory.boto3.client')
+    def test_create_reuses_client_per_service(self, mock_boto3_client):
+        """Test create builds one client per service and returns it on later calls"""
+        mock_boto3_client.side_effect = lambda service_name, config: MagicMock(name=service_name)
+
+        first_client = AWSClientFactory.create('datazone')
+        second_client = AWSClientFactory.create('datazone')
+        other_client = AWSClientFactory.create('ssm')
+
+        assert first_client is second_client
+        assert other_client is not first_client
+        assert mock_boto3_client.call_count == 2
+
+    @patch('business.AWSClientFactory.boto3.client')
+    def test_create_uses_tuned_config(self, mock_boto3_client):
+        """Test create configures the connection pool, adaptive retries and timeouts"""
+        AWSClientFactory.create('datazone')
+
+        config = mock_boto3_client.call_args[1]['config']
+        assert config.max_pool_connections == 25
+        assert config.retries == {'mode': 'adaptive', 'max_attempts': 10}
+        assert config.connect_timeout == 5
+        assert config.read_timeout == 30
+
+    @patch('business.AWSClientFactory.boto3.client')
+    def test_reset_creates_new_client(self, mock_boto3_client):
+        """Test a client is created again after reset"""
+        AWSClientFactory.create('datazone')
+        AWSClientFactory.reset()
+        AWSClientFactory.create('datazone')
+
+        assert mock_boto3_client.call_count == 2
+
+    @patch('business.AWSClientFactory.boto3.client')
+    def test_registered_client_is_handed_out(self, mock_boto3_client):
+        """Test a registered client is returned instead of a new boto3 client until reset"""
+        stand_in = MagicMock()
+        AWSClientFactory.register('datazone', stand_in)
+
+        assert AWSClientFactory.create('datazone') is stand_in
+        mock_boto3_client.assert_not_called()
+
+        AWSClientFactory.reset()
+        assert AWSClientFactory.create('datazone') is mock_boto3_client.return_value
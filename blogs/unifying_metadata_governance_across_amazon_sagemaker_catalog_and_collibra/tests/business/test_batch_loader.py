@@ -0,0 +1,67 @@
+"""
+Unit tests for lambda/business/BatchLoader.py
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from business.BatchLoader import BatchLoader
+
+
+@pytest.mark.unit
+class TestBatchLoader:
+    """Tests for BatchLoader class"""
+
+    @pytest.fixture
+    def batch_load_fn(self):
+        """Batch load function returning a value for every key except 'missing'"""
+        return MagicMock(side_effect=lambda keys: {key: f"value-{key}" for key in keys if key != 'missing'})
+
+    def test_get_coalesces_queued_keys_into_one_batch(self, batch_load_fn):
+        """Test get fetches all queued keys with a single batch call"""
+        loader = BatchLoader(batch_load_fn, max_batch_size=10)
+        loader.load_many(['a', 'b', 'c'])
+
+        assert loader.get('a') == 'value-a'
+        assert loader.get('b') == 'value-b'
+        assert loader.get('c') == 'value-c'
+        batch_load_fn.assert_called_once_with(['a', 'b', 'c'])
+
+    def test_get_splits_batches_by_max_batch_size(self, batch_load_fn):
+        """Test get splits pending keys into batches of max_batch_size"""
+        loader = BatchLoader(batch_load_fn, max_batch_size=2)
+        loader.load_many(['a', 'b', 'c'])
+
+        loader.get('a')
+
+        assert batch_load_fn.call_args_list[0].args[0] == ['a', 'b']
+        assert batch_load_fn.call_args_list[1].args[0] == ['c']
+
+    def test_get_deduplicates_and_caches_keys(self, batch_load_fn):
+        """Test duplicate keys are fetched once and cached values are not refetched"""
+        loader = BatchLoader(batch_load_fn, max_batch_size=10)
+        loader.load_many(['a', 'a', 'b'])
+
+        loader.get('a')
+        loader.load('a')
+        loader.get('b')
+
+        batch_load_fn.assert_called_once_with(['a', 'b'])
+
+    def test_get_returns_none_for_missing_key(self, batch_load_fn):
+        """Test get returns None when the batch doesn't contain the key"""
+        loader = BatchLoader(batch_load_fn, max_batch_size=10)
+
+        assert loader.get('missing') is None
+        assert loader.get('missing') is None
+        batch_load_fn.assert_called_once_with(['missing'])
+
+    def test_get_raises_and_retries_after_batch_failure(self):
+        """Test a failed batch raises and its keys are fetched again on the next get"""
+        batch_load_fn = MagicMock(side_effect=[Exception("Collibra unavailable"), {'a': 'value-a'}])
+        loader = BatchLoader(batch_load_fn, max_batch_size=10)
+        loader.load('a')
+
+        with pytest.raises(Exception):
+            loader.get('a')
+
+        assert loader.get('a') == 'value-a'
@@ -0,0 +1,43 @@
+"""
+Unit tests for lambda/business/CollibraAwsProjectIndex.py
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from business.CollibraAwsProjectIndex import CollibraAwsProjectIndex
+
+
+@pytest.mark.unit
+class TestCollibraAwsProjectIndex:
+    """Tests for CollibraAwsProjectIndex class"""
+
+    @pytest.fixture
+    def mock_collibra_adapter(self):
+        """Mock Collibra adapter"""
+        adapter = MagicMock()
+        adapter.get_all_aws_projects.return_value = iter([
+            {'id': 'collibra-proj-1', 'displayName': 'ProjectA', 'stringAttributes': [{'stringValue': 'smus-a'}]},
+            {'id': 'collibra-proj-2', 'displayName': 'ProjectB', 'stringAttributes': []}
+        ])
+        return adapter
+
+    def test_index_is_loaded_lazily_once(self, mock_logger, mock_collibra_adapter):
+        """Test projects are scanned on first use only"""
+        index = CollibraAwsProjectIndex(mock_logger, mock_collibra_adapter)
+        mock_collibra_adapter.get_all_aws_projects.assert_not_called()
+
+        assert index.get_project_id('ProjectA') == 'collibra-proj-1'
+        assert index.get_project_id('ProjectC') is None
+        assert index.get_smus_project_ids('collibra-proj-1') == ['smus-a']
+        assert index.get_smus_project_ids('collibra-proj-2') == []
+        mock_collibra_adapter.get_all_aws_projects.assert_called_once()
+
+    def test_written_projects_and_attributes_are_recorded(self, mock_logger, mock_collibra_adapter):
+        """Test projects and attributes written during the run are visible to later lookups"""
+        index = CollibraAwsProjectIndex(mock_logger, mock_collibra_adapter)
+
+        index.add_project('ProjectC', 'collibra-proj-3')
+        index.set_smus_project_ids('collibra-proj-3', ['smus-c'])
+
+        assert index.get_project_id('ProjectC') == 'collibra-proj-3'
+        assert index.get_smus_project_ids('collibra-proj-3') == ['smus-c']
@@ -0,0 +1,47 @@
+"""
+Unit tests for lambda/business/CollibraAwsUserDirectory.py
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from business.CollibraAwsUserDirectory import CollibraAwsUserDirectory
+
+
+@pytest.mark.unit
+class TestCollibraAwsUserDirectory:
+    """Tests for CollibraAwsUserDirectory class"""
+
+    @pytest.fixture
+    def mock_collibra_adapter(self):
+        """Mock Collibra adapter"""
+        adapter = MagicMock()
+        adapter.get_all_aws_users.return_value = iter([
+            {'id': 'user-1', 'displayName': 'alice',
+             'stringAttributes': [{'stringValue': 'ProjectA'}, {'stringValue': 'ProjectB'}]},
+            {'id': 'user-2', 'displayName': 'bob', 'stringAttributes': []}
+        ])
+        return adapter
+
+    def test_directory_is_loaded_lazily_once(self, mock_logger, mock_collibra_adapter):
+        """Test the users are scanned on first use only"""
+        directory = CollibraAwsUserDirectory(mock_logger, mock_collibra_adapter)
+        mock_collibra_adapter.get_all_aws_users.assert_not_called()
+
+        assert directory.get_user_id('alice') == 'user-1'
+        assert directory.get_user_id('carol') is None
+        assert directory.get_projects('user-1') == {'ProjectA', 'ProjectB'}
+        assert directory.get_projects('user-2') == set()
+        mock_collibra_adapter.get_all_aws_users.assert_called_once()
+
+    def test_written_users_and_projects_are_recorded(self, mock_logger, mock_collibra_adapter):
+        """Test users and project attributes created during the run are visible to later lookups"""
+        directory = CollibraAwsUserDirectory(mock_logger, mock_collibra_adapter)
+
+        directory.add_user('carol', 'user-3')
+        directory.add_project('user-3', 'ProjectA')
+        directory.add_project('user-2', 'ProjectC')
+
+        assert directory.get_user_id('carol') == 'user-3'
+        assert directory.get_projects('user-3') == {'ProjectA'}
+        assert directory.get_projects('user-2') == {'ProjectC'}
+        mock_collibra_adapter.get_all_aws_users.assert_called_once()
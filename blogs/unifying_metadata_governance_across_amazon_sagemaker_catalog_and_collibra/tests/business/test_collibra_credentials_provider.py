@@ -0,0 +1,65 @@
+"""
+Unit tests for lambda/business/CollibraCredentialsProvider.py
+"""
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from business.CollibraCredentialsProvider import CollibraCredentialsProvider
+from utils.env_utils import COLLIBRA_CREDENTIALS_TTL_IN_SECONDS
+
+
+@pytest.mark.unit
+class TestCollibraCredentialsProvider:
+    """Tests for CollibraCredentialsProvider class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_credentials(self):
+        CollibraCredentialsProvider.reset()
+        yield
+        CollibraCredentialsProvider.reset()
+
+    @pytest.fixture
+    def mock_secrets_client(self):
+        """Mock AWS Secrets Manager client"""
+        client = MagicMock()
+        client.get_secret_value.return_value = {
+            'SecretString': json.dumps({'url': 'test.collibra.com', 'username': 'test_user', 'password': 'test_pass'})
+        }
+        return client
+
+    def test_get_config_reads_secret_once(self, mock_secrets_client):
+        """Test config and token are served from the cache after the first read"""
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            config = CollibraCredentialsProvider.get_config()
+            token = CollibraCredentialsProvider.get_authorization_token()
+            CollibraCredentialsProvider.get_config()
+
+        assert config.url == 'test.collibra.com'
+        assert token == 'dGVzdF91c2VyOnRlc3RfcGFzcw=='
+        mock_secrets_client.get_secret_value.assert_called_once_with(SecretId='test-secret')
+
+    def test_get_config_reloads_secret_after_ttl(self, mock_secrets_client):
+        """Test the cached secret is reloaded once the TTL has passed"""
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            with patch('business.CollibraCredentialsProvider.time.monotonic', return_value=100.0):
+                CollibraCredentialsProvider.get_config()
+            with patch('business.CollibraCredentialsProvider.time.monotonic',
+                       return_value=100.0 + COLLIBRA_CREDENTIALS_TTL_IN_SECONDS):
+                CollibraCredentialsProvider.get_config()
+
+        assert mock_secrets_client.get_secret_value.call_count == 2
+
+    def test_refresh_reloads_secret(self, mock_secrets_client):
+        """Test refresh replaces the cached token with one built from the current secret"""
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=mock_secrets_client):
+            CollibraCredentialsProvider.get_authorization_token()
+            mock_secrets_client.get_secret_value.return_value = {
+                'SecretString': json.dumps({'url': 'test.collibra.com', 'username': 'test_user', 'password': 'rotated'})
+            }
+
+            CollibraCredentialsProvider.refresh()
+
+            assert CollibraCredentialsProvider.get_authorization_token() == 'dGVzdF91c2VyOnJvdGF0ZWQ='
+        assert mock_secrets_client.get_secret_value.call_count == 2
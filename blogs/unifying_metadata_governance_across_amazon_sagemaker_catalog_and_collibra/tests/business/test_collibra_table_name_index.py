@@ -0,0 +1,111 @@
+"""
+Unit tests for lambda/business/CollibraTableNameIndex.py
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from business.CollibraTableNameIndex import CollibraTableNameIndex
+from utils.env_utils import COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS
+
+
+@pytest.mark.unit
+class TestCollibraTableNameIndex:
+    """Tests for CollibraTableNameIndex class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_index(self):
+        CollibraTableNameIndex.reset()
+        yield
+        CollibraTableNameIndex.reset()
+
+    @pytest.fixture
+    def mock_collibra_adapter(self):
+        """Mock Collibra adapter"""
+        adapter = MagicMock()
+        adapter.get_all_table_names.side_effect = lambda: iter([
+            {'id': 'table-1', 'displayName': 'customers'},
+            {'id': 'table-2', 'displayName': 'orders'},
+            {'id': 'table-3', 'displayName': 'customers'}
+        ])
+        return adapter
+
+    def test_get_returns_first_table_with_name(self, mock_logger, mock_collibra_adapter):
+        """Test get returns the first scanned table of a name and None for unknown names"""
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+
+        assert index.get('customers') == {'id': 'table-1', 'displayName': 'customers'}
+        assert index.get('orders')['id'] == 'table-2'
+        assert index.get('unknown') is None
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
+
+    def test_index_is_shared_across_instances(self, mock_logger, mock_collibra_adapter):
+        """Test a second index instance reuses the tables scanned by the first"""
+        CollibraTableNameIndex(mock_logger, mock_collibra_adapter).get('customers')
+
+        assert CollibraTableNameIndex(mock_logger, mock_collibra_adapter).get('orders')['id'] == 'table-2'
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
+
+    def test_get_rebuilds_index_after_ttl(self, mock_logger, mock_collibra_adapter):
+        """Test the index is rebuilt once it is older than the TTL"""
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+
+        with patch('business.CollibraTableNameIndex.time.monotonic', return_value=100.0):
+            index.get('customers')
+        with patch('business.CollibraTableNameIndex.time.monotonic',
+                   return_value=100.0 + COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS - 1):
+            index.get('customers')
+        with patch('business.CollibraTableNameIndex.time.monotonic',
+                   return_value=100.0 + COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS):
+            index.get('customers')
+
+        assert mock_collibra_adapter.get_all_table_names.call_count == 2
+
+    def test_refresh_rebuilds_index(self, mock_logger, mock_collibra_adapter):
+        """Test refresh rescans the tables so newly created tables are found"""
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+        assert index.get('payments') is None
+        mock_collibra_adapter.get_all_table_names.side_effect = lambda: iter([{'id': 'table-4', 'displayName': 'payments'}])
+
+        index.refresh()
+
+        assert index.get('payments')['id'] == 'table-4'
+
+    def test_failed_load_is_retried_after_interval(self, mock_logger, mock_collibra_adapter):
+        """Test a scan failure is raised by every lookup without rescanning until the retry interval has passed"""
+        mock_collibra_adapter.get_all_table_names.side_effect = Exception("Collibra unavailable")
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+
+        with patch('business.CollibraTableNameIndex.time.monotonic', return_value=100.0):
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    index.get('customers')
+        assert mock_collibra_adapter.get_all_table_names.call_count == 1
+
+        mock_collibra_adapter.get_all_table_names.side_effect = lambda: iter([{'id': 'table-1', 'displayName': 'customers'}])
+        with patch('business.CollibraTableNameIndex.time.monotonic',
+                   return_value=100.0 + CollibraTableNameIndex.FAILED_LOAD_RETRY_INTERVAL_IN_SECONDS):
+            assert index.get('customers')['id'] == 'table-1'
+
+    def test_failed_reload_serves_previous_index(self, mock_logger, mock_collibra_adapter):
+        """Test the previous index keeps answering lookups while a rebuild fails"""
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+        with patch('business.CollibraTableNameIndex.time.monotonic', return_value=100.0):
+            index.get('customers')
+
+        mock_collibra_adapter.get_all_table_names.side_effect = Exception("Collibra unavailable")
+        with patch('business.CollibraTableNameIndex.time.monotonic',
+                   return_value=100.0 + COLLIBRA_TABLE_NAME_INDEX_TTL_IN_SECONDS):
+            assert index.get('orders')['id'] == 'table-2'
+            assert index.get('orders')['id'] == 'table-2'
+
+        assert mock_collibra_adapter.get_all_table_names.call_count == 2
+
+    def test_add_makes_table_available(self, mock_logger, mock_collibra_adapter):
+        """Test a table added after the scan is found without rebuilding the index"""
+        index = CollibraTableNameIndex(mock_logger, mock_collibra_adapter)
+        index.get('customers')
+
+        index.add({'id': 'table-4', 'displayName': 'payments'})
+
+        assert index.get('payments')['id'] == 'table-4'
+        mock_collibra_adapter.get_all_table_names.assert_called_once()
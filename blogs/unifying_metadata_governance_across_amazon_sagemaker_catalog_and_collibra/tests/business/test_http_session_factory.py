@@ -0,0 +1,36 @@
+"""
+Unit tests for lambda/business/HTTPSessionFactory.py
+"""
+import pytest
+
+from business.HTTPSessionFactory import HTTPSessionFactory
+
+
+@pytest.mark.unit
+class TestHTTPSessionFactory:
+    """Tests for HTTPSessionFactory class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_session(self):
+        HTTPSessionFactory.reset()
+        yield
+        HTTPSessionFactory.reset()
+
+    def test_get_returns_same_session_across_calls(self):
+        """Test get reuses the process-wide session"""
+        assert HTTPSessionFactory.get() is HTTPSessionFactory.get()
+
+    def test_get_mounts_pooled_adapter_with_pool_size(self):
+        """Test get mounts an HTTP adapter sized to the requested pool"""
+        session = HTTPSessionFactory.get(pool_size=25)
+
+        adapter = session.get_adapter('https://test.collibra.com')
+        assert adapter._pool_maxsize == 25
+
+    def test_reset_creates_new_session_on_next_get(self):
+        """Test reset discards the cached session"""
+        session = HTTPSessionFactory.get()
+
+        HTTPSessionFactory.reset()
+
+        assert HTTPSessionFactory.get() is not session
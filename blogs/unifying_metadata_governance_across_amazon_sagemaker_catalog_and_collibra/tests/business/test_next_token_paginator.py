@@ -0,0 +1,70 @@
+"""
+Unit tests for lambda/business/NextTokenPaginator.py
+"""
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from business.NextTokenPaginator import NextTokenPaginator
+
+
+@pytest.mark.unit
+class TestNextTokenPaginator:
+    """Tests for NextTokenPaginator class"""
+
+    @pytest.fixture
+    def fetch_page(self):
+        """Fetches three pages of two items each"""
+        pages = {
+            None: {'items': [{'id': '1'}, {'id': '2'}], 'nextToken': 'token-2'},
+            'token-2': {'items': [{'id': '3'}, {'id': '4'}], 'nextToken': 'token-3'},
+            'token-3': {'items': [{'id': '5'}, {'id': '6'}]},
+        }
+        return MagicMock(side_effect=lambda next_token: pages[next_token])
+
+    @pytest.mark.parametrize('prefetch', [False, True])
+    def test_iterates_over_items_of_all_pages(self, fetch_page, prefetch):
+        """Test all items are yielded in page order"""
+        items = list(NextTokenPaginator(fetch_page, prefetch=prefetch))
+
+        assert [item['id'] for item in items] == ['1', '2', '3', '4', '5', '6']
+        assert fetch_page.call_count == 3
+
+    def test_stops_fetching_when_caller_stops(self, fetch_page):
+        """Test no further pages are fetched once the caller stops iterating"""
+        for item in NextTokenPaginator(fetch_page):
+            if item['id'] == '2':
+                break
+
+        fetch_page.assert_called_once_with(None)
+
+    def test_uses_items_key(self):
+        """Test items are read from the configured key"""
+        fetch_page = MagicMock(return_value={'members': [{'id': 'user-1'}]})
+
+        assert list(NextTokenPaginator(fetch_page, items_key='members')) == [{'id': 'user-1'}]
+
+    def test_prefetch_fetches_next_page_while_current_page_is_consumed(self):
+        """Test the next page is requested before the caller asks for its items"""
+        second_page_requested = threading.Event()
+
+        def fetch_page(next_token):
+            if next_token is None:
+                return {'items': [{'id': '1'}], 'nextToken': 'token-2'}
+            second_page_requested.set()
+            return {'items': [{'id': '2'}]}
+
+        items = iter(NextTokenPaginator(fetch_page, prefetch=True))
+        next(items)
+
+        assert second_page_requested.wait(timeout=5)
+        assert [item['id'] for item in items] == ['2']
+
+    def test_propagates_page_errors(self):
+        """Test an error fetching a page is raised to the caller"""
+        fetch_page = MagicMock(side_effect=[{'items': [{'id': '1'}], 'nextToken': 'token-2'},
+                                            Exception('Search failed')])
+
+        with pytest.raises(Exception, match='Search failed'):
+            list(NextTokenPaginator(fetch_page, prefetch=True))
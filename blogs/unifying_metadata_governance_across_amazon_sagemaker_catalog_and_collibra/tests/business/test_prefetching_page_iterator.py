@@ -0,0 +1,60 @@
+"""
+Unit tests for lambda/business/PrefetchingPageIterator.py
+"""
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from business.PrefetchingPageIterator import PrefetchingPageIterator
+
+
+@pytest.mark.unit
+class TestPrefetchingPageIterator:
+    """Tests for PrefetchingPageIterator class"""
+
+    def test_iterates_pages_following_cursor_until_empty_page(self):
+        """Test iteration follows the last seen id of each page and stops at the first empty page"""
+        fetch_page = MagicMock(side_effect=[[{'id': '1'}, {'id': '2'}], [{'id': '3'}], []])
+
+        with PrefetchingPageIterator(fetch_page, 'start') as pages:
+            result = list(pages)
+
+        assert result == [[{'id': '1'}, {'id': '2'}], [{'id': '3'}]]
+        assert [call[0][0] for call in fetch_page.call_args_list] == ['start', '2', '3']
+        assert pages.is_exhausted
+
+    def test_stops_when_cursor_does_not_advance(self):
+        """Test iteration stops without being exhausted when the same page is returned again"""
+        fetch_page = MagicMock(return_value=[{'id': '1'}])
+
+        with PrefetchingPageIterator(fetch_page) as pages:
+            result = list(pages)
+
+        assert result == [[{'id': '1'}]]
+        assert not pages.is_exhausted
+
+    def test_prefetches_next_page_while_current_page_is_processed(self):
+        """Test the next page is requested before the consumer asks for it"""
+        next_page_requested = threading.Event()
+
+        def fetch_page(last_seen_id):
+            if last_seen_id is None:
+                return [{'id': '1'}]
+            next_page_requested.set()
+            return []
+
+        with PrefetchingPageIterator(fetch_page) as pages:
+            next(pages)
+            assert next_page_requested.wait(timeout=5)
+
+    def test_propagates_fetch_failures(self):
+        """Test failures of the page fetch are raised to the consumer"""
+        fetch_page = MagicMock(side_effect=Exception("Collibra unavailable"))
+
+        with PrefetchingPageIterator(fetch_page) as pages:
+            with pytest.raises(Exception) as exc_info:
+                next(pages)
+
+        assert 'Collibra unavailable' in str(exc_info.value)
+        assert list(pages) == []
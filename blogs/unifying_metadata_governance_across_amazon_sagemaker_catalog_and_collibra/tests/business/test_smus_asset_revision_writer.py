@@ -0,0 +1,62 @@
+"""
+Unit tests for lambda/business/SMUSAssetRevisionWriter.py
+"""
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+from unittest.mock import MagicMock
+
+from business.SMUSAssetRevisionWriter import SMUSAssetRevisionWriter
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'CreateAssetRevision')
+
+
+@pytest.mark.unit
+class TestSMUSAssetRevisionWriter:
+    """Tests for SMUSAssetRevisionWriter class"""
+
+    @pytest.fixture
+    def mock_smus_adapter(self):
+        """Mock SMUS adapter"""
+        return MagicMock()
+
+    def test_wait_reports_completed_revisions(self, mock_logger, mock_smus_adapter):
+        """Test all submitted revisions are written with their forms and optional arguments"""
+        with SMUSAssetRevisionWriter(mock_logger, mock_smus_adapter) as writer:
+            writer.submit('customers', 'asset-1', [{'formName': 'form'}], description='Customers')
+            writer.submit('orders', 'asset-2', [])
+            result = writer.wait()
+
+        assert sorted(result.completed) == [('customers', 'asset-1'), ('orders', 'asset-2')]
+        assert result.failed == []
+        mock_smus_adapter.create_asset_revision.assert_any_call('customers', 'asset-1', [{'formName': 'form'}],
+                                                                description='Customers')
+
+    def test_revisions_are_written_concurrently(self, mock_logger, mock_smus_adapter):
+        """Test revisions are written on several workers at once"""
+        all_writes_started = threading.Barrier(3, timeout=5)
+        mock_smus_adapter.create_asset_revision.side_effect = lambda *args, **kwargs: all_writes_started.wait()
+
+        with SMUSAssetRevisionWriter(mock_logger, mock_smus_adapter, max_workers=3) as writer:
+            for i in range(3):
+                writer.submit(f'table-{i}', f'asset-{i}', [])
+            result = writer.wait()
+
+        assert len(result.completed) == 3
+
+    @pytest.mark.parametrize('code', ['ThrottlingException', 'ValidationException'])
+    def test_failed_revisions_are_not_retried(self, mock_logger, mock_smus_adapter, code):
+        """Test a failed write is reported as failed without retrying on top of the botocore retries"""
+        mock_smus_adapter.create_asset_revision.side_effect = [client_error(code), {'id': 'asset-2'}]
+
+        with SMUSAssetRevisionWriter(mock_logger, mock_smus_adapter, max_workers=1) as writer:
+            writer.submit('customers', 'asset-1', [])
+            writer.submit('orders', 'asset-2', [])
+            result = writer.wait()
+
+        assert result.completed == [('orders', 'asset-2')]
+        assert result.failed[0][:2] == ('customers', 'asset-1')
+        assert mock_smus_adapter.create_asset_revision.call_count == 2
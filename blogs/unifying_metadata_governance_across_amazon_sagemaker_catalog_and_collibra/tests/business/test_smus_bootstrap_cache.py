@@ -0,0 +1,87 @@
+"""
+Unit tests for lambda/business/SMUSBootstrapCache.py
+"""
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from business.SMUSBootstrapCache import SMUSBootstrapCache
+
+
+@pytest.mark.unit
+class TestSMUSBootstrapCache:
+    """Tests for SMUSBootstrapCache class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Clear the process-wide cache around each test"""
+        SMUSBootstrapCache.reset()
+        yield
+        SMUSBootstrapCache.reset()
+
+    def test_get_loads_value_once(self):
+        """Test get only calls the loader on the first lookup of a key"""
+        load = MagicMock(return_value='value-1')
+
+        assert SMUSBootstrapCache.get('key', load) == 'value-1'
+        assert SMUSBootstrapCache.get('key', load) == 'value-1'
+
+        load.assert_called_once()
+
+    def test_get_does_not_cache_none(self):
+        """Test a missing identifier is looked up again on the next get"""
+        load = MagicMock(side_effect=[None, 'value-1'])
+
+        assert SMUSBootstrapCache.get('key', load) is None
+        assert SMUSBootstrapCache.get('key', load) == 'value-1'
+
+    def test_invalidate_reloads_value(self):
+        """Test an invalidated key is loaded again while other keys stay cached"""
+        SMUSBootstrapCache.get('key', lambda: 'value-1')
+        SMUSBootstrapCache.get('other-key', lambda: 'other-value')
+
+        SMUSBootstrapCache.invalidate('key')
+
+        assert SMUSBootstrapCache.get('key', lambda: 'value-2') == 'value-2'
+        assert SMUSBootstrapCache.get('other-key', lambda: 'new-value') == 'other-value'
+
+    def test_loading_key_does_not_block_other_keys(self):
+        """Test a slow load of one key doesn't hold up lookups of other keys"""
+        load_started = threading.Event()
+        release_load = threading.Event()
+
+        def slow_load():
+            load_started.set()
+            release_load.wait(timeout=5)
+            return 'slow-value'
+
+        SMUSBootstrapCache.get('other-key', lambda: 'other-value')
+        loader = threading.Thread(target=SMUSBootstrapCache.get, args=('slow-key', slow_load))
+        loader.start()
+        assert load_started.wait(timeout=5)
+
+        assert SMUSBootstrapCache.get('other-key', MagicMock()) == 'other-value'
+        assert SMUSBootstrapCache.get('new-key', lambda: 'new-value') == 'new-value'
+        release_load.set()
+        loader.join(timeout=5)
+        assert SMUSBootstrapCache.get('slow-key', MagicMock()) == 'slow-value'
+
+    def test_concurrent_gets_of_key_load_it_once(self):
+        """Test threads asking for the same key while it is loaded wait for that load instead of repeating it"""
+        all_threads_started = threading.Barrier(4, timeout=5)
+        load = MagicMock(return_value='value-1')
+        results = []
+
+        def get():
+            all_threads_started.wait()
+            results.append(SMUSBootstrapCache.get('key', load))
+
+        threads = [threading.Thread(target=get) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == ['value-1'] * 4
+        load.assert_called_once()
@@ -0,0 +1,90 @@
+"""
+Unit tests for lambda/business/SMUSProjectCache.py
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from business.SMUSProjectCache import SMUSProjectCache
+from utils.env_utils import SMUS_PROJECTS_TTL_IN_SECONDS
+
+
+@pytest.mark.unit
+class TestSMUSProjectCache:
+    """Tests for SMUSProjectCache class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        """Clear the process-wide project cache around each test"""
+        SMUSProjectCache.reset()
+        yield
+        SMUSProjectCache.reset()
+
+    @pytest.fixture
+    def mock_smus_adapter(self):
+        """Mock SMUS adapter listing two projects"""
+        adapter = MagicMock()
+        adapter.list_all_projects.return_value = [{'id': 'proj-1'}, {'id': 'proj-2'}]
+        return adapter
+
+    def test_projects_are_listed_once_across_instances(self, mock_logger, mock_smus_adapter):
+        """Test all instances share a single project listing"""
+        first_cache = SMUSProjectCache(mock_logger, mock_smus_adapter)
+        second_cache = SMUSProjectCache(mock_logger, MagicMock())
+
+        assert first_cache.get_project_ids() == ['proj-1', 'proj-2']
+        assert second_cache.contains('proj-2')
+        assert not second_cache.contains('proj-3')
+        mock_smus_adapter.list_all_projects.assert_called_once()
+
+    def test_projects_are_reloaded_after_ttl(self, mock_logger, mock_smus_adapter):
+        """Test the projects are listed again once the TTL has passed"""
+        cache = SMUSProjectCache(mock_logger, mock_smus_adapter)
+
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0):
+            cache.contains('proj-1')
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0 + SMUS_PROJECTS_TTL_IN_SECONDS - 1):
+            cache.contains('proj-1')
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0 + SMUS_PROJECTS_TTL_IN_SECONDS):
+            cache.contains('proj-1')
+
+        assert mock_smus_adapter.list_all_projects.call_count == 2
+
+    def test_refresh_reloads_projects(self, mock_logger, mock_smus_adapter):
+        """Test refresh picks up projects created since the last load"""
+        cache = SMUSProjectCache(mock_logger, mock_smus_adapter)
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0):
+            assert not cache.contains('proj-3')
+
+        mock_smus_adapter.list_all_projects.return_value = [{'id': 'proj-3'}]
+        refresh_time = 100.0 + SMUSProjectCache.REFRESH_DEBOUNCE_INTERVAL_IN_SECONDS
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=refresh_time):
+            cache.refresh()
+
+            assert cache.contains('proj-3')
+            assert cache.get_project_ids() == ['proj-3']
+
+    def test_refresh_is_debounced(self, mock_logger, mock_smus_adapter):
+        """Test a burst of refreshes reloads the projects at most once per debounce interval"""
+        cache = SMUSProjectCache(mock_logger, mock_smus_adapter)
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0):
+            cache.refresh()
+            cache.refresh()
+        with patch('business.SMUSProjectCache.time.monotonic',
+                   return_value=100.0 + SMUSProjectCache.REFRESH_DEBOUNCE_INTERVAL_IN_SECONDS - 1):
+            cache.refresh()
+
+        assert mock_smus_adapter.list_all_projects.call_count == 1
+
+    def test_missing_project_reloads_projects_once(self, mock_logger, mock_smus_adapter):
+        """Test a project created after the last load is found by reloading the projects on a miss"""
+        cache = SMUSProjectCache(mock_logger, mock_smus_adapter)
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=100.0):
+            cache.get_project_ids()
+
+        mock_smus_adapter.list_all_projects.return_value = [{'id': 'proj-1'}, {'id': 'proj-3'}]
+        reload_time = 100.0 + SMUSProjectCache.MISS_RELOAD_INTERVAL_IN_SECONDS
+        with patch('business.SMUSProjectCache.time.monotonic', return_value=reload_time):
+            assert cache.contains('proj-3')
+            assert not cache.contains('proj-4')
+
+        assert mock_smus_adapter.list_all_projects.call_count == 2
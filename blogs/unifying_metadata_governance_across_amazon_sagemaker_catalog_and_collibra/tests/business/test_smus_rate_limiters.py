@@ -0,0 +1,29 @@
+"""
+Unit tests for lambda/business/SMUSRateLimiters.py
+"""
+import pytest
+
+from business.SMUSRateLimiters import SMUSRateLimiters
+from utils.smus_constants import SMUS_OPERATION_MAX_REQUESTS_PER_SECOND, SMUS_DEFAULT_MAX_REQUESTS_PER_SECOND
+
+
+@pytest.mark.unit
+class TestSMUSRateLimiters:
+    """Tests for SMUSRateLimiters class"""
+
+    @pytest.fixture(autouse=True)
+    def reset_rate_limiters(self):
+        """Clear the process-wide DataZone rate limiters around each test"""
+        SMUSRateLimiters.reset()
+        yield
+        SMUSRateLimiters.reset()
+
+    def test_get_returns_one_rate_limiter_per_operation(self):
+        """Test the same operation shares a rate limiter while other operations get their own"""
+        assert SMUSRateLimiters.get('CreateAssetRevision') is SMUSRateLimiters.get('CreateAssetRevision')
+        assert SMUSRateLimiters.get('CreateAssetRevision') is not SMUSRateLimiters.get('GetAsset')
+
+    def test_get_uses_operation_limit(self):
+        """Test rate limiters start at the limit of their operation or the default limit"""
+        assert SMUSRateLimiters.get('GetAsset').rate == SMUS_OPERATION_MAX_REQUESTS_PER_SECOND['GetAsset']
+        assert SMUSRateLimiters.get('ListDomains').rate == SMUS_DEFAULT_MAX_REQUESTS_PER_SECOND
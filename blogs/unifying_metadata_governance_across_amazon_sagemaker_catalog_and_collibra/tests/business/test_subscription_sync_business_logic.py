@@ -4,6 +4,8 @@ Unit tests for lambda/business/SubscriptionSyncBusinessLogic.py
 import pytest
 from unittest.mock import MagicMock, patch
 
+from business.CollibraTableNameIndex import CollibraTableNameIndex
+from business.SMUSProjectCache import SMUSProjectCache
 from business.SubscriptionSyncBusinessLogic import SubscriptionSyncBusinessLogic
 
 
@@ -11,6 +13,20 @@ from business.SubscriptionSyncBusinessLogic import SubscriptionSyncBusinessLogic
 class TestSubscriptionSyncBusinessLogic:
     """Tests for SubscriptionSyncBusinessLogic class"""
 
+    @pytest.fixture(autouse=True)
+    def reset_collibra_table_name_index(self):
+        """Clear the process-wide Collibra table name index around each test"""
+        CollibraTableNameIndex.reset()
+        yield
+        CollibraTableNameIndex.reset()
+
+    @pytest.fixture(autouse=True)
+    def reset_smus_project_cache(self):
+        """Clear the process-wide SMUS project cache around each test"""
+        SMUSProjectCache.reset()
+        yield
+        SMUSProjectCache.reset()
+
     @pytest.fixture
     def mock_smus_adapter(self):
         """Mock SMUS adapter"""
@@ -147,7 +163,7 @@ class TestSubscriptionSyncBusinessLogic:
         mock_smus_adapter.get_user_profile.return_value = {'type': 'SSO'}
         mock_smus_adapter.get_project.return_value = {'name': 'Consumer Project'}
         mock_smus_adapter.get_asset.return_value = {'name': 'customers_table'}
-        mock_collibra_adapter.get_table_by_name.return_value = {'id': 'collibra-table-1'}
+        mock_collibra_adapter.get_all_table_names.return_value = [{'id': 'collibra-table-1', 'displayName': 'customers_table'}]
         mock_collibra_adapter.start_subscription_request_creation_workflow.return_value = {'workflowId': 'wf-1'}
         
         event = {
@@ -159,9 +175,71 @@ class TestSubscriptionSyncBusinessLogic:
         
         business_logic.sync_subscription_to_collibra(event)
         
-        mock_collibra_adapter.start_subscription_request_creation_workflow.assert_called_once()
+        mock_collibra_adapter.get_tables_by_names.assert_not_called()
+        mock_collibra_adapter.start_subscription_request_creation_workflow.assert_called_once_with('collibra-table-1', 'Consumer Project')
         assert any('Successfully started subscription request workflow in Collibra' in str(call) for call in mock_logger.info.call_args_list)
 
+    def test_sync_subscription_to_collibra_looks_up_tables_missing_from_index(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test sync_subscription_to_collibra falls back to a lookup by name for tables missing from the index"""
+        mock_smus_adapter.get_user_profile.return_value = {'type': 'SSO'}
+        mock_smus_adapter.get_project.return_value = {'name': 'Consumer Project'}
+        mock_smus_adapter.get_asset.return_value = {'name': 'customers_table'}
+        mock_collibra_adapter.get_all_table_names.return_value = []
+        mock_collibra_adapter.get_tables_by_names.return_value = {'customers_table': {'id': 'collibra-table-1', 'displayName': 'customers_table'}}
+
+        event = {
+            'requesterId': 'user-1',
+            'status': 'PENDING',
+            'subscribedPrincipals': [{'id': 'proj-1'}],
+            'subscribedListings': [{'ownerProjectId': 'proj-2', 'item': {'assetListing': {'entityId': 'asset-1'}}}]
+        }
+
+        business_logic.sync_subscription_to_collibra(event)
+
+        mock_collibra_adapter.get_tables_by_names.assert_called_once_with(['customers_table'])
+        mock_collibra_adapter.start_subscription_request_creation_workflow.assert_called_once_with('collibra-table-1', 'Consumer Project')
+
+    def test_sync_subscription_to_collibra_adds_looked_up_table_to_index(self, business_logic, mock_smus_adapter, mock_collibra_adapter):
+        """Test a table found by the fallback lookup is served from the index for later subscriptions"""
+        mock_smus_adapter.get_user_profile.return_value = {'type': 'SSO'}
+        mock_smus_adapter.get_project.return_value = {'name': 'Consumer Project'}
+        mock_smus_adapter.get_asset.return_value = {'name': 'customers_table'}
+        mock_collibra_adapter.get_all_table_names.return_value = []
+        mock_collibra_adapter.get_tables_by_names.return_value = {'customers_table': {'id': 'collibra-table-1', 'displayName': 'customers_table'}}
+
+        event = {
+            'requesterId': 'user-1',
+            'status': 'PENDING',
+            'subscribedPrincipals': [{'id': 'proj-1'}],
+            'subscribedListings': [{'ownerProjectId': 'proj-2', 'item': {'assetListing': {'entityId': 'asset-1'}}}]
+        }
+
+        business_logic.sync_subscription_to_collibra(event)
+        business_logic.sync_subscription_to_collibra(event)
+
+        mock_collibra_adapter.get_tables_by_names.assert_called_once_with(['customers_table'])
+        assert mock_collibra_adapter.start_subscription_request_creation_workflow.call_count == 2
+
+    def test_sync_subscription_to_collibra_skips_table_missing_from_collibra(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
+        """Test sync_subscription_to_collibra logs an error when the table is not found in Collibra"""
+        mock_smus_adapter.get_user_profile.return_value = {'type': 'SSO'}
+        mock_smus_adapter.get_project.return_value = {'name': 'Consumer Project'}
+        mock_smus_adapter.get_asset.return_value = {'name': 'customers_table'}
+        mock_collibra_adapter.get_all_table_names.return_value = []
+        mock_collibra_adapter.get_tables_by_names.return_value = {}
+
+        event = {
+            'requesterId': 'user-1',
+            'status': 'PENDING',
+            'subscribedPrincipals': [{'id': 'proj-1'}],
+            'subscribedListings': [{'ownerProjectId': 'proj-2', 'item': {'assetListing': {'entityId': 'asset-1'}}}]
+        }
+
+        business_logic.sync_subscription_to_collibra(event)
+
+        mock_collibra_adapter.start_subscription_request_creation_workflow.assert_not_called()
+        mock_logger.error.assert_called_once()
+
     def test_sync_subscription_to_collibra_handles_exceptions(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test sync_subscription_to_collibra handles exceptions gracefully"""
         mock_smus_adapter.get_user_profile.return_value = {'type': 'SSO'}
@@ -190,7 +268,7 @@ class TestSubscriptionSyncBusinessLogic:
                 'outgoingRelations': [{'target': {'displayName': 'customers_table', 'id': 'collibra-table-1'}}]
             }
         ]
-        mock_smus_adapter.search_all_listings.return_value = [
+        mock_smus_adapter.iter_listings.return_value = [
             {'assetListing': {'listingId': 'listing-1', 'name': 'customers_table'}}
         ]
         mock_smus_adapter.search_subscription_requests.return_value = []
@@ -209,7 +287,26 @@ class TestSubscriptionSyncBusinessLogic:
         
         business_logic.start_subscription_request_sync_to_smus()
         
-        assert any('Found 0 approved requests' in str(call) for call in mock_logger.info.call_args_list)
+        assert any('Processed 0 approved requests' in str(call) for call in mock_logger.info.call_args_list)
+
+    def test_start_subscription_request_sync_to_smus_drains_all_pages_of_approved_requests(self, business_logic, mock_collibra_adapter, mock_logger):
+        """Test start_subscription_request_sync_to_smus consumes the streamed approved requests beyond a single page"""
+        def approved_requests(status):
+            for i in range(150):
+                yield {
+                    'id': f"req-{i}",
+                    'stringAttributes': [
+                        {'type': {'name': 'AWS Consumer Project Id'}, 'stringValue': 'unknown-proj'},
+                        {'type': {'name': 'AWS Producer Project Id'}, 'stringValue': 'proj-2'}
+                    ]
+                }
+
+        mock_collibra_adapter.get_subscription_requests_by_status.side_effect = approved_requests
+
+        business_logic.start_subscription_request_sync_to_smus()
+
+        assert mock_logger.warn.call_count == 150
+        mock_logger.info.assert_any_call("Processed 150 approved requests")
 
     def test_start_subscription_request_sync_to_smus_skips_existing_subscription(self, business_logic, mock_smus_adapter, mock_collibra_adapter, mock_logger):
         """Test start_subscription_request_sync_to_smus skips when subscription already exists"""
@@ -223,7 +320,7 @@ class TestSubscriptionSyncBusinessLogic:
                 'outgoingRelations': [{'target': {'displayName': 'customers_table', 'id': 'collibra-table-1'}}]
             }
         ]
-        mock_smus_adapter.search_all_listings.return_value = [
+        mock_smus_adapter.iter_listings.return_value = [
             {'assetListing': {'listingId': 'listing-1', 'name': 'customers_table'}}
         ]
         mock_smus_adapter.search_subscription_requests.return_value = [{'id': 'existing-req'}]
@@ -281,7 +378,7 @@ class TestSubscriptionSyncBusinessLogic:
                 'outgoingRelations': [{'target': {'displayName': 'nonexistent_table', 'id': 'collibra-table-1'}}]
             }
         ]
-        mock_smus_adapter.search_all_listings.return_value = []
+        mock_smus_adapter.iter_listings.return_value = []
         
         business_logic.start_subscription_request_sync_to_smus()
         
@@ -299,7 +396,7 @@ class TestSubscriptionSyncBusinessLogic:
                 'outgoingRelations': [{'target': {'displayName': 'customers_table', 'id': 'collibra-table-1'}}]
             }
         ]
-        mock_smus_adapter.search_all_listings.side_effect = Exception("Search failed")
+        mock_smus_adapter.iter_listings.side_effect = Exception("Search failed")
         
         with patch('business.SubscriptionSyncBusinessLogic.COLLIBRA_SUBSCRIPTION_REQUEST_REJECTED_STATUS_ID', 'rejected-status'):
             business_logic.start_subscription_request_sync_to_smus()
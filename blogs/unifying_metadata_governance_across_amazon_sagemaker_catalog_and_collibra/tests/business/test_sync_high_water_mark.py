@@ -0,0 +1,78 @@
+"""
+Unit tests for lambda/business/SyncHighWaterMark.py
+"""
+import json
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from business.SyncHighWaterMark import SyncHighWaterMark
+from model.CollibraAssetType import CollibraAssetType
+
+
+class ParameterNotFound(Exception):
+    pass
+
+
+@pytest.mark.unit
+class TestSyncHighWaterMark:
+    """Tests for SyncHighWaterMark class"""
+
+    @pytest.fixture
+    def mock_ssm_client(self):
+        """Mock SSM client without any stored parameter"""
+        client = MagicMock()
+        client.exceptions.ParameterNotFound = ParameterNotFound
+        client.get_parameter.side_effect = ParameterNotFound()
+        return client
+
+    def create(self, mock_logger, mock_ssm_client):
+        with patch('business.SyncHighWaterMark.AWSClientFactory.create', return_value=mock_ssm_client):
+            return SyncHighWaterMark(mock_logger, CollibraAssetType.TABLE)
+
+    def stored_state(self, mock_ssm_client):
+        return json.loads(mock_ssm_client.put_parameter.call_args[1]['Value'])
+
+    def test_modified_after_is_none_without_stored_parameter(self, mock_logger, mock_ssm_client):
+        """Test all assets are synced when no high-water mark has been stored yet"""
+        high_water_mark = self.create(mock_logger, mock_ssm_client)
+
+        assert high_water_mark.modified_after is None
+        mock_ssm_client.get_parameter.assert_called_once_with(
+            Name='/smus-collibra-integration/sync-state/test-domain-id/Table')
+
+    def test_modified_after_returns_stored_high_water_mark(self, mock_logger, mock_ssm_client):
+        """Test the stored high-water mark is loaded"""
+        mock_ssm_client.get_parameter.side_effect = None
+        mock_ssm_client.get_parameter.return_value = {
+            'Parameter': {'Value': json.dumps({'high_water_mark': '2026-01-01T00:00:00+00:00'})}
+        }
+
+        high_water_mark = self.create(mock_logger, mock_ssm_client)
+
+        assert high_water_mark.modified_after == '2026-01-01T00:00:00+00:00'
+
+    def test_complete_run_advances_high_water_mark_to_run_start(self, mock_logger, mock_ssm_client):
+        """Test a successful run advances the high-water mark to the time the run started"""
+        high_water_mark = self.create(mock_logger, mock_ssm_client)
+
+        high_water_mark.start_run()
+        run_started_at = self.stored_state(mock_ssm_client)['run_started_at']
+        high_water_mark.complete_run()
+
+        assert self.stored_state(mock_ssm_client) == {'high_water_mark': run_started_at}
+        assert high_water_mark.modified_after == run_started_at
+
+    def test_complete_run_keeps_high_water_mark_after_failed_run(self, mock_logger, mock_ssm_client):
+        """Test a run with failures does not advance the high-water mark"""
+        mock_ssm_client.get_parameter.side_effect = None
+        mock_ssm_client.get_parameter.return_value = {
+            'Parameter': {'Value': json.dumps({'high_water_mark': '2026-01-01T00:00:00+00:00'})}
+        }
+        high_water_mark = self.create(mock_logger, mock_ssm_client)
+
+        high_water_mark.start_run()
+        high_water_mark.mark_run_failed()
+        high_water_mark.complete_run()
+
+        assert self.stored_state(mock_ssm_client) == {'high_water_mark': '2026-01-01T00:00:00+00:00'}
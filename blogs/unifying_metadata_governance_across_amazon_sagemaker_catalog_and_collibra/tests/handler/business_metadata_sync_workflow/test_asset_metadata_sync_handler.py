@@ -80,3 +80,17 @@ class TestAssetMetadataSyncHandler:
         assert result["last_seen_asset_id"] == "new-id"
         assert result["other_field"] == "value"
         assert result["another_field"] == 123
+
+    @patch('handler.business_metadata_sync_workflow.asset_metadata_sync_handler.InstrumentedDataZoneClient')
+    @patch('handler.business_metadata_sync_workflow.asset_metadata_sync_handler.AssetMetadataSyncBusinessLogic')
+    def test_handle_request_flushes_datazone_metrics_when_sync_fails(self, mock_business_logic_class,
+                                                                     mock_instrumented_client_class):
+        """Test handle_request logs the DataZone operation metrics even when the sync raises"""
+        from handler.business_metadata_sync_workflow.asset_metadata_sync_handler import handle_request
+
+        mock_business_logic_class.return_value.sync.side_effect = Exception("Sync failed")
+
+        with pytest.raises(Exception, match="Sync failed"):
+            handle_request({}, MagicMock())
+
+        mock_instrumented_client_class.flush_metrics.assert_called_once()
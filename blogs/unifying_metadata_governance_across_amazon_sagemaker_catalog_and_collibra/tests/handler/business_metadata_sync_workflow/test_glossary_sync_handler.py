@@ -54,3 +54,15 @@ class TestGlossarySyncHandler:
         result = glossary_sync_handler.handle_request(event, context)
         
         assert result['last_seen_glossary_term_id'] is None
+
+    @patch('handler.business_metadata_sync_workflow.glossary_sync_handler.InstrumentedDataZoneClient')
+    @patch('handler.business_metadata_sync_workflow.glossary_sync_handler.GlossarySyncBusinessLogic')
+    def test_handle_request_flushes_datazone_metrics_when_sync_fails(self, mock_business_logic_class,
+                                                                     mock_instrumented_client_class):
+        """Test handle_request logs the DataZone operation metrics even when the sync raises"""
+        mock_business_logic_class.return_value.sync.side_effect = Exception("Sync failed")
+
+        with pytest.raises(Exception, match="Sync failed"):
+            glossary_sync_handler.handle_request({}, {})
+
+        mock_instrumented_client_class.flush_metrics.assert_called_once()
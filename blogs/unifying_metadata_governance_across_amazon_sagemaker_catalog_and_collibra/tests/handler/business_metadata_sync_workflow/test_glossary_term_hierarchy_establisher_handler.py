@@ -54,3 +54,17 @@ class TestGlossaryTermHierarchyEstablisherHandler:
         result = handle_request(event, context)
         
         assert result is event
+
+    @patch('handler.business_metadata_sync_workflow.glossary_term_hierarchy_establisher_handler.InstrumentedDataZoneClient')
+    @patch('handler.business_metadata_sync_workflow.glossary_term_hierarchy_establisher_handler.GlossaryTermHierarchyEstablisherBusinessLogic')
+    def test_handle_request_flushes_datazone_metrics_when_establish_fails(self, mock_business_logic_class,
+                                                                          mock_instrumented_client_class):
+        """Test handle_request logs the DataZone operation metrics even when establishing the hierarchy raises"""
+        from handler.business_metadata_sync_workflow.glossary_term_hierarchy_establisher_handler import handle_request
+
+        mock_business_logic_class.return_value.establish.side_effect = Exception("Establish failed")
+
+        with pytest.raises(Exception, match="Establish failed"):
+            handle_request({}, MagicMock())
+
+        mock_instrumented_client_class.flush_metrics.assert_called_once()
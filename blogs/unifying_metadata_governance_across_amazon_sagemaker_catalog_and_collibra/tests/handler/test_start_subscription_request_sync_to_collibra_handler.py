@@ -66,3 +66,47 @@ class TestStartSubscriptionRequestSyncToCollibraHandler:
         result = handle_request(event, context)
         
         assert result is event
+
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SMUSAdapter')
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SMUSProjectCache')
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SubscriptionSyncBusinessLogic')
+    def test_handle_request_refreshes_projects_on_project_event(self, mock_business_logic_class,
+                                                                mock_project_cache_class, mock_smus_adapter_class):
+        """Test handle_request refreshes the cached projects without building the subscription sync"""
+        from handler.start_subscription_request_sync_to_collibra_handler import handle_request
+
+        event = {"detail-type": "Project Created", "detail": {"data": {"id": "proj-1"}}}
+
+        result = handle_request(event, MagicMock())
+
+        assert result == event
+        mock_project_cache_class.return_value.refresh.assert_called_once()
+        mock_business_logic_class.assert_not_called()
+
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SMUSProjectCache')
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SubscriptionSyncBusinessLogic')
+    def test_handle_request_does_not_refresh_projects_on_subscription_event(self, mock_business_logic_class,
+                                                                            mock_project_cache_class):
+        """Test handle_request only refreshes the cached projects for project events"""
+        from handler.start_subscription_request_sync_to_collibra_handler import handle_request
+
+        event = {"detail-type": "Subscription Request Created", "detail": {"data": {"id": "sub-123"}}}
+
+        handle_request(event, MagicMock())
+
+        mock_project_cache_class.return_value.refresh.assert_not_called()
+        mock_business_logic_class.return_value.sync_subscription_to_collibra.assert_called_once_with({"id": "sub-123"})
+
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.InstrumentedDataZoneClient')
+    @patch('handler.start_subscription_request_sync_to_collibra_handler.SubscriptionSyncBusinessLogic')
+    def test_handle_request_flushes_datazone_metrics_when_sync_fails(self, mock_business_logic_class,
+                                                                     mock_instrumented_client_class):
+        """Test handle_request logs the DataZone operation metrics even when the sync raises"""
+        from handler.start_subscription_request_sync_to_collibra_handler import handle_request
+
+        mock_business_logic_class.return_value.sync_subscription_to_collibra.side_effect = Exception("Sync failed")
+
+        with pytest.raises(Exception, match="Sync failed"):
+            handle_request({"detail": {"data": {}}}, MagicMock())
+
+        mock_instrumented_client_class.flush_metrics.assert_called_once()
@@ -54,3 +54,18 @@ class TestStartSubscriptionRequestSyncToSmusHandler:
         result = handle_request(event, context)
         
         assert result is event
+
+    @patch('handler.start_subscription_request_sync_to_smus_handler.InstrumentedDataZoneClient')
+    @patch('handler.start_subscription_request_sync_to_smus_handler.SubscriptionSyncBusinessLogic')
+    def test_handle_request_flushes_datazone_metrics_when_sync_fails(self, mock_business_logic_class,
+                                                                     mock_instrumented_client_class):
+        """Test handle_request logs the DataZone operation metrics even when the sync raises"""
+        from handler.start_subscription_request_sync_to_smus_handler import handle_request
+
+        mock_business_logic_class.return_value.start_subscription_request_sync_to_smus.side_effect = \
+            Exception("Sync failed")
+
+        with pytest.raises(Exception, match="Sync failed"):
+            handle_request({}, MagicMock())
+
+        mock_instrumented_client_class.flush_metrics.assert_called_once()
@@ -0,0 +1 @@
+# Tests for local development tools
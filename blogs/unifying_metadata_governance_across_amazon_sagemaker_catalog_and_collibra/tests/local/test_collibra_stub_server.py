@@ -0,0 +1,159 @@
+"""
+Unit tests for local/collibra_stub_server.py
+"""
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from adapter.CollibraAdapter import CollibraAdapter
+from business.CollibraCredentialsProvider import CollibraCredentialsProvider
+from model.CollibraTable import CollibraTable
+from collibra_stub_server import CollibraStubServer, RouteFaults, SyntheticCollibraCatalog, parse_route_values
+from utils.env_utils import COLLIBRA_AWS_USER_TYPE_ID, COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID, \
+    COLLIBRA_AWS_PROJECT_TYPE_ID, COLLIBRA_AWS_PROJECT_ATTRIBUTE_TYPE_ID, COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID
+
+
+@pytest.mark.unit
+class TestCollibraStubServer:
+    """Tests for the local Collibra stand-in driven through CollibraAdapter"""
+
+    @pytest.fixture(autouse=True)
+    def reset_credentials(self):
+        """Clear the process-wide Collibra credentials cache around each test"""
+        CollibraCredentialsProvider.reset()
+        yield
+        CollibraCredentialsProvider.reset()
+
+    @pytest.fixture
+    def catalog(self):
+        """Small synthetic catalog typed with the ids of the test environment"""
+        return SyntheticCollibraCatalog(num_tables=7, num_columns_per_table=3, tables_per_database=5,
+                                        num_business_terms=10, num_users=4, num_projects=3,
+                                        num_subscription_requests=5, seed=1,
+                                        aws_user_type_id=COLLIBRA_AWS_USER_TYPE_ID,
+                                        aws_user_project_attribute_type_id=COLLIBRA_AWS_USER_PROJECT_ATTRIBUTE_TYPE_ID,
+                                        aws_project_type_id=COLLIBRA_AWS_PROJECT_TYPE_ID,
+                                        aws_project_attribute_type_id=COLLIBRA_AWS_PROJECT_ATTRIBUTE_TYPE_ID)
+
+    @pytest.fixture
+    def server(self, catalog):
+        """Stand-in server listening on a free local port"""
+        server = CollibraStubServer(("localhost", 0), catalog, username="test_user", password="test_pass")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    @pytest.fixture
+    def adapter(self, mock_logger, server):
+        """CollibraAdapter talking plain HTTP to the stand-in server"""
+        secrets_client = MagicMock()
+        secrets_client.get_secret_value.return_value = {'SecretString': json.dumps({
+            'url': f'localhost:{server.server_address[1]}', 'username': 'test_user', 'password': 'test_pass'})}
+        with patch('business.CollibraCredentialsProvider.AWSClientFactory.create', return_value=secrets_client), \
+                patch.object(CollibraAdapter, 'COLLIBRA_GRAPHQL_URL_FORMAT',
+                             "http://{collibra_config_url}/graphql/knowledgeGraph/v1"), \
+                patch.object(CollibraAdapter, 'COLLIBRA_REST_URL_FORMAT',
+                             "http://{collibra_config_url}/rest/2.0/{resource}"):
+            yield CollibraAdapter(mock_logger)
+
+    def test_catalog_with_same_seed_is_deterministic(self, catalog):
+        """Test catalogs generated from the same parameters contain the same tables"""
+        query = 'query Assets { assets(limit: 100 where: { type: { publicId: { eq: "Table" } } }) { id } }'
+        other_catalog = SyntheticCollibraCatalog(num_tables=7, num_columns_per_table=3, tables_per_database=5,
+                                                 num_business_terms=10, num_users=4, num_projects=3,
+                                                 num_subscription_requests=5, seed=1)
+
+        assert catalog.execute_graphql(query, {}) == other_catalog.execute_graphql(query, {})
+
+    def test_get_all_table_names_pages_through_catalog(self, adapter):
+        """Test the cursor pages of the table name query cover every table once"""
+        with patch('adapter.CollibraAdapter.COLLIBRA_TABLE_NAME_INDEX_PAGE_SIZE', 3):
+            tables = list(adapter.get_all_table_names())
+
+        assert sorted(table['displayName'] for table in tables) == [f"table_{i:05d}" for i in range(7)]
+        assert [table['id'] for table in tables] == sorted(table['id'] for table in tables)
+
+    def test_get_tables_by_names_finds_tables_across_pages(self, adapter):
+        """Test tables looked up by name are found when they don't fit a single page"""
+        with patch('adapter.CollibraAdapter.COLLIBRA_MAX_LOOKUP_BATCH_SIZE', 2):
+            tables_by_name = adapter.get_tables_by_names([f"table_{i:05d}" for i in (0, 3, 6)] + ["missing"])
+
+        assert sorted(tables_by_name) == ["table_00000", "table_00003", "table_00006"]
+
+    def test_get_tables_details_returns_columns_and_pii(self, adapter):
+        """Test batched table details contain the columns, business terms and PII columns of each table"""
+        table_ids = [table['id'] for table in adapter.get_tables()][:2]
+
+        details = adapter.get_tables_details(table_ids)
+
+        assert set(details) == set(table_ids)
+        for table_details in details.values():
+            assert table_details.table['fullName'].startswith("AWS>123456789012>database_")
+            assert len(table_details.table['incomingRelations']) == 3
+            collibra_table = CollibraTable.from_table_details(table_details, [], MagicMock())
+            assert collibra_table.pii_columns == ["column_001"]
+
+    def test_bulk_writes_are_visible_to_queries(self, adapter):
+        """Test users and attributes created in bulk are returned by the user query"""
+        result = adapter.create_aws_users(["new_user"])
+        (_, created_user), = result.created
+        adapter.add_aws_users_attributes([(created_user['id'], "project_000")])
+
+        users = {user['displayName']: user for user in adapter.get_all_aws_users()}
+
+        assert len(users) == 5
+        assert [attribute['stringValue'] for attribute in users["new_user"]['stringAttributes']] == ["project_000"]
+
+    def test_created_relations_are_found_among_more_than_a_thousand(self, adapter):
+        """Test relations created in bulk are found by target, even when the project has over 1000 relations"""
+        project = next(iter(adapter.get_all_aws_projects()))
+        target_ids = [f"asset-{i:05d}" for i in range(1200)]
+
+        adapter.create_relations([(project['id'], target_id, COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID)
+                                  for target_id in target_ids])
+
+        candidate_ids = target_ids[-50:] + ["unrelated-asset"]
+        related_asset_ids = adapter.get_related_asset_ids(project['id'], candidate_ids,
+                                                          COLLIBRA_AWS_PROJECT_TO_ASSET_RELATION_TYPE_ID)
+        assert related_asset_ids == set(target_ids[-50:])
+        assert adapter.get_related_asset_ids(project['id'], candidate_ids, "other-relation-type-id") == set()
+
+    def test_updated_subscription_request_leaves_status(self, adapter):
+        """Test a subscription request is no longer approved after its status was updated"""
+        requests_before = list(adapter.get_subscription_requests_by_status("Approved"))
+
+        adapter.update_subscription_request_status(requests_before[0]['id'], "test-granted-status-id")
+
+        assert len(list(adapter.get_subscription_requests_by_status("Approved"))) == len(requests_before) - 1
+
+    def test_invalid_credentials_are_rejected(self, server):
+        """Test requests without the expected Basic credentials are answered with 401"""
+        response = requests.post(f"http://localhost:{server.server_address[1]}/graphql/knowledgeGraph/v1",
+                                 json={"query": "", "variables": {}}, auth=("test_user", "wrong"))
+
+        assert response.status_code == 401
+
+    def test_throttle_rate_answers_with_retry_after(self, server):
+        """Test throttled routes are answered with 429 and a Retry-After header while others are not"""
+        server.route_faults = {"relations": RouteFaults(throttle_rate=1.0, retry_after_in_seconds=3)}
+        url = f"http://localhost:{server.server_address[1]}/rest/2.0/"
+
+        throttled = requests.post(url + "relations", json={}, auth=("test_user", "test_pass"))
+        not_throttled = requests.post(url + "assets", json={"name": "asset", "typeId": "type"},
+                                      auth=("test_user", "test_pass"))
+
+        assert throttled.status_code == 429
+        assert throttled.headers["Retry-After"] == "3"
+        assert not_throttled.status_code == 201
+
+    def test_parse_route_values_expands_all_routes(self):
+        """Test `all` applies a value to every route and specific routes override it"""
+        values = parse_route_values(["all=0.1", "graphql=0.5"])
+
+        assert values["graphql"] == 0.5
+        assert values["relations"] == 0.1
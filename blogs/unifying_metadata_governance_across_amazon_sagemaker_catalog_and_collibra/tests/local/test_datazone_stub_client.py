@@ -0,0 +1,188 @@
+"""
+Unit tests for local/datazone_stub_client.py
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from adapter.InstrumentedDataZoneClient import InstrumentedDataZoneClient
+from adapter.SMUSAdapter import SMUSAdapter
+from business.AWSClientFactory import AWSClientFactory
+from business.CollibraSMUSAssetMatcher import CollibraSMUSAssetMatcher
+from business.CollibraSMUSListingMatcher import CollibraSMUSListingMatcher
+from business.SMUSBootstrapCache import SMUSBootstrapCache
+from business.SMUSRateLimiters import SMUSRateLimiters
+from collibra_stub_server import RouteFaults
+from datazone_stub_client import DataZoneStubClient, SyntheticSMUSCatalog
+from utils.env_utils import SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN
+
+
+def collibra_table(table_name: str, database: str, account_id: str = "123456789012"):
+    resource_metadata = {"glueAccessRoleArn": f"arn:aws:iam::{account_id}:role/glue-access",
+                         "region": "NORTHERNVIRGINIA"}
+    return {"id": "collibra-table-id", "displayName": table_name,
+            "fullName": f"AWS>{account_id}>{database}>{table_name}",
+            "stringAttributes": [{"stringValue": json.dumps(resource_metadata),
+                                  "type": {"name": "AWS Resource Metadata"}}]}
+
+
+@pytest.mark.unit
+class TestDataZoneStubClient:
+    """Tests for the local DataZone stand-in driven through SMUSAdapter"""
+
+    @pytest.fixture(autouse=True)
+    def reset_process_wide_state(self):
+        """Clear the process-wide clients, SMUS ids, rate limiters and DataZone metrics around each test"""
+        for cache in (AWSClientFactory, SMUSBootstrapCache, SMUSRateLimiters, InstrumentedDataZoneClient):
+            cache.reset()
+        yield
+        for cache in (AWSClientFactory, SMUSBootstrapCache, SMUSRateLimiters, InstrumentedDataZoneClient):
+            cache.reset()
+
+    @pytest.fixture
+    def catalog(self):
+        """Small synthetic SMUS catalog whose admin user is the integration admin role of the test environment"""
+        return SyntheticSMUSCatalog(num_tables=7, num_columns_per_table=3, tables_per_database=5, num_users=4,
+                                    num_projects=3, admin_role_arn=SMUS_COLLIBRA_INTEGRATION_ADMIN_ROLE_ARN, seed=1)
+
+    @pytest.fixture
+    def adapter(self, mock_logger, catalog):
+        """SMUSAdapter talking to the stand-in"""
+        AWSClientFactory.register("datazone", DataZoneStubClient(catalog))
+        return SMUSAdapter(mock_logger)
+
+    def test_projects_are_listed_for_the_admin_user(self, adapter):
+        """Test the admin user is found and sees all projects"""
+        projects = adapter.list_all_projects()
+
+        assert [project["id"] for project in projects] == ["smus-project-000", "smus-project-001", "smus-project-002"]
+        assert adapter.get_project("smus-project-001")["name"] == "project_001"
+
+    def test_domain_wide_asset_search_matches_collibra_table(self, adapter):
+        """Test the asset of a table is found by name and matches the table of the synthetic Collibra catalog"""
+        assets = adapter.search_all_assets_by_name_in_domain("table_00006")
+
+        assert len(assets) == 1
+        assert assets[0]["assetItem"]["owningProjectId"] == "smus-project-000"
+        assert assets[0]["assetItem"]["additionalAttributes"]["formsOutput"]
+        asset = adapter.get_asset(assets[0]["assetItem"]["identifier"])
+        assert CollibraSMUSAssetMatcher.match(asset, collibra_table("table_00006", "database_1"))
+        assert not CollibraSMUSAssetMatcher.match(asset, collibra_table("table_00006", "database_0"))
+
+    def test_asset_revision_is_applied(self, adapter):
+        """Test a revision replaces the forms and glossary terms of the asset"""
+        asset_id = adapter.search_all_assets_by_name_in_domain("table_00001")[0]["assetItem"]["identifier"]
+        forms_input = [{"formName": "AssetCommonDetailsForm",
+                        "typeIdentifier": "amazon.datazone.AssetCommonDetailsFormType",
+                        "content": json.dumps({"readMe": "PII"})}]
+
+        adapter.create_asset_revision("table_00001", asset_id, forms_input, description="Customers",
+                                      glossaryTerms=["term-1"])
+
+        asset = adapter.get_asset(asset_id)
+        assert asset["revision"] == "2"
+        assert asset["description"] == "Customers"
+        assert asset["glossaryTerms"] == ["term-1"]
+        assert asset["formsOutput"][0]["typeName"] == "amazon.datazone.AssetCommonDetailsFormType"
+
+    def test_listings_are_paged_and_match_collibra_table(self, mock_logger, catalog):
+        """Test the listings of a project are paged and match the tables of the synthetic Collibra catalog"""
+        AWSClientFactory.register("datazone", DataZoneStubClient(catalog))
+        with patch.object(SMUSAdapter, "MAX_RESULTS", 1):
+            adapter = SMUSAdapter(mock_logger)
+            listings = adapter.search_all_listings("smus-project-000")
+
+        assert [listing["assetListing"]["name"] for listing in listings] == \
+            ["table_00000", "table_00003", "table_00006"]
+        assert CollibraSMUSListingMatcher.match(listings[1]["assetListing"], collibra_table("table_00003", "database_0"))
+
+    def test_members_and_user_profiles(self, adapter):
+        """Test project members resolve to SSO user profiles, next to the integration admin user"""
+        members = adapter.list_all_users_in_project("smus-project-000")
+        profiles = [adapter.get_user_profile(member["memberDetails"]["user"]["userId"]) for member in members]
+
+        assert {profile["type"] for profile in profiles} == {"SSO", "IAM"}
+        assert all(profile["details"]["sso"]["username"].startswith("user_")
+                   for profile in profiles if profile["type"] == "SSO")
+
+    @patch("adapter.SMUSAdapter.wait_until")
+    def test_glossary_and_terms(self, mock_wait_until, adapter):
+        """Test the glossary is created once and its terms are searched, updated and related"""
+        glossary_id = adapter.create_or_get_glossary()
+        adapter.create_glossary_term(glossary_id, "Customer", ["A customer"])
+        adapter.create_glossary_term(glossary_id, "Order", ["An order"])
+        SMUSBootstrapCache.reset()
+
+        assert adapter.create_or_get_glossary() == glossary_id
+        terms = adapter.list_all_terms_in_glossary(glossary_id)
+        assert sorted(term["glossaryTermItem"]["name"] for term in terms) == ["Customer", "Order"]
+        customer = adapter.search_glossary_term_by_name(glossary_id, "Customer")
+        assert customer["shortDescription"] == "A customer"
+        order_id = adapter.search_glossary_term_by_name(glossary_id, "Order")["id"]
+        updated_term = adapter.update_glossary_term_relations(glossary_id, customer["id"], "Customer",
+                                                              {"isA": [order_id]})
+        assert updated_term["termRelations"] == {"isA": [order_id]}
+        with pytest.raises(ClientError):
+            adapter.create_glossary_term(glossary_id, "Customer", [])
+
+    def test_unknown_glossary_raises_resource_not_found(self, adapter):
+        """Test writes to a missing glossary raise the modeled ResourceNotFoundException"""
+        with pytest.raises(ClientError) as error:
+            adapter.create_glossary_term("missing-glossary", "Customer", [])
+
+        assert error.value.response["Error"]["Code"] == "ResourceNotFoundException"
+        assert error.value.operation_name == "CreateGlossaryTerm"
+        assert isinstance(error.value, DataZoneStubClient.exceptions.ResourceNotFoundException)
+
+    def test_unmodeled_errors_of_the_catalog_propagate(self, catalog):
+        """Test errors of the catalog which are not modeled DataZone errors are not turned into ClientErrors"""
+        client = DataZoneStubClient(catalog)
+
+        with patch.object(catalog, "get_asset", side_effect=KeyError("formsOutput")), pytest.raises(KeyError):
+            client.get_asset(domainIdentifier="domain", identifier="any-asset-id")
+
+    def test_subscription_request_is_approved(self, adapter):
+        """Test a subscription request is accepted and approved right away"""
+        listing_id = adapter.search_all_listings("smus-project-000")[0]["assetListing"]["listingId"]
+
+        request_id = adapter.create_subscription_request(listing_id, "smus-project-001")["id"]
+
+        assert [request["id"] for request in adapter.search_subscription_requests(
+            listing_id, "smus-project-000", "smus-project-001")] == [request_id]
+        assert len(adapter.search_approved_subscription_for_subscription_request_id(
+            request_id, "smus-project-000", "smus-project-001")) == 1
+
+    def test_injected_throttles_reach_the_instrumented_client(self, mock_logger, catalog):
+        """Test throttles injected into an operation are raised and recorded"""
+        AWSClientFactory.register("datazone", DataZoneStubClient(catalog, {"GetAsset": RouteFaults(throttle_rate=1.0)}))
+        adapter = SMUSAdapter(mock_logger)
+
+        with pytest.raises(ClientError) as error:
+            adapter.get_asset("any-asset-id")
+
+        assert error.value.response["Error"]["Code"] == "ThrottlingException"
+        assert InstrumentedDataZoneClient.get_metrics()["GetAsset"].throttles == 1
+
+    def test_injected_latency_and_errors(self, catalog):
+        """Test latency is added before an injected error is raised"""
+        client = DataZoneStubClient(catalog, {"Search": RouteFaults(latency_in_seconds=0.01, error_rate=1.0)})
+
+        with patch("datazone_stub_client.time.sleep") as mock_sleep, pytest.raises(ClientError) as error:
+            client.search(domainIdentifier="domain", searchScope="ASSET", searchText="table_00001")
+
+        mock_sleep.assert_called_once_with(0.01)
+        assert error.value.response["Error"]["Code"] == "InternalServerException"
+
+    def test_catalog_is_deterministic(self):
+        """Test catalogs generated with the same seed share their asset ids"""
+        first = DataZoneStubClient(SyntheticSMUSCatalog(num_tables=3, seed=5))
+        second = DataZoneStubClient(SyntheticSMUSCatalog(num_tables=3, seed=5))
+
+        def asset_ids(client):
+            return [item["assetItem"]["identifier"]
+                    for item in client.search(searchScope="ASSET", searchText="table_")["items"]]
+
+        assert asset_ids(first) == asset_ids(second)
+        assert len(asset_ids(first)) == 3
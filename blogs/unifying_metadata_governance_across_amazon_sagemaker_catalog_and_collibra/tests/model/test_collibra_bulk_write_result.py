@@ -0,0 +1,29 @@
+"""
+Unit tests for lambda/model/CollibraBulkWriteResult.py
+"""
+import pytest
+
+from model.CollibraBulkWriteResult import CollibraBulkWriteResult
+
+
+@pytest.mark.unit
+class TestCollibraBulkWriteResult:
+    """Tests for CollibraBulkWriteResult class"""
+
+    def test_new_result_is_empty(self):
+        """Test a new result has neither created nor failed items"""
+        result = CollibraBulkWriteResult()
+
+        assert result.created == []
+        assert result.failed == []
+
+    def test_items_are_recorded_in_order(self):
+        """Test created and failed items keep their payloads and outcomes in insertion order"""
+        result = CollibraBulkWriteResult()
+
+        result.add_created({'name': 'alice'}, {'id': 'user-1'})
+        result.add_failed({'name': 'bob'}, 'Invalid name')
+        result.add_created({'name': 'carol'}, {'id': 'user-2'})
+
+        assert result.created == [({'name': 'alice'}, {'id': 'user-1'}), ({'name': 'carol'}, {'id': 'user-2'})]
+        assert result.failed == [({'name': 'bob'}, 'Invalid name')]
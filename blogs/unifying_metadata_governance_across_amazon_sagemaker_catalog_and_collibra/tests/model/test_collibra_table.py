@@ -5,6 +5,7 @@ import pytest
 from unittest.mock import MagicMock
 
 from model.CollibraTable import CollibraBusinessTerm, CollibraColumn, CollibraTable
+from model.CollibraTableDetails import CollibraTableDetails
 
 
 @pytest.mark.unit
@@ -352,3 +353,26 @@ class TestCollibraTable:
                            smus_asset_ids, mock_glossary_cache)
         
         assert tbl.smus_asset_ids == ['asset-123', 'asset-456', 'asset-789']
+
+    def test_from_table_details_uses_all_sections(self, mock_glossary_cache):
+        """Test from_table_details builds table from a single table details bundle"""
+        table_details = CollibraTableDetails({
+            'table': [{'displayName': 'customers', 'stringAttributes': [{'stringValue': 'Customer data'}]}],
+            'businessTerms': [{'incomingRelations': [{'source': {'displayName': 'Customer'}}]}],
+            'piiColumns': [{
+                'incomingRelations': [{
+                    'source': {
+                        'displayName': 'email',
+                        'incomingRelations': [{'source': {'incomingRelations': [{'source': {'displayName': 'PII'}}]}}]
+                    }
+                }]
+            }]
+        })
+
+        tbl = CollibraTable.from_table_details(table_details, ['asset-123'], mock_glossary_cache)
+
+        assert tbl.name == 'customers'
+        assert tbl.description == 'Customer data'
+        assert tbl.get_business_term_ids() == ['id-Customer']
+        assert tbl.pii_columns == ['email']
+        assert tbl.smus_asset_ids == ['asset-123']
@@ -0,0 +1,30 @@
+"""
+Unit tests for lambda/model/CollibraTableDetails.py
+"""
+import pytest
+
+from model.CollibraTableDetails import CollibraTableDetails
+
+
+@pytest.mark.unit
+class TestCollibraTableDetails:
+    """Tests for CollibraTableDetails class"""
+
+    def test_init_unwraps_aliased_sections(self):
+        """Test initialization picks the single asset of each aliased section"""
+        data = {
+            'table': [{'id': 'table-123', 'displayName': 'customers'}],
+            'businessTerms': [{'id': 'table-123', 'incomingRelations': []}],
+            'piiColumns': [{'incomingRelations': []}]
+        }
+
+        details = CollibraTableDetails(data)
+
+        assert details.table == {'id': 'table-123', 'displayName': 'customers'}
+        assert details.business_terms == {'id': 'table-123', 'incomingRelations': []}
+        assert details.pii_columns == {'incomingRelations': []}
+
+    def test_init_raises_error_when_section_missing(self):
+        """Test initialization raises KeyError when an aliased section is missing"""
+        with pytest.raises(KeyError):
+            CollibraTableDetails({'table': [{'id': 'table-123'}]})
@@ -0,0 +1,63 @@
+"""
+Unit tests for lambda/utils/query_builder.py
+"""
+import pytest
+
+from utils.query_builder import build_assets_query
+
+
+@pytest.mark.unit
+class TestBuildAssetsQuery:
+    """Tests for build_assets_query function"""
+
+    def test_builds_query_with_page_size_filters_and_fields(self):
+        """Test the query contains limit, order, filters and projected fields"""
+        query = build_assets_query(("id", "displayName"), ('type: { publicId: { eq: "Table" } }',), 25)
+
+        assert query == (
+            "query Assets {\n"
+            "    assets(\n"
+            "        limit: 25\n"
+            "        order: { id: asc }\n"
+            "        where: {\n"
+            '            type: { publicId: { eq: "Table" } }\n'
+            "        }\n"
+            "    ) {\n"
+            "        id\n"
+            "        displayName\n"
+            "    }\n"
+            "}"
+        )
+
+    def test_builds_query_with_cursor(self):
+        """Test paging with a cursor declares the lastSeenId variable and filters on it"""
+        query = build_assets_query(("id",), (), 10, with_cursor=True)
+
+        assert query.startswith("query Assets($lastSeenId: UUID!) {")
+        assert "id: { gt: $lastSeenId }" in query
+
+    def test_builds_query_with_variables_and_custom_order(self):
+        """Test additional variables and order are rendered"""
+        query = build_assets_query(("id",), ("status: { name: { eq: $status } }",), 100,
+                                   order="modifiedOn: desc", variables=("$status: String!",))
+
+        assert query.startswith("query Assets($status: String!) {")
+        assert "order: { modifiedOn: desc }" in query
+
+    def test_indents_nested_fields(self):
+        """Test multi-line nested selections are indented as a whole"""
+        query = build_assets_query(("stringAttributes {\n    stringValue\n}",), page_size=1)
+
+        assert "        stringAttributes {\n            stringValue\n        }" in query
+
+    def test_cursor_requires_id_order(self):
+        """Test paging with a cursor over a different order is rejected"""
+        with pytest.raises(ValueError):
+            build_assets_query(("id",), (), 10, with_cursor=True, order="modifiedOn: desc")
+
+    def test_caches_compiled_documents(self):
+        """Test the same arguments return the cached document"""
+        first = build_assets_query(("id", "fullName"), (), 5)
+        second = build_assets_query(("id", "fullName"), (), 5)
+
+        assert first is second